@@ -2,7 +2,9 @@ import streamlit as st
 import pandas as pd
 
 from utils.data_loader import load_data
+from utils.cache import dataset_version
 from utils.styles import inject_global_styles, enable_chart_theme
+from utils.peers import property_peer_scores
 
 
 # ---------------------------------------------------------
@@ -25,12 +27,18 @@ enable_chart_theme()
 
 @st.cache_data
 def load_all_data():
-    return load_data()
+    df = load_data()
+    return df, dataset_version(df)
 
-df = load_all_data()
+df, df_version = load_all_data()
 
-# Store full dataset for Portfolio page
+# Store full dataset for Portfolio page, with its version so cached
+# results can be looked up without re-hashing the frame on every rerun
 st.session_state.df = df
+st.session_state.df_version = df_version
+
+# Precompute peer benchmarks once per dataset version (pages only read them)
+property_peer_scores(df, version=df_version)
 
 
 # ---------------------------------------------------------
@@ -4,7 +4,6 @@ import pandas as pd
 from utils.styles import kpi_card, section_divider
 from utils.preprocess import (
     monthly_aggregate,
-    occupancy_normalize,
     provider_group,
     utility_group,
 )
@@ -12,8 +11,8 @@ from utils.charts import (
     usage_trend,
     cost_trend,
     occupancy_trend,
-    usage_per_occupied_unit_trend,
-    cost_per_occupied_unit_trend,
+    usage_per_room_night_trend,
+    cost_per_room_night_trend,
 )
 
 
@@ -38,16 +37,6 @@ df_compare = st.session_state.df_comparison
 normalize = st.session_state.normalize
 
 
-# ---------------------------------------------------------
-# NORMALIZATION (if enabled)
-# ---------------------------------------------------------
-
-if normalize:
-    df = occupancy_normalize(df)
-    if df_compare is not None:
-        df_compare = occupancy_normalize(df_compare)
-
-
 # ---------------------------------------------------------
 # MONTHLY AGGREGATION
 # ---------------------------------------------------------
@@ -97,8 +86,8 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "Usage",
     "Cost",
     "Occupancy",
-    "Usage per Occupied Unit",
-    "Cost per Occupied Unit",
+    "Usage per Room-Night",
+    "Cost per Room-Night",
 ])
 
 with tab1:
@@ -112,13 +101,13 @@ with tab3:
 
 with tab4:
     if normalize:
-        st.altair_chart(usage_per_occupied_unit_trend(df_monthly), use_container_width=True)
+        st.altair_chart(usage_per_room_night_trend(df_monthly), use_container_width=True)
     else:
         st.info("Enable normalization in the sidebar to view this chart.")
 
 with tab5:
     if normalize:
-        st.altair_chart(cost_per_occupied_unit_trend(df_monthly), use_container_width=True)
+        st.altair_chart(cost_per_room_night_trend(df_monthly), use_container_width=True)
     else:
         st.info("Enable normalization in the sidebar to view this chart.")
 
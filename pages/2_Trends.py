@@ -5,7 +5,6 @@ from utils.styles import section_divider, kpi_card
 from utils.preprocess import (
     monthly_aggregate,
     yoy_comparison,
-    occupancy_normalize,
 )
 from utils.charts import (
     usage_trend,
@@ -13,8 +12,8 @@ from utils.charts import (
     occupancy_trend,
     yoy_usage_chart,
     yoy_cost_chart,
-    usage_per_occupied_unit_trend,
-    cost_per_occupied_unit_trend,
+    usage_per_room_night_trend,
+    cost_per_room_night_trend,
 )
 
 
@@ -39,16 +38,6 @@ df_compare = st.session_state.df_comparison
 normalize = st.session_state.normalize
 
 
-# ---------------------------------------------------------
-# NORMALIZATION (if enabled)
-# ---------------------------------------------------------
-
-if normalize:
-    df = occupancy_normalize(df)
-    if df_compare is not None:
-        df_compare = occupancy_normalize(df_compare)
-
-
 # ---------------------------------------------------------
 # MONTHLY AGGREGATION
 # ---------------------------------------------------------
@@ -99,8 +88,8 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "Usage",
     "Cost",
     "Occupancy",
-    "Usage per Occupied Unit",
-    "Cost per Occupied Unit",
+    "Usage per Room-Night",
+    "Cost per Room-Night",
 ])
 
 with tab1:
@@ -114,13 +103,13 @@ with tab3:
 
 with tab4:
     if normalize:
-        st.altair_chart(usage_per_occupied_unit_trend(df_monthly), use_container_width=True)
+        st.altair_chart(usage_per_room_night_trend(df_monthly), use_container_width=True)
     else:
         st.info("Enable normalization in the sidebar to view this chart.")
 
 with tab5:
     if normalize:
-        st.altair_chart(cost_per_occupied_unit_trend(df_monthly), use_container_width=True)
+        st.altair_chart(cost_per_room_night_trend(df_monthly), use_container_width=True)
     else:
         st.info("Enable normalization in the sidebar to view this chart.")
 
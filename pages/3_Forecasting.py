@@ -6,9 +6,11 @@ from utils.preprocess import (
     monthly_aggregate,
     occupancy_normalize,
 )
+from utils.cache import FORECAST_CACHE
+from utils.forecast_jobs import FORECAST_JOBS, submit_forecast_job, submit_backtest_job
+from utils.backtesting import load_backtest_results, summarize_backtest, select_engines
+from utils.forecasting import FORECAST_ENGINES
 from utils.forecasting import (
-    prepare_monthly_forecast_df,
-    run_forecast,
     merge_actual_and_forecast,
     build_benchmark_for_forecast,
     forecast_summary,
@@ -45,26 +47,93 @@ if normalize:
 
 
 # ---------------------------------------------------------
-# MONTHLY AGGREGATION FOR FORECASTING
+# ENGINE BACKTEST (selects the portfolio forecast engine per utility)
 # ---------------------------------------------------------
 
-monthly_df, df_full = prepare_monthly_forecast_df(df)
+with st.expander("Engine backtest"):
+    st.caption(
+        "Rolling-origin backtest of every property / utility series. The fastest "
+        "engine within the accuracy bar is used per utility for portfolio forecasts."
+    )
+    backtest_engines = st.multiselect(
+        "Engines", list(FORECAST_ENGINES), default=["seasonal_naive", "trend_seasonal"]
+    )
 
-if monthly_df.empty:
-    st.warning("Not enough data to generate a forecast.")
-    st.stop()
+    if st.button("Run backtest in background", disabled=not backtest_engines):
+        submit_backtest_job(st.session_state.df, engines=backtest_engines, retry=True)
+        st.info("Backtest queued. Results appear here when it finishes.")
+
+    backtest_summary = summarize_backtest(load_backtest_results())
+
+    if backtest_summary.empty:
+        st.info("No backtest has been run yet.")
+    else:
+        st.markdown("**Accuracy by utility and engine (latest run)**")
+        st.dataframe(backtest_summary, use_container_width=True)
+        st.markdown("**Selected engine per utility**")
+        st.dataframe(select_engines(backtest_summary), use_container_width=True)
 
 
 # ---------------------------------------------------------
-# RUN FORECAST
+# RUN FORECAST (background job, result handed over via cache)
 # ---------------------------------------------------------
 
-forecast_df, model = run_forecast(monthly_df, periods=12)
+with st.expander("Occupancy scenario"):
+    use_regressors = st.checkbox(
+        "Use occupancy as a forecast driver", value=False
+    )
+    occupancy_change_pct = st.slider(
+        "Occupancy change vs. same month last year (%)", -30, 30, 0,
+        disabled=not use_regressors,
+    )
+
+scenario = {}
+if use_regressors:
+    scenario = {
+        "use_regressors": True,
+        "occupancy_change_pct": occupancy_change_pct,
+    }
+
+job_key, job = submit_forecast_job(df, periods=12, **scenario)
+
+# Exports picks up this exact forecast (scenario included)
+st.session_state.forecast_job_key = job_key
 
-if forecast_df is None:
-    st.warning("Forecast model could not be generated.")
+if job.status == "failed":
+    st.error("Forecast model could not be generated.")
+    with st.expander("Error details"):
+        st.code(job.error)
+    if st.button("Retry"):
+        submit_forecast_job(df, periods=12, retry=True, **scenario)
+        st.rerun()
+    st.stop()
+
+if job.status != "done":
+    st.info(
+        "The forecast is being fitted in the background. "
+        "Feel free to explore other pages — results will be ready when you return."
+    )
+
+    @st.fragment(run_every=1.0)
+    def forecast_progress():
+        current = FORECAST_JOBS.status(job_key)
+        if current is None or not current.active:
+            st.rerun()
+        st.progress(current.progress, text=current.message)
+
+    forecast_progress()
+    st.stop()
+
+result = FORECAST_CACHE.get(job_key)
+
+if result is None:
+    st.warning("Not enough data to generate a forecast.")
     st.stop()
 
+monthly_df = result["monthly"]
+forecast_df = result["forecast"]
+cost_forecast_df = result["cost_forecast"]
+
 
 # ---------------------------------------------------------
 # MERGE ACTUAL + FORECAST
@@ -99,9 +168,9 @@ with col2:
 
 with col3:
     if benchmark_df is not None:
-        kpi_card("Benchmark Usage", f"{benchmark_df['benchmark'].iloc[0]:,.0f}")
+        kpi_card("Next Month Benchmark", f"{benchmark_df['benchmark'].iloc[len(actual_df)]:,.0f}")
     else:
-        kpi_card("Benchmark Usage", "N/A")
+        kpi_card("Next Month Benchmark", "N/A")
 
 
 section_divider()
@@ -125,17 +194,42 @@ st.altair_chart(chart, use_container_width=True)
 section_divider()
 
 
+# ---------------------------------------------------------
+# COST FORECAST (usage model x rate model, fitted in the same job)
+# ---------------------------------------------------------
+
+st.subheader("Cost Forecast")
+
+if cost_forecast_df is None:
+    st.info("Not enough cost data to forecast cost.")
+else:
+    actual_cost_df = monthly_df[["ds", "cost"]].rename(columns={"cost": "y"})
+    future_cost = cost_forecast_df[cost_forecast_df["ds"] > monthly_df["ds"].max()]
+
+    colA, colB = st.columns(2)
+
+    with colA:
+        kpi_card("Next 12 Months Cost", f"${future_cost['yhat'].sum():,.0f}")
+
+    with colB:
+        kpi_card("Avg Forecast Rate", f"${future_cost['rate_yhat'].mean():,.4f} / unit")
+
+    st.altair_chart(
+        forecast_chart(actual_cost_df, cost_forecast_df, title="Forecasted Cost"),
+        use_container_width=True,
+    )
+
+
+section_divider()
+
+
 # ---------------------------------------------------------
 # FORECAST SUMMARY (Narrative)
 # ---------------------------------------------------------
 
 st.subheader("Forecast Summary")
 
-benchmark_value = None
-if benchmark_df is not None:
-    benchmark_value = benchmark_df["benchmark"].iloc[0]
-
-summary_text = forecast_summary(actual_df, forecast_df_clean, benchmark_value)
+summary_text = forecast_summary(actual_df, forecast_df_clean, benchmark_df=benchmark_df)
 
 st.markdown(
     f"""
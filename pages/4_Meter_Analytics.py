@@ -7,6 +7,7 @@ from utils.preprocess import (
     occupancy_normalize,
 )
 from utils.alerts import detect_meter_anomalies
+from utils.peers import score_meter_peers
 from utils.charts import meter_usage_bar
 
 
@@ -110,6 +111,43 @@ else:
 section_divider()
 
 
+# ---------------------------------------------------------
+# PEER COMPARISON (similar properties across the portfolio)
+# ---------------------------------------------------------
+
+st.subheader("Peer Comparison")
+
+peer_by = st.radio(
+    "Compare against meters of the same utility in properties with",
+    ["unit_band", "state"],
+    format_func=lambda v: "a similar unit count" if v == "unit_band" else "the same state",
+    horizontal=True,
+)
+
+peer_scores = score_meter_peers(
+    st.session_state.df, peer_by=peer_by, version=st.session_state.df_version
+)
+
+if peer_scores.empty:
+    st.info("Not enough data to build peer groups.")
+else:
+    selected_meters = peer_scores[
+        peer_scores["meter_number"].isin(meter_df["meter_number"])
+        & (peer_scores["property"] == df["property"].iloc[0])
+        & (peer_scores["utility"] == df["utility"].iloc[0])
+    ]
+
+    if selected_meters["outlier"].any():
+        st.warning("Meters outside their peer range (robust z-score):")
+    else:
+        st.success("All meters are within their peer range.")
+
+    st.dataframe(selected_meters, use_container_width=True)
+
+
+section_divider()
+
+
 # ---------------------------------------------------------
 # RAW METER TABLE
 # ---------------------------------------------------------
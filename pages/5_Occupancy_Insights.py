@@ -2,15 +2,13 @@ import streamlit as st
 import pandas as pd
 
 from utils.styles import section_divider, kpi_card
-from utils.preprocess import (
-    monthly_aggregate,
-    occupancy_normalize,
-)
+from utils.preprocess import monthly_aggregate
 from utils.alerts import detect_occupancy_anomalies
+from utils.elasticity import fit_occupancy_elasticity
 from utils.charts import (
     occupancy_trend,
-    usage_per_occupied_unit_trend,
-    cost_per_occupied_unit_trend,
+    usage_per_room_night_trend,
+    cost_per_room_night_trend,
 )
 
 
@@ -35,13 +33,10 @@ normalize = st.session_state.normalize
 
 
 # ---------------------------------------------------------
-# NORMALIZATION (always applied for this page)
+# MONTHLY AGGREGATION (room-night intensities precomputed at load)
 # ---------------------------------------------------------
 
-df_norm = occupancy_normalize(df)
-
-# Monthly aggregation
-df_monthly = monthly_aggregate(df_norm)
+df_monthly = monthly_aggregate(df)
 
 if df_monthly.empty:
     st.warning("Not enough data to display occupancy insights.")
@@ -57,17 +52,19 @@ st.subheader("Occupancy KPIs")
 col1, col2, col3 = st.columns(3)
 
 avg_occ = df_monthly["occupancy"].mean()
-avg_usage_per_occ = df_monthly["usage_per_occupied_unit"].mean()
-avg_cost_per_occ = df_monthly["cost_per_occupied_unit"].mean()
+# Totals over total room-nights, so busy months weigh more
+room_nights = df_monthly["occupied_room_nights"].sum()
+avg_usage_per_occ = df_monthly["usage"].sum() / room_nights if room_nights > 0 else float("nan")
+avg_cost_per_occ = df_monthly["cost"].sum() / room_nights if room_nights > 0 else float("nan")
 
 with col1:
     kpi_card("Avg Occupancy", f"{avg_occ:,.1f}")
 
 with col2:
-    kpi_card("Usage per Occupied Unit", f"{avg_usage_per_occ:,.1f}")
+    kpi_card("Usage per Room-Night", f"{avg_usage_per_occ:,.1f}")
 
 with col3:
-    kpi_card("Cost per Occupied Unit", f"${avg_cost_per_occ:,.2f}")
+    kpi_card("Cost per Room-Night", f"${avg_cost_per_occ:,.2f}")
 
 
 section_divider()
@@ -91,13 +88,60 @@ section_divider()
 
 st.subheader("Normalized Usage & Cost Trends")
 
-tab1, tab2 = st.tabs(["Usage per Occupied Unit", "Cost per Occupied Unit"])
+tab1, tab2 = st.tabs(["Usage per Room-Night", "Cost per Room-Night"])
 
 with tab1:
-    st.altair_chart(usage_per_occupied_unit_trend(df_monthly), use_container_width=True)
+    st.altair_chart(usage_per_room_night_trend(df_monthly), use_container_width=True)
 
 with tab2:
-    st.altair_chart(cost_per_occupied_unit_trend(df_monthly), use_container_width=True)
+    st.altair_chart(cost_per_room_night_trend(df_monthly), use_container_width=True)
+
+
+section_divider()
+
+
+# ---------------------------------------------------------
+# OCCUPANCY ELASTICITY (usage = baseload + slope x occupancy)
+# ---------------------------------------------------------
+
+st.subheader("Occupancy Elasticity")
+
+# One grouped fit for the whole portfolio; the selection is a row of it
+elasticity_df = fit_occupancy_elasticity(st.session_state.df)
+
+selected_fit = elasticity_df[
+    (elasticity_df["property"] == df["property"].iloc[0])
+    & (elasticity_df["utility"] == df["utility"].iloc[0])
+] if not elasticity_df.empty else elasticity_df
+
+if selected_fit.empty or selected_fit["slope"].isna().all():
+    st.info("Not enough months with occupancy to fit this property.")
+else:
+    fit = selected_fit.iloc[0]
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        kpi_card("Baseload Share", f"{fit['baseload_share']:,.0f}%")
+
+    with col2:
+        kpi_card(
+            "Usage per Occupancy Point",
+            f"{fit['slope']:,.1f} ({fit['slope_lower']:,.1f} to {fit['slope_upper']:,.1f})",
+        )
+
+    with col3:
+        kpi_card("Fit R²", f"{fit['r2']:.2f}")
+
+    if not fit["significant"]:
+        st.info("Usage does not change significantly with occupancy at 95% confidence.")
+
+if not elasticity_df.empty:
+    with st.expander("All properties"):
+        st.dataframe(
+            elasticity_df.sort_values("baseload_share", ascending=False),
+            use_container_width=True,
+        )
 
 
 section_divider()
@@ -6,12 +6,11 @@ from utils.preprocess import (
     provider_group,
     occupancy_normalize,
 )
-from utils.benchmarks import (
-    get_provider_benchmark,
-    efficiency_score,
-    benchmark_deviation,
-)
-from utils.charts import provider_comparison
+from utils.benchmarks import portfolio_provider_benchmarks, bill_benchmark_table
+from utils.peers import property_peer_scores, property_peer_summary
+from utils.tariffs import tariff_audit, tariff_audit_summary
+from utils.charts import provider_comparison, rate_history_chart
+from utils.rates import rate_history, detect_rate_changes, RATE_EVENTS
 
 
 # ---------------------------------------------------------
@@ -96,35 +95,158 @@ st.altair_chart(provider_comparison(provider_df), use_container_width=True)
 section_divider()
 
 
+# ---------------------------------------------------------
+# EFFECTIVE RATES (cost per unit, rate changes)
+# ---------------------------------------------------------
+
+st.subheader("Effective Rates")
+
+# One pass over the portfolio, cached per dataset version
+rates_df = rate_history(st.session_state.df, version=st.session_state.df_version)
+
+selected_rates = rates_df[
+    rates_df["property"].isin(df["property"].unique())
+    & rates_df["utility"].isin(df["utility"].unique())
+] if not rates_df.empty else rates_df
+
+if selected_rates.empty:
+    st.info("No effective rate history for this selection.")
+else:
+    st.altair_chart(rate_history_chart(selected_rates), use_container_width=True)
+
+    # Flagged months only, most recent first (same cached rate history)
+    rate_changes = detect_rate_changes(st.session_state.df, version=st.session_state.df_version)
+    rate_events = rate_changes[
+        rate_changes["property"].isin(df["property"].unique())
+        & rate_changes["utility"].isin(df["utility"].unique())
+    ]
+
+    if rate_events.empty:
+        st.success("No rate changes detected.")
+    else:
+        st.warning("Rate changes detected:")
+        st.caption(" · ".join(f"**{k}**: {v}" for k, v in RATE_EVENTS.items()))
+        st.dataframe(rate_events, use_container_width=True)
+
+    with st.expander("Portfolio rate changes"):
+        st.dataframe(rate_changes, use_container_width=True)
+
+
+section_divider()
+
+
 # ---------------------------------------------------------
 # PROVIDER BENCHMARK COSTS
 # ---------------------------------------------------------
 
 st.subheader("Provider Benchmark Costs")
 
-bench_rows = []
+# Each bill priced at the benchmark rate valid on its date
+bench_df = portfolio_provider_benchmarks(df, by=("provider_code",))[[
+    "provider_code", "actual_usage", "actual_cost",
+    "benchmark_cost", "cost_deviation_pct", "efficiency_score",
+]]
 
-for _, row in provider_df.iterrows():
-    provider = row["provider_code"]
-    usage = row["total_usage"]
-    actual_cost = row["total_cost"]
+st.dataframe(bench_df, use_container_width=True)
 
-    bench_cost = get_provider_benchmark(provider, usage)
-    deviation = benchmark_deviation(actual_cost, bench_cost)
-    score = efficiency_score(actual_cost, bench_cost)
+with st.expander("Bill-level benchmarks"):
+    # Raw bills, each next to the benchmarks valid on its own date
+    bill_bench = bill_benchmark_table(st.session_state.df_filtered)
+    if bill_bench.empty:
+        st.info("No bills to benchmark.")
+    else:
+        st.dataframe(bill_bench.sort_values("date", ascending=False), use_container_width=True)
 
-    bench_rows.append({
-        "provider_code": provider,
-        "actual_usage": usage,
-        "actual_cost": actual_cost,
-        "benchmark_cost": bench_cost,
-        "cost_deviation_pct": deviation,
-        "efficiency_score": score,
-    })
 
-bench_df = pd.DataFrame(bench_rows)
+section_divider()
 
-st.dataframe(bench_df, use_container_width=True)
+
+# ---------------------------------------------------------
+# PORTFOLIO PROVIDER BENCHMARKS (every property / utility / provider)
+# ---------------------------------------------------------
+
+st.subheader("Portfolio Provider Benchmarks")
+
+portfolio_bench = portfolio_provider_benchmarks(st.session_state.df)
+
+if portfolio_bench.empty:
+    st.info("No provider data available across the portfolio.")
+else:
+    st.dataframe(
+        portfolio_bench.sort_values("cost_deviation_pct", ascending=False),
+        use_container_width=True,
+    )
+
+
+section_divider()
+
+
+# ---------------------------------------------------------
+# TARIFF AUDIT (billed cost vs rate schedule)
+# ---------------------------------------------------------
+
+st.subheader("Tariff Audit")
+
+tolerance_pct = st.slider("Variance tolerance (%)", 1, 25, 5, key="tariff_tolerance")
+
+# Audit raw bills: occupancy normalization would distort the tariff math
+audit_df = tariff_audit(st.session_state.df_filtered, tolerance_pct=tolerance_pct)
+
+if audit_df.empty:
+    st.info("No rate schedules available for these providers.")
+else:
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        kpi_card("Billed Cost", f"${audit_df['billed_cost'].sum():,.0f}")
+    with col2:
+        kpi_card("Expected (Tariff)", f"${audit_df['expected_cost'].sum():,.0f}")
+    with col3:
+        kpi_card("Variance", f"${audit_df['variance'].sum():,.0f}")
+
+    st.dataframe(tariff_audit_summary(audit_df), use_container_width=True)
+
+    flagged = audit_df[audit_df["status"] != "ok"]
+
+    if flagged.empty:
+        st.success("All audited bills are within tolerance of their tariff.")
+    else:
+        st.warning(f"{len(flagged)} of {len(audit_df)} bills differ from their tariff by more than {tolerance_pct}%.")
+        st.dataframe(flagged, use_container_width=True)
+
+
+section_divider()
+
+
+# ---------------------------------------------------------
+# PEER BENCHMARKS (same utility, unit band and state)
+# ---------------------------------------------------------
+
+st.subheader("Peer Benchmarks")
+
+peer_scores = property_peer_scores(st.session_state.df, version=st.session_state.df_version)
+
+if peer_scores.empty:
+    st.info("Not enough data to build peer groups.")
+else:
+    selected_scores = peer_scores[
+        peer_scores["property"].isin(df["property"].unique())
+        & peer_scores["utility"].isin(df["utility"].unique())
+    ]
+    peer_summary = property_peer_summary(selected_scores)
+
+    if peer_summary.empty:
+        st.info("No peer benchmarks for this selection.")
+    else:
+        kpi_card("Peer Score (last 12 months)", f"{peer_summary['peer_score'].mean():.0f} / 100")
+        st.caption("100 = lowest intensity among peers in the same month.")
+        st.dataframe(peer_summary, use_container_width=True)
+
+        with st.expander("Monthly peer percentiles"):
+            st.dataframe(
+                selected_scores.sort_values("ds", ascending=False),
+                use_container_width=True,
+            )
 
 
 section_divider()
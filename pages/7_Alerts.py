@@ -3,12 +3,28 @@ import pandas as pd
 
 from utils.styles import section_divider
 from utils.alerts import (
-    detect_spikes,
-    detect_missing_bills,
-    detect_irregular_billing_periods,
-    detect_bad_readings,
-    detect_meter_anomalies,
-    detect_occupancy_anomalies,
+    iter_alert_summary,
+    detect_forecast_residual_anomalies,
+)
+from utils.alert_store import (
+    ALERT_STATUSES,
+    evaluate_incremental,
+    load_alerts,
+    acknowledge_alerts,
+    resolve_alerts,
+)
+from utils.cache import FORECAST_CACHE
+from utils.changepoints import detect_change_points
+from utils.backtesting import engine_selection
+from utils.benchmarks import bills_above_benchmark
+from utils.coverage import meter_coverage, provider_coverage
+from utils.integrity import find_duplicate_bills, find_period_issues
+from utils.readings import reconcile_readings, reconciliation_summary
+from utils.forecast_jobs import (
+    FORECAST_JOBS,
+    submit_portfolio_forecast_job,
+    portfolio_forecast_key,
+    load_portfolio_forecasts,
 )
 
 
@@ -32,119 +48,342 @@ df = st.session_state.df_filtered
 
 
 # ---------------------------------------------------------
-# SPIKE DETECTION
+# PER-SERIES DETECTORS (run concurrently, shown as they finish)
+# ---------------------------------------------------------
+
+# name -> (section title, all-clear message, findings message)
+ALERT_SECTIONS = {
+    "spikes_usage": ("Usage Spikes", "No usage spikes detected.", "Usage spikes detected:"),
+    "spikes_cost": ("Cost Spikes", "No cost spikes detected.", "Cost spikes detected:"),
+    "seasonal_anomalies": (
+        "Seasonal Anomalies",
+        "No usage outside the normal seasonal range.",
+        "Usage outside the normal seasonal range (robust z-score):",
+    ),
+    "missing_bills": ("Missing Bills", "No missing billing months detected.", "Missing billing months detected:"),
+    "irregular_billing": (
+        "Irregular Billing Periods",
+        "No irregular billing periods detected.",
+        "Irregular billing periods detected:",
+    ),
+    "bad_readings": ("Bad or Negative Readings", "No bad readings detected.", "Bad readings detected:"),
+    "meter_anomalies": (
+        "Meter Anomalies",
+        "No meter anomalies detected.",
+        "Meter anomalies detected (Z-score outliers):",
+    ),
+    "occupancy_anomalies": (
+        "Occupancy Anomalies",
+        "No occupancy anomalies detected.",
+        "Significant occupancy anomalies detected:",
+    ),
+}
+
+# Lay out every section up front so results can fill in as they complete
+placeholders = {}
+
+for name, (title, _, _) in ALERT_SECTIONS.items():
+    st.subheader(title)
+    placeholders[name] = st.empty()
+    placeholders[name].caption("Running...")
+    section_divider()
+
+for name, result in iter_alert_summary(df, detectors=list(ALERT_SECTIONS)):
+    _, all_clear, findings = ALERT_SECTIONS[name]
+
+    with placeholders[name].container():
+        if result.empty:
+            st.success(all_clear)
+        else:
+            st.warning(findings)
+            st.dataframe(result, use_container_width=True)
+
+
+# ---------------------------------------------------------
+# PORTFOLIO ALERT SCAN (every property / utility / meter)
 # ---------------------------------------------------------
 
-st.subheader("Usage Spikes")
+st.subheader("Portfolio Alert Scan")
+
+df_all = st.session_state.df
+# Page caches below are keyed on the version computed once at load
+df_version = st.session_state.df_version
 
-usage_spikes = detect_spikes(df, metric="usage")
+# Only bills added or changed since the last scan (plus look-back) are evaluated
+new_alerts = evaluate_incremental(df_all, version=df_version)
+if not new_alerts.empty:
+    st.info(f"{len(new_alerts):,} new alerts since the last scan.")
 
-if usage_spikes.empty:
-    st.success("No usage spikes detected.")
+status_filter = st.multiselect("Status", ALERT_STATUSES, default=["open", "acknowledged"])
+portfolio_alerts = load_alerts(status=status_filter)
+
+if portfolio_alerts.empty:
+    st.success("No alerts anywhere in the portfolio.")
 else:
-    st.warning("Usage spikes detected:")
-    st.dataframe(usage_spikes, use_container_width=True)
+    alert_counts = (
+        portfolio_alerts.groupby(["property", "utility", "alert_type"])
+        .size()
+        .unstack(fill_value=0)
+        .reset_index()
+    )
+    st.warning(f"{len(portfolio_alerts):,} alerts across the portfolio:")
+    st.dataframe(alert_counts, use_container_width=True)
+
+    selected_types = st.multiselect(
+        "Alert types",
+        sorted(portfolio_alerts["alert_type"].unique()),
+        default=sorted(portfolio_alerts["alert_type"].unique()),
+    )
+    shown = portfolio_alerts[portfolio_alerts["alert_type"].isin(selected_types)]
+    st.dataframe(shown, use_container_width=True)
+
+    selected_ids = st.multiselect(
+        "Select alerts to update",
+        shown["alert_id"].tolist(),
+        format_func=lambda i: " | ".join(
+            shown.loc[shown["alert_id"] == i, ["property", "utility", "alert_type"]]
+            .iloc[0].astype(str)
+        ) + f" | {shown.loc[shown['alert_id'] == i, 'date'].iloc[0]:%Y-%m}",
+    )
+
+    col1, col2 = st.columns(2)
+    if col1.button("Acknowledge", disabled=not selected_ids):
+        acknowledge_alerts(selected_ids)
+        st.rerun()
+    if col2.button("Resolve", disabled=not selected_ids):
+        resolve_alerts(selected_ids)
+        st.rerun()
 
 
 section_divider()
 
 
-st.subheader("Cost Spikes")
+# ---------------------------------------------------------
+# BILL COVERAGE (every meter, every month)
+# ---------------------------------------------------------
+
+st.subheader("Bill Coverage")
+
+
+@st.cache_data
+def load_coverage(_df, version):
+    return meter_coverage(_df)
+
 
-cost_spikes = detect_spikes(df, metric="cost")
+coverage = load_coverage(df_all, df_version)
 
-if cost_spikes.empty:
-    st.success("No cost spikes detected.")
+if coverage.empty:
+    st.info("No bills to check coverage for.")
 else:
-    st.warning("Cost spikes detected:")
-    st.dataframe(cost_spikes, use_container_width=True)
+    late_meters = coverage[coverage["late"]]
+    gappy_meters = coverage[coverage["missing_months"] > 0]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Portfolio Coverage", f"{coverage['billed_months'].sum() / coverage['expected_months'].sum() * 100:.1f}%")
+    col2.metric("Late Meters", f"{len(late_meters):,}")
+    col3.metric("Meters With Gaps", f"{len(gappy_meters):,}")
+
+    st.markdown("**Coverage by provider**")
+    st.dataframe(provider_coverage(coverage), use_container_width=True)
+
+    if late_meters.empty and gappy_meters.empty:
+        st.success("Every meter has a bill for every month.")
+    else:
+        st.warning("Meters with missing or late bills (lowest coverage first):")
+        st.dataframe(
+            coverage[coverage["late"] | (coverage["missing_months"] > 0)]
+            .sort_values("coverage_pct"),
+            use_container_width=True,
+        )
 
 
 section_divider()
 
 
 # ---------------------------------------------------------
-# MISSING BILLS
+# BILLING INTEGRITY (duplicates + overlapping / gapped periods)
 # ---------------------------------------------------------
 
-st.subheader("Missing Bills")
+st.subheader("Billing Integrity")
+
+
+@st.cache_data
+def load_integrity_findings(_df, version):
+    return find_duplicate_bills(_df), find_period_issues(_df)
 
-missing = detect_missing_bills(df)
 
-if missing.empty:
-    st.success("No missing billing months detected.")
+duplicate_bills, period_issues = load_integrity_findings(df_all, df_version)
+
+if duplicate_bills.empty:
+    st.success("No duplicate bills found.")
+else:
+    st.warning("Bills entered more than once (exact or near copies):")
+    st.dataframe(duplicate_bills, use_container_width=True)
+
+if period_issues.empty:
+    st.success("No overlapping or gapped billing periods.")
 else:
-    st.warning("Missing billing months detected:")
-    st.dataframe(missing, use_container_width=True)
+    st.warning("Billing periods that overlap or leave gaps on the same meter:")
+    st.dataframe(period_issues, use_container_width=True)
 
 
 section_divider()
 
 
 # ---------------------------------------------------------
-# IRREGULAR BILLING PERIODS
+# BILLS ABOVE BENCHMARK (point-in-time benchmark per bill)
 # ---------------------------------------------------------
 
-st.subheader("Irregular Billing Periods")
+st.subheader("Bills Above Benchmark")
+
+benchmark_threshold = st.slider(
+    "Deviation threshold (%)", 5, 100, 25, step=5, key="benchmark_threshold"
+)
+
+
+@st.cache_data
+def load_bills_above_benchmark(_df, version, threshold_pct):
+    return bills_above_benchmark(_df, threshold_pct=threshold_pct)
+
 
-irregular = detect_irregular_billing_periods(df)
+above_benchmark = load_bills_above_benchmark(df_all, df_version, benchmark_threshold)
 
-if irregular.empty:
-    st.success("No irregular billing periods detected.")
+if above_benchmark.empty:
+    st.success(f"No bill exceeds its benchmark by more than {benchmark_threshold}%.")
 else:
-    st.warning("Irregular billing periods detected:")
-    st.dataframe(irregular, use_container_width=True)
+    st.warning(
+        f"{len(above_benchmark):,} bills exceed the benchmark valid on their date "
+        f"by more than {benchmark_threshold}%:"
+    )
+    st.dataframe(above_benchmark, use_container_width=True)
 
 
 section_divider()
 
 
 # ---------------------------------------------------------
-# BAD READINGS
+# READING RECONCILIATION (reading deltas vs billed usage)
 # ---------------------------------------------------------
 
-st.subheader("Bad or Negative Readings")
+st.subheader("Meter Reading Reconciliation")
+
+
+@st.cache_data
+def load_reading_findings(_df, version):
+    return reconcile_readings(_df)
 
-bad_readings = detect_bad_readings(df)
 
-if bad_readings.empty:
-    st.success("No bad readings detected.")
+reading_findings = load_reading_findings(df_all, df_version)
+
+if reading_findings.empty:
+    st.success("Every bill's readings match its billed usage and continue from the last bill.")
 else:
-    st.warning("Bad readings detected:")
-    st.dataframe(bad_readings, use_container_width=True)
+    col1, col2 = st.columns(2)
+    col1.metric("Bills With Findings", f"{len(reading_findings):,}")
+    col2.metric("Net Dollar Impact", f"${reading_findings['dollar_impact'].sum():,.0f}")
+
+    st.warning("Meters whose readings don't reconcile with billed usage:")
+    st.dataframe(reconciliation_summary(reading_findings), use_container_width=True)
+
+    with st.expander("Bill-level findings"):
+        st.dataframe(reading_findings, use_container_width=True)
 
 
 section_divider()
 
 
 # ---------------------------------------------------------
-# METER ANOMALIES
+# LEVEL SHIFTS (change points in usage and effective rate)
 # ---------------------------------------------------------
 
-st.subheader("Meter Anomalies")
+st.subheader("Level Shifts (Change Points)")
+
+
+@st.cache_data
+def load_change_points(_df, version):
+    return detect_change_points(_df)
 
-meter_anoms = detect_meter_anomalies(df)
 
-if meter_anoms.empty:
-    st.success("No meter anomalies detected.")
+change_points = load_change_points(df_all, df_version)
+
+only_selected_cp = st.checkbox(
+    "Only show the selected property / utility", value=False, key="cp_only_selected"
+)
+if only_selected_cp and not df.empty and not change_points.empty:
+    change_points = change_points[
+        (change_points["property"] == df["property"].iloc[0])
+        & (change_points["utility"] == df["utility"].iloc[0])
+    ]
+
+if change_points.empty:
+    st.success("No lasting level shifts detected.")
 else:
-    st.warning("Meter anomalies detected (Z-score outliers):")
-    st.dataframe(meter_anoms, use_container_width=True)
+    st.warning("Lasting shifts in usage or effective rate (largest first):")
+    st.dataframe(change_points, use_container_width=True)
 
 
 section_divider()
 
 
 # ---------------------------------------------------------
-# OCCUPANCY ANOMALIES
+# FORECAST RESIDUAL ANOMALIES (portfolio-wide)
 # ---------------------------------------------------------
 
-st.subheader("Occupancy Anomalies")
-
-occ_anoms = detect_occupancy_anomalies(df)
+st.subheader("Forecast Residual Anomalies (Portfolio)")
 
-if occ_anoms.empty:
-    st.success("No occupancy anomalies detected.")
+# Engines picked per utility by the latest backtest (Prophet otherwise)
+engine_by_utility = engine_selection()
+use_regressors = st.checkbox(
+    "Use occupancy as a forecast driver", value=False, key="portfolio_regressors"
+)
+portfolio_key = portfolio_forecast_key(
+    df_all, engine_by_utility=engine_by_utility, periods=12, engine="prophet",
+    use_regressors=use_regressors,
+)
+portfolio_forecasts = FORECAST_CACHE.get(portfolio_key)
+
+if portfolio_forecasts is None:
+    # Fall back to the last stored (e.g. nightly) portfolio forecast, but
+    # only if it was fitted on the data and settings selected now
+    stored_forecasts = load_portfolio_forecasts()
+    portfolio_forecasts = stored_forecasts[stored_forecasts["forecast_key"] == portfolio_key]
+    if not stored_forecasts.empty and portfolio_forecasts.empty:
+        st.warning(
+            "Stored portfolio forecasts were fitted on different data or "
+            "engine settings and are ignored."
+        )
+
+if portfolio_forecasts.empty:
+    job = FORECAST_JOBS.status(portfolio_key)
+
+    if job is not None and job.active:
+        st.info(f"Portfolio forecasts are being fitted in the background ({job.message.lower()}).")
+    else:
+        if job is not None and job.status == "failed":
+            st.error("Portfolio forecasts could not be generated.")
+            with st.expander("Error details"):
+                st.code(job.error)
+        else:
+            st.info("No portfolio forecasts for the current data yet.")
+        if st.button("Fit portfolio forecasts in background"):
+            submit_portfolio_forecast_job(
+                df_all, periods=12, engine="prophet",
+                engine_by_utility=engine_by_utility, use_regressors=use_regressors,
+                retry=True,
+            )
+            st.rerun()
 else:
-    st.warning("Significant occupancy anomalies detected:")
-    st.dataframe(occ_anoms, use_container_width=True)
+    residual_anoms = detect_forecast_residual_anomalies(df_all, portfolio_forecasts)
+
+    only_selected = st.checkbox("Only show the selected property / utility", value=False)
+    if only_selected and not df.empty and not residual_anoms.empty:
+        residual_anoms = residual_anoms[
+            (residual_anoms["property"] == df["property"].iloc[0])
+            & (residual_anoms["utility"] == df["utility"].iloc[0])
+        ]
+
+    if residual_anoms.empty:
+        st.success("All actuals fall inside their forecast intervals.")
+    else:
+        st.warning("Actuals outside the forecast interval (sorted by severity):")
+        st.dataframe(residual_anoms, use_container_width=True)
@@ -8,7 +8,10 @@ from utils.preprocess import (
     utility_group,
     provider_group,
 )
-from utils.charts import utility_mix
+from utils.charts import utility_mix, forecast_chart
+from utils.hierarchy import hierarchical_forecast
+from utils.benchmarks import seasonal_efficiency
+from utils.peers import property_peer_scores, property_peer_summary
 
 
 # ---------------------------------------------------------
@@ -38,18 +41,21 @@ st.subheader("Portfolio KPIs")
 
 summary = portfolio_summary(df).iloc[0]
 
-col1, col2, col3, col4 = st.columns(4)
+col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    kpi_card("Total Usage", f"{summary['total_usage']:,.0f}")
+    kpi_card("Total Energy (MMBtu)", f"{summary['total_mmbtu']:,.0f}")
 
 with col2:
-    kpi_card("Total Cost", f"${summary['total_cost']:,.0f}")
+    kpi_card("Emissions (t CO2e)", f"{summary['total_co2e_tonnes']:,.0f}")
 
 with col3:
-    kpi_card("Total Properties", f"{summary['total_properties']}")
+    kpi_card("Total Cost", f"${summary['total_cost']:,.0f}")
 
 with col4:
+    kpi_card("Total Properties", f"{summary['total_properties']}")
+
+with col5:
     kpi_card("Total Meters", f"{summary['total_meters']}")
 
 
@@ -67,7 +73,72 @@ util_df = utility_group(df)
 if util_df.empty:
     st.info("No utility data available.")
 else:
-    st.altair_chart(utility_mix(util_df), use_container_width=True)
+    mix_metric = st.radio(
+        "Share of",
+        ["total_mmbtu", "total_kg_co2e", "total_cost"],
+        format_func={
+            "total_mmbtu": "Energy (MMBtu)",
+            "total_kg_co2e": "Emissions (CO2e)",
+            "total_cost": "Cost",
+        }.get,
+        horizontal=True,
+    )
+    st.altair_chart(utility_mix(util_df, metric=mix_metric), use_container_width=True)
+
+
+section_divider()
+
+
+# ---------------------------------------------------------
+# RECONCILED PORTFOLIO FORECAST
+# ---------------------------------------------------------
+
+st.subheader("Portfolio Forecast")
+
+@st.cache_data
+def load_portfolio_forecast(_df, version, utility):
+    """
+    Reconciled meter -> property -> utility -> portfolio forecast.
+    Cost across all utilities, or usage within a single utility.
+    """
+    if utility == "All":
+        return hierarchical_forecast(_df, metric="cost", use_processes=False)
+    return hierarchical_forecast(
+        _df[_df["utility"] == utility], metric="usage", use_processes=False
+    )
+
+forecast_utility = st.selectbox(
+    "Forecast scope",
+    ["All"] + sorted(df["utility"].dropna().unique()),
+    help="'All' forecasts total cost; a single utility forecasts usage.",
+)
+
+hist_df, rec_df = load_portfolio_forecast(df, st.session_state.df_version, forecast_utility)
+
+if rec_df.empty:
+    st.info("Not enough meter-level data to build a portfolio forecast.")
+else:
+    top_level = rec_df["level"].iloc[0]
+    actual_top = hist_df[hist_df["level"] == top_level][["ds", "y"]]
+    forecast_top = rec_df[rec_df["level"] == top_level]
+
+    forecast_title = (
+        "Forecasted Portfolio Cost" if forecast_utility == "All"
+        else f"Forecasted {forecast_utility} Usage"
+    )
+    st.altair_chart(
+        forecast_chart(actual_top, forecast_top, title=forecast_title),
+        use_container_width=True,
+    )
+
+    property_totals = (
+        rec_df[rec_df["level"] == "property"]
+        .groupby(["utility", "property"])["yhat"]
+        .sum()
+        .reset_index()
+        .rename(columns={"yhat": "forecast_next_12_months"})
+    )
+    st.dataframe(property_totals, use_container_width=True)
 
 
 section_divider()
@@ -90,6 +161,51 @@ else:
 section_divider()
 
 
+# ---------------------------------------------------------
+# BENCHMARK EFFICIENCY (seasonal, by climate region)
+# ---------------------------------------------------------
+
+st.subheader("Benchmark Efficiency")
+st.caption(
+    "Actual usage vs a benchmark that follows each utility's monthly profile "
+    "for the property's climate region, summed over the same billed months."
+)
+
+efficiency_df = seasonal_efficiency(df)
+
+if efficiency_df.empty or efficiency_df["benchmark_usage"].isna().all():
+    st.info("No benchmark data available for these properties.")
+else:
+    st.dataframe(
+        efficiency_df.sort_values("efficiency_score"),
+        use_container_width=True,
+    )
+
+
+section_divider()
+
+
+# ---------------------------------------------------------
+# PEER BENCHMARKS (property-month percentiles within peer groups)
+# ---------------------------------------------------------
+
+st.subheader("Peer Benchmarks")
+
+peer_summary = property_peer_summary(property_peer_scores(df, version=st.session_state.df_version))
+
+if peer_summary.empty:
+    st.info("Not enough data to build peer groups.")
+else:
+    st.caption(
+        "Mean 1-100 peer score over the last 12 months "
+        "(100 = lowest intensity among properties of the same utility, size and state)."
+    )
+    st.dataframe(peer_summary, use_container_width=True)
+
+
+section_divider()
+
+
 # ---------------------------------------------------------
 # TOP & BOTTOM PROPERTIES
 # ---------------------------------------------------------
@@ -7,19 +7,14 @@ from utils.preprocess import (
     provider_group,
     utility_group,
 )
-from utils.alerts import (
-    detect_spikes,
-    detect_missing_bills,
-    detect_irregular_billing_periods,
-    detect_bad_readings,
-    detect_meter_anomalies,
-    detect_occupancy_anomalies,
-)
-from utils.forecasting import (
-    prepare_monthly_forecast_df,
-    run_forecast,
-    merge_actual_and_forecast,
-)
+from utils.alerts import iter_alert_summary
+from utils.alert_store import evaluate_incremental, load_alerts
+from utils.cache import FORECAST_CACHE
+from utils.changepoints import detect_change_points
+from utils.forecast_jobs import FORECAST_JOBS, forecast_job_key, submit_forecast_job
+from utils.forecasting import merge_actual_and_forecast
+from utils.tariffs import tariff_audit
+from utils.rates import bill_rates, rate_history
 
 
 # ---------------------------------------------------------
@@ -116,28 +111,121 @@ st.dataframe(utility_df, use_container_width=True)
 st.markdown("---")
 
 
+# ---------------------------------------------------------
+# TARIFF AUDIT EXPORT
+# ---------------------------------------------------------
+
+st.subheader("Tariff Audit")
+
+audit_df = tariff_audit(df)
+
+export_csv(audit_df, "tariff_audit.csv")
+
+st.dataframe(audit_df, use_container_width=True)
+
+st.markdown("---")
+
+
+# ---------------------------------------------------------
+# EFFECTIVE RATE EXPORTS
+# ---------------------------------------------------------
+
+st.subheader("Effective Rates")
+
+st.markdown("### Bill Rates")
+
+bill_rate_df = df[["property", "utility", "provider_code", "meter_number", "date", "usage", "cost"]].assign(
+    effective_rate=bill_rates(df)
+)
+
+export_csv(bill_rate_df, "bill_rates.csv")
+
+st.dataframe(bill_rate_df, use_container_width=True)
+
+if "df" in st.session_state:
+    st.markdown("### Monthly Rate History")
+
+    rates_df = rate_history(st.session_state.df, version=st.session_state.df_version)
+
+    export_csv(rates_df, "rate_history.csv")
+
+    st.dataframe(rates_df, use_container_width=True)
+
+st.markdown("---")
+
+
 # ---------------------------------------------------------
 # ALERT EXPORTS
 # ---------------------------------------------------------
 
 st.subheader("Alerts & Anomalies")
 
-alerts = {
-    "usage_spikes": detect_spikes(df, metric="usage"),
-    "cost_spikes": detect_spikes(df, metric="cost"),
-    "missing_bills": detect_missing_bills(df),
-    "irregular_billing": detect_irregular_billing_periods(df),
-    "bad_readings": detect_bad_readings(df),
-    "meter_anomalies": detect_meter_anomalies(df),
-    "occupancy_anomalies": detect_occupancy_anomalies(df),
+# Export file name -> detector in utils.alerts.ALERT_DETECTORS
+alert_exports = {
+    "usage_spikes": "spikes_usage",
+    "cost_spikes": "spikes_cost",
+    "seasonal_anomalies": "seasonal_anomalies",
+    "missing_bills": "missing_bills",
+    "irregular_billing": "irregular_billing",
+    "bad_readings": "bad_readings",
+    "meter_anomalies": "meter_anomalies",
+    "occupancy_anomalies": "occupancy_anomalies",
+    "duplicate_bills": "duplicate_bills",
+    "billing_period_issues": "billing_period_issues",
+    "reading_reconciliation": "reading_reconciliation",
 }
 
-for name, alert_df in alerts.items():
+# Reserve a slot per export, then fill each one as its detector finishes
+alert_slots = {}
+for name, detector in alert_exports.items():
     st.markdown(f"### {name.replace('_', ' ').title()}")
-    export_csv(alert_df, f"{name}.csv")
-    st.dataframe(alert_df, use_container_width=True)
+    alert_slots[detector] = (name, st.empty())
     st.markdown("---")
 
+for detector, alert_df in iter_alert_summary(df, detectors=list(alert_exports.values())):
+    name, slot = alert_slots[detector]
+    with slot.container():
+        export_csv(alert_df, f"{name}.csv")
+        st.dataframe(alert_df, use_container_width=True)
+
+
+# ---------------------------------------------------------
+# PORTFOLIO ALERT EXPORT
+# ---------------------------------------------------------
+
+st.subheader("Portfolio Alerts")
+
+if "df" in st.session_state:
+    evaluate_incremental(st.session_state.df, version=st.session_state.df_version)
+    portfolio_alerts = load_alerts()
+
+    export_csv(portfolio_alerts, "portfolio_alerts.csv")
+
+    st.dataframe(portfolio_alerts, use_container_width=True)
+
+st.markdown("---")
+
+
+# ---------------------------------------------------------
+# CHANGE POINT EXPORT
+# ---------------------------------------------------------
+
+st.subheader("Level Shifts (Change Points)")
+
+@st.cache_data
+def load_change_points(_df, version):
+    return detect_change_points(_df)
+
+
+if "df" in st.session_state:
+    change_points = load_change_points(st.session_state.df, st.session_state.df_version)
+
+    export_csv(change_points, "change_points.csv")
+
+    st.dataframe(change_points, use_container_width=True)
+
+st.markdown("---")
+
 
 # ---------------------------------------------------------
 # FORECAST EXPORT
@@ -145,14 +233,44 @@ for name, alert_df in alerts.items():
 
 st.subheader("Forecast Results")
 
-monthly_df, _ = prepare_monthly_forecast_df(df)
-
-if monthly_df.empty:
+# Reuse the Forecasting page's last job (with its scenario) when it was
+# fitted on this selection; only fit a new one on request
+job_key = forecast_job_key(df, periods=12, engine="prophet")
+last_key = st.session_state.get("forecast_job_key")
+if last_key and last_key.rsplit(":", 1)[0] == job_key.rsplit(":", 1)[0]:
+    job_key = last_key
+
+job = FORECAST_JOBS.status(job_key)
+result = FORECAST_CACHE.get(job_key)
+
+if job is None:
+    st.info("No forecast has been fitted for this selection yet.")
+    if st.button("Fit forecast in background"):
+        submit_forecast_job(df, periods=12, retry=True)
+        st.rerun()
+elif job.status == "failed":
+    st.error("Forecast model could not be generated.")
+    with st.expander("Error details"):
+        st.code(job.error)
+elif job.status != "done":
+    st.info(
+        "The forecast is still being fitted in the background "
+        f"({job.message.lower()}). Revisit this page to download it."
+    )
+elif result is None:
     st.info("Not enough data to generate a forecast.")
 else:
-    forecast_df, model = run_forecast(monthly_df, periods=12)
-    actual_df, forecast_clean = merge_actual_and_forecast(monthly_df, forecast_df)
+    actual_df, forecast_clean = merge_actual_and_forecast(
+        result["monthly"], result["forecast"]
+    )
 
     export_csv(forecast_clean, "forecast_results.csv")
 
     st.dataframe(forecast_clean, use_container_width=True)
+
+    cost_forecast = result["cost_forecast"]
+
+    if cost_forecast is not None:
+        st.markdown("### Cost Forecast")
+        export_csv(cost_forecast, "cost_forecast_results.csv")
+        st.dataframe(cost_forecast, use_container_width=True)
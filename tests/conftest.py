@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_bills(n_props=2, months=24, meters=2, seed=0):
+    """
+    Synthetic monthly electricity bills: seasonal usage driven by
+    occupancy, continuous meter readings, one bill per meter per month.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for p in range(n_props):
+        units = int(rng.integers(80, 160))
+        for m in range(meters):
+            reading = 1000.0
+            for t in range(months):
+                start = pd.Timestamp("2022-01-01") + pd.DateOffset(months=t)
+                end = start + pd.DateOffset(months=1) - pd.Timedelta(days=1)
+                occupancy = float(np.clip(70 + 10 * np.sin(t / 12 * 2 * np.pi) + rng.normal(0, 3), 30, 100))
+                usage = 20000 * (1 + 0.3 * np.sin(t / 12 * 2 * np.pi)) * rng.uniform(0.95, 1.05)
+                cost = usage * 0.12
+                days = (end - start).days + 1
+                rows.append(dict(
+                    property=f"Prop {p}", state="TX", utility="Electricity",
+                    provider_code="TXU", meter_number=f"M{p}E{m}",
+                    start_date=start, end_date=end, date=start,
+                    usage=usage, cost=cost, occupancy=occupancy, units=units,
+                    days_billed=days, previous_reading=reading,
+                    current_reading=reading + usage, reading_delta=usage,
+                ))
+                reading += usage
+
+    df = pd.DataFrame(rows)
+    df["year"] = df["date"].dt.year
+    df["month"] = df["date"].dt.month
+    return df
+
+
+@pytest.fixture
+def bills():
+    return make_bills()
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from utils.alert_store import evaluate_incremental, load_alerts
+
+from conftest import make_bills
+
+
+def _bills_with_meter_anomaly():
+    df = make_bills(n_props=1, meters=8)
+    heavy = df["meter_number"] == "M0E0"
+    df.loc[heavy, ["usage", "cost", "reading_delta"]] *= 5
+    return df
+
+
+def test_evaluate_incremental_is_idempotent(tmp_path, bills):
+    db = tmp_path / "alerts.db"
+
+    evaluate_incremental(bills, path=db)
+    stored = load_alerts(db)
+
+    assert evaluate_incremental(bills, path=db).empty
+    assert len(load_alerts(db)) == len(stored)
+
+
+def test_meter_anomaly_is_not_duplicated_as_bills_arrive(tmp_path):
+    db = tmp_path / "alerts.db"
+    df = _bills_with_meter_anomaly()
+    months = sorted(df["date"].unique())
+
+    first = evaluate_incremental(df[df["date"] < months[-2]], path=db)
+    assert (first["alert_type"] == "meter_anomaly").sum() == 1
+
+    for month in months[-2:]:
+        new_alerts = evaluate_incremental(df[df["date"] <= month], path=db)
+        assert "meter_anomaly" not in set(new_alerts["alert_type"])
+
+    meter_alerts = load_alerts(db)
+    meter_alerts = meter_alerts[meter_alerts["alert_type"] == "meter_anomaly"]
+
+    assert len(meter_alerts) == 1
+    assert meter_alerts["status"].iloc[0] == "open"
+    assert meter_alerts["date"].iloc[0] == pd.Timestamp(months[-1])
+
+
+def test_backfilled_bill_is_evaluated(tmp_path, bills):
+    db = tmp_path / "alerts.db"
+    evaluate_incremental(bills, path=db)
+
+    spiked = bills.copy()
+    row = spiked.index[(spiked["meter_number"] == "M0E0") & (spiked["date"] == "2022-06-01")][0]
+    spiked.loc[row, ["usage", "cost"]] *= 3
+
+    new_alerts = evaluate_incremental(spiked, path=db)
+
+    spikes = new_alerts[(new_alerts["alert_type"] == "spike_usage") & (new_alerts["meter_number"] == "M0E0")]
+    assert pd.Timestamp("2022-06-01") in set(spikes["date"])
@@ -0,0 +1,36 @@
+import numpy as np
+
+from utils.elasticity import fit_occupancy_elasticity, monthly_usage_occupancy
+
+from conftest import make_bills
+
+
+def test_grouped_fit_matches_polyfit_per_series():
+    df = make_bills(n_props=3, months=24)
+
+    fit = fit_occupancy_elasticity(df).set_index("property")
+    monthly = monthly_usage_occupancy(df)
+
+    assert len(fit) == 3
+
+    for prop, series in monthly.groupby("property"):
+        x, y = series["occupancy"].to_numpy(), series["usage"].to_numpy()
+        (slope, baseload), cov = np.polyfit(x, y, 1, cov=True)
+        r2 = np.corrcoef(x, y)[0, 1] ** 2
+        # Student-t quantile for 95% and 22 degrees of freedom
+        half_width = 2.0739 * np.sqrt(cov[0, 0])
+
+        row = fit.loc[prop]
+        assert row["months"] == 24
+        assert np.isclose(row["slope"], slope / 100, atol=0.01)
+        assert np.isclose(row["baseload"], baseload, atol=0.1)
+        assert np.isclose(row["r2"], r2, atol=0.001)
+        assert np.isclose(row["slope_upper"] - row["slope_lower"], 2 * half_width / 100, atol=0.05)
+
+
+def test_short_series_are_not_fitted():
+    fit = fit_occupancy_elasticity(make_bills(n_props=1, months=4))
+
+    assert len(fit) == 1
+    assert fit[["baseload", "slope", "r2"]].isna().all(axis=None)
+    assert not fit["significant"].any()
@@ -0,0 +1,74 @@
+import time
+
+from utils.forecast_jobs import (
+    ForecastJobManager,
+    load_portfolio_forecasts,
+    portfolio_forecast_key,
+    portfolio_forecast_pipeline,
+)
+
+
+def _wait(manager, key, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.status(key)
+        if job is not None and not job.active:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def _fail(progress=None):
+    raise ValueError("boom")
+
+
+def test_failed_job_is_not_resubmitted_without_retry():
+    manager = ForecastJobManager(max_workers=1)
+    calls = []
+
+    def failing(progress=None):
+        calls.append(1)
+        _fail()
+
+    first = manager.submit("jobs-test:fail", failing)
+    _wait(manager, "jobs-test:fail")
+
+    again = manager.submit("jobs-test:fail", failing)
+    assert again is first
+    assert again.status == "failed"
+    assert "boom" in again.error
+    assert len(calls) == 1
+
+    manager.submit("jobs-test:fail", failing, retry=True)
+    _wait(manager, "jobs-test:fail")
+    assert len(calls) == 2
+
+
+def test_old_failed_jobs_are_pruned():
+    manager = ForecastJobManager(max_workers=1, keep_failed_for=0)
+
+    manager.submit("jobs-test:old", _fail)
+    _wait(manager, "jobs-test:old")
+    time.sleep(0.01)
+
+    manager.submit("jobs-test:other", lambda progress=None: None)
+    assert "jobs-test:old" not in manager._jobs
+
+
+def test_stored_portfolio_forecasts_carry_their_settings(tmp_path, bills):
+    path = tmp_path / "portfolio_forecasts.csv"
+    portfolio_forecast_pipeline(bills, periods=3, engine="trend_seasonal", path=path)
+
+    stored = load_portfolio_forecasts(path)
+    same = portfolio_forecast_key(bills, periods=3, engine="trend_seasonal", use_regressors=False)
+    other_engine = portfolio_forecast_key(bills, periods=3, engine="seasonal_naive", use_regressors=False)
+
+    assert not stored.empty
+    assert (stored["forecast_key"] == same).all()
+    assert not (stored["forecast_key"] == other_engine).any()
+
+
+def test_missing_portfolio_forecast_file_loads_empty(tmp_path):
+    stored = load_portfolio_forecasts(tmp_path / "missing.csv")
+    assert stored.empty
+    assert "forecast_key" in stored.columns
@@ -0,0 +1,37 @@
+import argparse
+
+import pytest
+
+from utils.alert_runner import _build_notifier
+from utils.notifiers import FileNotifier, Notifier, SmtpNotifier
+
+
+def test_notifier_base_is_abstract():
+    with pytest.raises(TypeError):
+        Notifier()
+
+
+def test_notifiers_are_built_from_the_registry(tmp_path):
+    options = argparse.Namespace(notifier="file", digest_path=str(tmp_path / "digest.txt"))
+
+    notifier = _build_notifier(options)
+
+    assert isinstance(notifier, FileNotifier)
+    assert notifier.path == options.digest_path
+    assert _build_notifier(argparse.Namespace(notifier="none")) is None
+
+
+def test_smtp_notifier_requires_recipients():
+    with pytest.raises(SystemExit):
+        SmtpNotifier.from_options(argparse.Namespace(to=None))
+
+
+def test_file_notifier_appends_digests(tmp_path):
+    path = tmp_path / "digest.txt"
+    notifier = FileNotifier(str(path))
+
+    notifier.send("subject one", "body")
+    notifier.send("subject two", "body")
+
+    text = path.read_text()
+    assert "subject one" in text and "subject two" in text
@@ -0,0 +1,27 @@
+import numpy as np
+
+from utils.peers import property_peer_scores
+
+from conftest import make_bills
+
+
+def test_property_without_peers_is_not_scored():
+    scores = property_peer_scores(make_bills(n_props=1, months=6))
+
+    assert not scores.empty
+    assert (scores["peer_count"] == 1).all()
+    assert scores["peer_score"].isna().all()
+    assert scores["percentile"].isna().all()
+
+
+def test_peer_scores_span_1_to_100_for_any_group_size():
+    scores = property_peer_scores(make_bills(n_props=3, months=6, meters=1))
+    month = scores[(scores["ds"] == scores["ds"].min()) & (scores["metric"] == scores["metric"].iloc[0])]
+
+    assert len(month) == 3
+    assert sorted(month["peer_score"]) == [1, 50, 100]
+    assert sorted(month["percentile"]) == [0, 50, 100]
+
+    lowest = month.loc[month["value"].idxmin()]
+    assert lowest["peer_score"] == 100
+    assert np.isclose(lowest["percentile"], 0)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.rates import detect_rate_changes, rate_history
+
+
+def make_rate_bills(rates, seed=0):
+    """
+    One bill a month at a fixed usage, billed at the given rates (+/-1% noise).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2022-01-01", periods=len(rates), freq="MS")
+
+    return pd.DataFrame({
+        "property": "A", "utility": "Electricity", "provider_code": "TXU",
+        "date": dates, "usage": 1000.0,
+        "cost": 1000.0 * np.asarray(rates) * (1 + rng.normal(0, 0.01, len(rates))),
+    })
+
+
+@pytest.mark.parametrize("window", [3, 6])
+def test_lasting_rate_change_is_one_step(window):
+    df = make_rate_bills([0.10] * 12 + [0.13] * 12 + [0.11] * 12)
+
+    events = detect_rate_changes(df, window=window)
+
+    steps = events[events["event"] == "rate_step"].sort_values("month_start")
+    assert list(steps["month_start"]) == [pd.Timestamp("2023-01-01"), pd.Timestamp("2024-01-01")]
+    assert list(np.sign(steps["change_pct"])) == [1, -1]
+    assert not events["event"].eq("rate_spike").any()
+
+
+def test_one_month_jump_that_reverts_is_a_spike():
+    rates = [0.10] * 24
+    rates[12] = 0.15
+    history = rate_history(make_rate_bills(rates))
+
+    flagged = history[history["event"].notna()]
+    assert list(flagged["month_start"]) == [pd.Timestamp("2023-01-01")]
+    assert flagged["event"].iloc[0] == "rate_spike"
+
+
+def test_jump_in_the_latest_month_is_unconfirmed():
+    history = rate_history(make_rate_bills([0.10] * 12 + [0.13]))
+
+    flagged = history[history["event"].notna()]
+    assert list(flagged["event"]) == ["unconfirmed"]
+    assert flagged["month_start"].iloc[0] == pd.Timestamp("2023-01-01")
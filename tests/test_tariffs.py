@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.tariffs as tariffs
+from utils.tariffs import DAYS_PER_MONTH, expected_bill_costs
+
+
+@pytest.fixture
+def tariff_files(tmp_path, monkeypatch):
+    schedules = tmp_path / "schedules.csv"
+    schedules.write_text(
+        "schedule_id,provider_code,utility,state,effective_from,effective_to,"
+        "customer_charge,demand_rate,summer_months\n"
+        "P-2022,P,Electricity,,2022-01-01,2022-12-31,30.00,10.00,7\n"
+        "P-2023,P,Electricity,,2023-01-01,,60.00,0.00,\n"
+    )
+    tiers = tmp_path / "tiers.csv"
+    tiers.write_text(
+        "schedule_id,season,tier_start,rate\n"
+        "P-2022,summer,0,0.20\n"
+        "P-2022,summer,1000,0.10\n"
+        "P-2022,winter,0,0.10\n"
+        "P-2023,all,0,0.50\n"
+    )
+    load = tariffs.load_tariffs
+    monkeypatch.setattr(tariffs, "load_tariffs", lambda: load(str(schedules), str(tiers)))
+
+
+def _bill(date, usage, days=DAYS_PER_MONTH, utility="Electricity", demand_kw=0.0):
+    return dict(
+        provider_code="P", utility=utility, date=pd.Timestamp(date),
+        usage=usage, days_billed=days, demand_kw=demand_kw,
+    )
+
+
+def test_expected_costs_follow_tiers_seasons_and_schedule_versions(tariff_files):
+    df = pd.DataFrame([
+        _bill("2022-07-01", 1500, demand_kw=5),   # summer, crosses the 1000 tier
+        _bill("2022-01-01", 1500),                # winter, flat
+        _bill("2023-01-01", 1500),                # next schedule version
+        _bill("2022-07-01", 1500, utility="Gas"), # no schedule for this utility
+    ])
+
+    expected = expected_bill_costs(df)
+
+    assert list(expected["schedule_id"].iloc[:3]) == ["P-2022", "P-2022", "P-2023"]
+    assert list(expected["season"].iloc[:2]) == ["summer", "winter"]
+    assert np.allclose(expected["expected_energy"].iloc[:3], [1000 * 0.20 + 500 * 0.10, 150, 750])
+    assert np.allclose(expected["expected_fixed"].iloc[:3], [30, 30, 60])
+    assert np.allclose(expected["expected_demand"].iloc[:3], [50, 0, 0])
+    assert np.allclose(expected["expected_cost"].iloc[:3], [330, 180, 810])
+    assert expected["expected_cost"].iloc[3:].isna().all()
+
+
+def test_short_bills_are_prorated_before_applying_tiers(tariff_files):
+    df = pd.DataFrame([_bill("2022-07-01", 750, days=DAYS_PER_MONTH / 2)])
+
+    expected = expected_bill_costs(df).iloc[0]
+
+    # 750 in half a month is 1500 a month: same tier split, half the charges
+    assert np.isclose(expected["expected_energy"], 125)
+    assert np.isclose(expected["expected_fixed"], 15)
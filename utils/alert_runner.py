@@ -0,0 +1,73 @@
+"""
+Headless alert run for cron, no Streamlit needed:
+
+    python -m utils.alert_runner --notifier file --digest-path alert_digest.txt
+    python -m utils.alert_runner --notifier smtp --to energy@example.com
+"""
+import argparse
+import sys
+import time
+
+from .alert_store import ALERT_DB_PATH, evaluate_incremental
+from .data_loader import DATA_FILE, load_data
+from .notifiers import NOTIFIERS, build_digest
+
+
+# ---------------------------------------------------------
+# RUN
+# ---------------------------------------------------------
+
+def run_alerts(data_file=DATA_FILE, db_path=ALERT_DB_PATH, notifier=None,
+               notify_empty=False):
+    """
+    Load the portfolio, evaluate every alert rule on bills added or changed
+    since the last run, persist the results and send one digest of the
+    newly opened alerts. Returns the new alerts.
+    """
+    df = load_data(data_file)
+    new_alerts = evaluate_incremental(df, path=db_path)
+
+    if notifier is not None and (notify_empty or not new_alerts.empty):
+        notifier.send(*build_digest(new_alerts))
+
+    return new_alerts
+
+
+# ---------------------------------------------------------
+# COMMAND LINE
+# ---------------------------------------------------------
+
+def _build_notifier(args):
+    notifier_cls = NOTIFIERS.get(args.notifier)
+    return notifier_cls.from_options(args) if notifier_cls else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate portfolio alerts and send a digest.")
+    parser.add_argument("--data-file", default=DATA_FILE)
+    parser.add_argument("--db", default=ALERT_DB_PATH)
+    parser.add_argument("--notifier", choices=["none", *NOTIFIERS], default="file")
+    parser.add_argument("--digest-path", default="alert_digest.txt")
+    parser.add_argument("--to", action="append", help="Recipient (repeatable)")
+    parser.add_argument("--sender", default="gridforge@localhost")
+    parser.add_argument("--smtp-host", default="localhost")
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    parser.add_argument("--smtp-user")
+    parser.add_argument("--smtp-password")
+    parser.add_argument("--smtp-tls", action="store_true")
+    parser.add_argument("--notify-empty", action="store_true",
+                        help="Send a digest even when there are no new alerts")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    new_alerts = run_alerts(
+        data_file=args.data_file, db_path=args.db,
+        notifier=_build_notifier(args), notify_empty=args.notify_empty,
+    )
+
+    print(f"{len(new_alerts):,} new alerts in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
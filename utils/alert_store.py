@@ -0,0 +1,329 @@
+import hashlib
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from .alerts import (
+    ALERT_COLUMNS,
+    ALERT_RULE_LOOKBACK_MONTHS,
+    METER_LEVEL_ALERTS,
+    build_portfolio_alerts,
+    meter_level_alerts,
+)
+
+
+ALERT_DB_PATH = "alerts.db"
+
+ALERT_STATUSES = ["open", "acknowledged", "resolved"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    alert_id        TEXT PRIMARY KEY,
+    property        TEXT,
+    utility         TEXT,
+    meter_number    TEXT,
+    date            TEXT,
+    alert_type      TEXT,
+    metric          TEXT,
+    value           REAL,
+    reference       REAL,
+    score           REAL,
+    status          TEXT NOT NULL DEFAULT 'open',
+    first_seen      TEXT NOT NULL,
+    last_seen       TEXT NOT NULL,
+    acknowledged_at TEXT,
+    resolved_at     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts (status);
+CREATE INDEX IF NOT EXISTS idx_alerts_date ON alerts (date);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS evaluated_bills (
+    row_hash INTEGER PRIMARY KEY,
+    date     TEXT NOT NULL
+);
+"""
+
+
+# ---------------------------------------------------------
+# CONNECTION
+# ---------------------------------------------------------
+
+def connect(path=ALERT_DB_PATH) -> sqlite3.Connection:
+    """
+    Open the alert store, creating the tables on first use.
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _now() -> str:
+    return pd.Timestamp.now().floor("s").isoformat()
+
+
+# ---------------------------------------------------------
+# WATERMARK
+# ---------------------------------------------------------
+
+def get_watermark(conn, name="bills"):
+    """
+    Latest bill date evaluated so far (None before the first run).
+    """
+    row = conn.execute("SELECT value FROM watermarks WHERE name = ?", (name,)).fetchone()
+    return pd.Timestamp(row[0]) if row else None
+
+
+def set_watermark(conn, value, name="bills"):
+    conn.execute(
+        "INSERT INTO watermarks (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+        (name, pd.Timestamp(value).isoformat()),
+    )
+
+
+def get_evaluated_version(conn):
+    """
+    dataset_version of the last evaluated frame (None if not recorded).
+    """
+    row = conn.execute("SELECT value FROM watermarks WHERE name = 'version'").fetchone()
+    return row[0] if row else None
+
+
+def set_evaluated_version(conn, version):
+    if version is None:
+        return
+    conn.execute(
+        "INSERT INTO watermarks (name, value) VALUES ('version', ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+        (version,),
+    )
+
+
+# ---------------------------------------------------------
+# EVALUATED BILLS (detects new, changed and backfilled rows)
+# ---------------------------------------------------------
+
+def bill_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Content hash of every bill row (signed, so it fits an SQLite INTEGER).
+    """
+    return pd.Series(
+        pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64"),
+        index=df.index,
+    )
+
+
+def changed_since_last_run(conn, df: pd.DataFrame, hashes: pd.Series):
+    """
+    Earliest bill date that was added, changed or removed since the bills
+    were last evaluated (None when nothing changed).
+    """
+    stored = pd.read_sql_query("SELECT row_hash, date FROM evaluated_bills", conn)
+
+    added = df.loc[~hashes.isin(stored["row_hash"]), "date"]
+    removed = pd.to_datetime(stored.loc[~stored["row_hash"].isin(hashes), "date"])
+
+    changed = pd.concat([added, removed])
+    return changed.min() if not changed.empty else None
+
+
+def set_evaluated_bills(conn, df: pd.DataFrame, hashes: pd.Series):
+    conn.execute("DELETE FROM evaluated_bills")
+    conn.executemany(
+        "INSERT OR IGNORE INTO evaluated_bills (row_hash, date) VALUES (?, ?)",
+        zip(hashes.tolist(), df["date"].dt.strftime("%Y-%m-%d")),
+    )
+
+
+# ---------------------------------------------------------
+# ALERT IDS + UPSERT
+# ---------------------------------------------------------
+
+def alert_ids(alerts: pd.DataFrame) -> pd.Series:
+    """
+    Stable id per alert: series keys + date + rule + metric. Meter-level
+    alerts leave out the date, so a meter keeps one alert as bills arrive.
+    """
+    parts = alerts[["property", "utility", "meter_number", "date", "alert_type", "metric"]].astype(str)
+    parts["date"] = parts["date"].where(~alerts["alert_type"].isin(METER_LEVEL_ALERTS), "")
+    joined = parts.agg("|".join, axis=1)
+    return joined.map(lambda s: hashlib.sha1(s.encode("utf-8")).hexdigest()[:20])
+
+
+def _to_records(alerts: pd.DataFrame, now: str):
+    out = alerts[ALERT_COLUMNS].copy()
+    out["date"] = pd.to_datetime(out["date"]).dt.strftime("%Y-%m-%d")
+    out["meter_number"] = out["meter_number"].astype(str)
+    out = out.astype(object).where(out.notna(), None)
+    out.insert(0, "alert_id", alerts["alert_id"])
+    out["first_seen"] = now
+    out["last_seen"] = now
+    return list(out.itertuples(index=False, name=None))
+
+
+def upsert_alerts(conn, alerts: pd.DataFrame, now=None) -> pd.DataFrame:
+    """
+    Insert new alerts and refresh last_seen on known ones; a resolved
+    alert that fires again is reopened. Returns the alerts that were not
+    in the store before.
+    """
+    if alerts.empty:
+        return alerts
+
+    now = now or _now()
+    alerts = alerts.assign(alert_id=alert_ids(alerts))
+
+    known = pd.read_sql_query(
+        f"SELECT alert_id FROM alerts WHERE date >= ? "
+        f"OR alert_type IN ({', '.join(['?'] * len(METER_LEVEL_ALERTS))})",
+        conn,
+        params=(pd.to_datetime(alerts["date"]).min().strftime("%Y-%m-%d"), *METER_LEVEL_ALERTS),
+    )["alert_id"]
+
+    conn.executemany(
+        f"INSERT INTO alerts (alert_id, {', '.join(ALERT_COLUMNS)}, first_seen, last_seen) "
+        f"VALUES ({', '.join(['?'] * (len(ALERT_COLUMNS) + 3))}) "
+        "ON CONFLICT(alert_id) DO UPDATE SET date = excluded.date, "
+        "value = excluded.value, reference = excluded.reference, "
+        "score = excluded.score, last_seen = excluded.last_seen, "
+        "status = CASE WHEN status = 'resolved' THEN 'open' ELSE status END, "
+        "resolved_at = CASE WHEN status = 'resolved' THEN NULL ELSE resolved_at END",
+        _to_records(alerts, now),
+    )
+
+    return alerts[~alerts["alert_id"].isin(known)].reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# INCREMENTAL EVALUATION
+# ---------------------------------------------------------
+
+def evaluate_incremental(df: pd.DataFrame, path=ALERT_DB_PATH, version=None,
+                         **thresholds) -> pd.DataFrame:
+    """
+    Evaluate only bills from the earliest new, changed or removed bill
+    onward (so backfilled history is picked up), plus the look-back window
+    the rules need, and merge the results into the store.
+
+    - new alerts are inserted as 'open' (first_seen = now)
+    - alerts seen again get last_seen refreshed (resolved ones reopen)
+    - open alerts inside the fully evaluated range that no longer fire
+      are marked 'resolved'
+    - meter-level alerts (METER_LEVEL_ALERTS) are scored on all bills and
+      keep one id per meter, so each run updates rather than duplicates them
+
+    With version (dataset_version of df), a dataset that was already
+    evaluated is skipped without hashing its bills.
+
+    Returns the newly opened alerts.
+    """
+    if df.empty or "date" not in df.columns:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    if version is not None:
+        with closing(connect(path)) as conn:
+            if get_evaluated_version(conn) == version:
+                return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    lookback = pd.DateOffset(months=max(ALERT_RULE_LOOKBACK_MONTHS.values()))
+    hashes = bill_hashes(df)
+    now = _now()
+
+    with closing(connect(path)) as conn, conn:
+        first_run = get_watermark(conn) is None
+        changed_from = None if first_run else changed_since_last_run(conn, df, hashes)
+
+        if not first_run and changed_from is None:
+            set_evaluated_version(conn, version)
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+
+        if first_run:
+            window = df
+            settled_from = df["date"].min()
+        else:
+            settled_from = changed_from.to_period("M").to_timestamp()
+            # Bills before settled_from only give the rules their look-back
+            window = df[df["date"] >= settled_from - lookback]
+
+        alerts = build_portfolio_alerts(window, **thresholds)
+        alerts = alerts[
+            ((alerts["date"] >= settled_from) | (alerts["alert_type"] == "missing_bill"))
+            & ~alerts["alert_type"].isin(METER_LEVEL_ALERTS)
+        ]
+
+        # Meter-level rules are re-scored on every bill, not just the window
+        meter_alerts = meter_level_alerts(df, z_threshold=thresholds.get("z_threshold", 2.5))
+        alerts = pd.concat([alerts, meter_alerts], ignore_index=True) if not meter_alerts.empty else alerts
+
+        new_alerts = upsert_alerts(conn, alerts, now)
+
+        meter_types = ", ".join(["?"] * len(METER_LEVEL_ALERTS))
+        conn.execute(
+            "UPDATE alerts SET status = 'resolved', resolved_at = ? "
+            f"WHERE status = 'open' AND (date >= ? OR alert_type IN ({meter_types})) "
+            "AND last_seen < ?",
+            (now, pd.Timestamp(settled_from).strftime("%Y-%m-%d"), *METER_LEVEL_ALERTS, now),
+        )
+
+        set_watermark(conn, df["date"].max())
+        set_evaluated_bills(conn, df, hashes)
+        set_evaluated_version(conn, version)
+
+    return new_alerts
+
+
+# ---------------------------------------------------------
+# READ + STATUS CHANGES (used by the Alerts page)
+# ---------------------------------------------------------
+
+def load_alerts(path=ALERT_DB_PATH, status=None, property=None, utility=None) -> pd.DataFrame:
+    """
+    Read stored alerts, optionally filtered by status / property / utility.
+    """
+    query = "SELECT * FROM alerts WHERE 1 = 1"
+    params = []
+
+    if status:
+        statuses = [status] if isinstance(status, str) else list(status)
+        query += f" AND status IN ({', '.join(['?'] * len(statuses))})"
+        params += statuses
+    if property is not None:
+        query += " AND property = ?"
+        params.append(property)
+    if utility is not None:
+        query += " AND utility = ?"
+        params.append(utility)
+
+    query += " ORDER BY first_seen DESC, date DESC"
+
+    with closing(connect(path)) as conn:
+        alerts = pd.read_sql_query(query, conn, params=params)
+
+    alerts["date"] = pd.to_datetime(alerts["date"])
+    return alerts
+
+
+def _set_status(ids, status, stamp_col, path):
+    if not ids:
+        return
+
+    now = _now()
+    with closing(connect(path)) as conn, conn:
+        conn.executemany(
+            f"UPDATE alerts SET status = ?, {stamp_col} = ? WHERE alert_id = ?",
+            [(status, now, alert_id) for alert_id in ids],
+        )
+
+
+def acknowledge_alerts(ids, path=ALERT_DB_PATH):
+    _set_status(ids, "acknowledged", "acknowledged_at", path)
+
+
+def resolve_alerts(ids, path=ALERT_DB_PATH):
+    _set_status(ids, "resolved", "resolved_at", path)
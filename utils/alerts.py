@@ -1,31 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 
+from .coverage import missing_meter_months
+from .integrity import find_duplicate_bills, find_period_issues
+from .readings import reconcile_readings
+
+
+# ---------------------------------------------------------
+# SHARED HELPERS
+# ---------------------------------------------------------
+
+def _previous(df: pd.DataFrame, col: str, keys) -> pd.Series:
+    """
+    Previous row's value within each series (df must be sorted by keys + date).
+    """
+    if not keys:
+        return df[col].shift(1)
+    return df.groupby(keys, sort=False, dropna=False)[col].shift(1)
+
 
 # ---------------------------------------------------------
 # SPIKE DETECTION (Usage or Cost)
 # ---------------------------------------------------------
 
-def detect_spikes(df: pd.DataFrame, metric="usage", threshold_pct=40):
+def detect_spikes(df: pd.DataFrame, metric="usage", threshold_pct=40, presorted=False):
     """
     Detects spikes where usage or cost jumps more than X% month-over-month.
+    Each meter is compared only with its own previous bill.
     Returns a dataframe of flagged months.
     """
     if df.empty or metric not in df.columns:
         return pd.DataFrame()
 
-    df = df.copy().sort_values("date")
-    df["prev"] = df[metric].shift(1)
+    keys = ["meter_number"] if "meter_number" in df.columns else []
 
-    df["pct_change"] = np.where(
-        df["prev"] > 0,
-        (df[metric] - df["prev"]) / df["prev"] * 100,
-        np.nan,
+    if not presorted:
+        df = df.sort_values(keys + ["date"])
+    prev = _previous(df, metric, keys)
+
+    pct_change = pd.Series(
+        np.where(prev > 0, (df[metric] - prev) / prev * 100, np.nan),
+        index=df.index,
     )
 
-    spikes = df[df["pct_change"] >= threshold_pct]
+    spikes = pct_change >= threshold_pct
 
-    return spikes[["date", metric, "pct_change"]]
+    return df.loc[spikes, keys + ["date", metric]].assign(pct_change=pct_change[spikes])
 
 
 # ---------------------------------------------------------
@@ -34,23 +56,13 @@ def detect_spikes(df: pd.DataFrame, metric="usage", threshold_pct=40):
 
 def detect_missing_bills(df: pd.DataFrame):
     """
-    Detects missing billing months by checking gaps in monthly periods.
+    Detects missing billing months per meter (not just months where the
+    whole frame has no bill), using the meter x month presence bitmap.
     """
     if df.empty:
         return pd.DataFrame()
 
-    df = df.copy()
-    df["month_start"] = df["date"].dt.to_period("M").dt.to_timestamp()
-
-    full_range = pd.date_range(
-        start=df["month_start"].min(),
-        end=df["month_start"].max(),
-        freq="MS"
-    )
-
-    missing = full_range[~full_range.isin(df["month_start"])]
-
-    return pd.DataFrame({"missing_month": missing})
+    return missing_meter_months(df)
 
 
 # ---------------------------------------------------------
@@ -120,41 +132,525 @@ def detect_meter_anomalies(df: pd.DataFrame, z_threshold=2.5):
 # OCCUPANCY ANOMALIES
 # ---------------------------------------------------------
 
-def detect_occupancy_anomalies(df: pd.DataFrame, threshold_pct=20):
+def detect_occupancy_anomalies(df: pd.DataFrame, threshold_pct=20, presorted=False):
     """
     Flags months where occupancy changes more than X% month-over-month.
     """
     if df.empty or "occupancy" not in df.columns:
         return pd.DataFrame()
 
-    df = df.copy().sort_values("date")
-    df["prev_occ"] = df["occupancy"].shift(1)
+    keys = ["meter_number"] if "meter_number" in df.columns else []
 
-    df["occ_change_pct"] = np.where(
-        df["prev_occ"] > 0,
-        (df["occupancy"] - df["prev_occ"]) / df["prev_occ"] * 100,
-        np.nan,
+    if not presorted:
+        df = df.sort_values(keys + ["date"])
+    prev_occ = _previous(df, "occupancy", keys)
+
+    occ_change_pct = pd.Series(
+        np.where(prev_occ > 0, (df["occupancy"] - prev_occ) / prev_occ * 100, np.nan),
+        index=df.index,
     )
 
-    anomalies = df[abs(df["occ_change_pct"]) >= threshold_pct]
+    anomalies = occ_change_pct.abs() >= threshold_pct
 
-    return anomalies[["date", "occupancy", "occ_change_pct"]]
+    return df.loc[anomalies, keys + ["date", "occupancy"]].assign(
+        occ_change_pct=occ_change_pct[anomalies]
+    )
+
+
+# ---------------------------------------------------------
+# FORECAST RESIDUAL ANOMALIES (portfolio-wide)
+# ---------------------------------------------------------
+
+def detect_forecast_residual_anomalies(df: pd.DataFrame, forecasts: pd.DataFrame,
+                                       keys=("property", "utility")):
+    """
+    Flags monthly actuals outside the stored in-sample forecast interval
+    (yhat_lower / yhat_upper) for every series in one merge.
+    Severity is the distance outside the interval in half-interval widths.
+    """
+    keys = list(keys)
+
+    if df.empty or forecasts.empty or "date" not in df.columns:
+        return pd.DataFrame()
+
+    actual = df[keys + ["date", "usage"]].copy()
+    actual["ds"] = actual["date"].dt.to_period("M").dt.to_timestamp()
+    actual = actual.groupby(keys + ["ds"])["usage"].sum().reset_index()
+
+    merged = actual.merge(
+        forecasts[keys + ["ds", "yhat", "yhat_lower", "yhat_upper"]],
+        on=keys + ["ds"],
+        how="inner",
+    )
+
+    above = merged["usage"] > merged["yhat_upper"]
+    below = merged["usage"] < merged["yhat_lower"]
+
+    half_width = ((merged["yhat_upper"] - merged["yhat_lower"]) / 2).where(lambda w: w > 0)
+    excess = np.where(
+        above,
+        merged["usage"] - merged["yhat_upper"],
+        merged["yhat_lower"] - merged["usage"],
+    )
+
+    merged["direction"] = np.where(above, "above", "below")
+    merged["severity"] = (excess / half_width).round(2)
+
+    anomalies = merged[above | below].sort_values("severity", ascending=False)
+
+    return anomalies[keys + ["ds", "usage", "yhat", "yhat_lower", "yhat_upper",
+                             "direction", "severity"]].reset_index(drop=True)
 
 
 # ---------------------------------------------------------
 # COMBINED ALERT SUMMARY
 # ---------------------------------------------------------
 
-def build_alert_summary(df: pd.DataFrame):
+# Independent per-series detectors; each takes a frame from prepare_alert_frame
+ALERT_DETECTORS = {
+    "spikes_usage": lambda frame: detect_spikes(frame, metric="usage", presorted=True),
+    "spikes_cost": lambda frame: detect_spikes(frame, metric="cost", presorted=True),
+    "seasonal_anomalies": lambda frame: detect_seasonal_anomalies(frame, metric="usage", presorted=True),
+    "missing_bills": detect_missing_bills,
+    "irregular_billing": detect_irregular_billing_periods,
+    "bad_readings": detect_bad_readings,
+    "meter_anomalies": detect_meter_anomalies,
+    "occupancy_anomalies": lambda frame: detect_occupancy_anomalies(frame, presorted=True),
+    "duplicate_bills": find_duplicate_bills,
+    "billing_period_issues": find_period_issues,
+    "reading_reconciliation": reconcile_readings,
+}
+
+DEFAULT_SUMMARY_DETECTORS = [
+    "spikes_usage", "spikes_cost", "seasonal_anomalies", "missing_bills",
+    "irregular_billing", "bad_readings", "meter_anomalies", "occupancy_anomalies",
+]
+
+
+def iter_alert_summary(df: pd.DataFrame, detectors=None, max_workers=4):
+    """
+    Sort and prepare the frame once, then run the detectors concurrently in
+    a thread pool (sorting, groupby and NumPy kernels release the GIL).
+    Yields (name, result) as each detector finishes. Detectors only read
+    the shared frame.
+    """
+    names = list(detectors or DEFAULT_SUMMARY_DETECTORS)
+
+    if df.empty or "date" not in df.columns:
+        for name in names:
+            yield name, pd.DataFrame()
+        return
+
+    frame, _ = prepare_alert_frame(df)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alerts") as executor:
+        futures = {executor.submit(ALERT_DETECTORS[name], frame): name for name in names}
+
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def build_alert_summary(df: pd.DataFrame, detectors=None):
     """
     Returns a dictionary of all alerts for a property + utility.
     """
-    return {
-        "spikes_usage": detect_spikes(df, metric="usage"),
-        "spikes_cost": detect_spikes(df, metric="cost"),
-        "missing_bills": detect_missing_bills(df),
-        "irregular_billing": detect_irregular_billing_periods(df),
-        "bad_readings": detect_bad_readings(df),
-        "meter_anomalies": detect_meter_anomalies(df),
-        "occupancy_anomalies": detect_occupancy_anomalies(df),
-    }
+    results = dict(iter_alert_summary(df, detectors))
+    return {name: results[name] for name in (detectors or DEFAULT_SUMMARY_DETECTORS)}
+
+
+# ---------------------------------------------------------
+# PORTFOLIO ALERT ENGINE (every series in one pass)
+# ---------------------------------------------------------
+
+ALERT_KEYS = ["property", "utility", "meter_number"]
+
+ALERT_COLUMNS = ALERT_KEYS + [
+    "date", "alert_type", "metric", "value", "reference", "score",
+]
+
+# Seasonal baseline: same month in up to SEASONAL_YEARS prior years; the
+# scale is a median over the SEASONAL_WINDOW residuals before that
+SEASONAL_YEARS = 3
+SEASONAL_WINDOW = 12
+
+# Alerts about a meter's whole history rather than one bill: scored on all
+# bills, identified without their date (which moves with each new bill)
+METER_LEVEL_ALERTS = ["meter_anomaly"]
+
+# How far back (in months) each rule needs to look to evaluate a new bill
+ALERT_RULE_LOOKBACK_MONTHS = {
+    "spike_usage": 2,
+    "spike_cost": 2,
+    "occupancy_change": 2,
+    "irregular_billing": 0,
+    "bad_reading": 0,
+    "missing_bill": 12,
+    "meter_anomaly": 0,
+    "seasonal_usage": SEASONAL_YEARS * 12 + SEASONAL_WINDOW,
+    "seasonal_cost": SEASONAL_YEARS * 12 + SEASONAL_WINDOW,
+    "duplicate_bill": 2,
+    "billing_overlap": 2,
+    "billing_gap": 2,
+    "reading_mismatch": 2,
+    "reading_continuity": 2,
+}
+
+
+def prepare_alert_frame(df: pd.DataFrame, keys=None):
+    """
+    Sort once by series keys + date and add month_start, so every rule can
+    use groupby-shift without re-sorting. Returns (frame, keys used).
+    """
+    keys = [k for k in (keys or ALERT_KEYS) if k in df.columns]
+
+    frame = df.sort_values(keys + ["date"], kind="mergesort").reset_index(drop=True)
+    frame["month_start"] = frame["date"].dt.to_period("M").dt.to_timestamp()
+
+    return frame, keys
+
+
+def _tidy_alerts(frame, mask, keys, alert_type, metric, value, reference, score):
+    """
+    Build rows of the standard alert table from a boolean mask.
+    """
+    out = frame.loc[mask, keys + ["date"]].copy()
+    for key in ALERT_KEYS:
+        if key not in out.columns:
+            out[key] = None
+
+    out["alert_type"] = alert_type
+    out["metric"] = metric
+    out["value"] = np.asarray(value)[mask.to_numpy()]
+    out["reference"] = np.asarray(reference)[mask.to_numpy()]
+    out["score"] = np.asarray(score)[mask.to_numpy()]
+
+    return out[ALERT_COLUMNS]
+
+
+def _change_alerts(frame, keys, metric, alert_type, threshold_pct, absolute=False):
+    prev = _previous(frame, metric, keys)
+    pct = np.where(prev > 0, (frame[metric] - prev) / prev * 100, np.nan)
+    changed = np.abs(pct) if absolute else pct
+    mask = pd.Series(changed >= threshold_pct, index=frame.index)
+    return _tidy_alerts(frame, mask, keys, alert_type, metric, frame[metric], prev, pct)
+
+
+def _missing_month_alerts(frame, keys):
+    """
+    Months without any bill between a series' first and last bill.
+    """
+    months = frame[keys + ["month_start"]].drop_duplicates().reset_index(drop=True)
+    idx = months["month_start"].dt.year * 12 + months["month_start"].dt.month - 1
+    prev_idx = _previous(months.assign(_m=idx), "_m", keys)
+
+    gap = (idx - prev_idx - 1).fillna(0).astype(int).clip(lower=0).to_numpy()
+    if gap.sum() == 0:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    # One row per missing month: repeat each gap's row, then count forward
+    rows = months.loc[months.index.repeat(gap)].reset_index(drop=True)
+    offsets = np.arange(gap.sum()) - np.repeat(np.cumsum(gap) - gap, gap)
+    missing_idx = np.repeat(prev_idx.to_numpy(), gap).astype(int) + 1 + offsets
+
+    rows["date"] = pd.to_datetime(pd.DataFrame({
+        "year": missing_idx // 12, "month": missing_idx % 12 + 1, "day": 1,
+    }))
+    rows = rows.drop(columns="month_start")
+
+    for key in ALERT_KEYS:
+        if key not in rows.columns:
+            rows[key] = None
+
+    rows["alert_type"] = "missing_bill"
+    rows["metric"] = "bill"
+    rows["value"] = np.nan
+    rows["reference"] = np.nan
+    rows["score"] = np.nan
+
+    return rows[ALERT_COLUMNS]
+
+
+def _meter_zscore_alerts(frame, keys, z_threshold):
+    """
+    Meter totals compared with the other meters of the same property + utility.
+    """
+    if "meter_number" not in keys:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    group_keys = [k for k in keys if k != "meter_number"]
+
+    totals = (
+        frame.groupby(keys, dropna=False)
+        .agg(usage=("usage", "sum"), date=("date", "max"))
+        .reset_index()
+    )
+
+    grouped = totals.groupby(group_keys, dropna=False)["usage"] if group_keys else totals["usage"]
+    mean = grouped.transform("mean")
+    std = grouped.transform(lambda s: s.std(ddof=0))
+    z = (totals["usage"] - mean) / std.where(std > 0)
+
+    mask = z.abs() >= z_threshold
+    return _tidy_alerts(totals, mask, keys, "meter_anomaly", "usage", totals["usage"], mean, z)
+
+
+def meter_level_alerts(df: pd.DataFrame, keys=None, z_threshold=2.5):
+    """
+    Meter-level rules (METER_LEVEL_ALERTS) over every bill of each meter,
+    dated with the meter's latest bill.
+    """
+    if df.empty or "usage" not in df.columns:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    frame, keys = prepare_alert_frame(df, keys)
+    return _meter_zscore_alerts(frame, keys, z_threshold)
+
+
+def _trailing_median(values: pd.Series, groups, window, min_periods=1):
+    """
+    Median of the previous `window` values within each group (current row
+    excluded), for all groups at once. Rows must be in time order within
+    each group. Builds one (rows x window) lag matrix instead of looping.
+    """
+    codes = values.groupby(groups, sort=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+
+    v = values.to_numpy(dtype=float)[order]
+    c = codes[order]
+
+    lag_idx = np.arange(len(v))[:, None] - np.arange(1, window + 1)[None, :]
+    valid = lag_idx >= 0
+    lag_idx = np.clip(lag_idx, 0, None)
+    lagged = np.where(valid & (c[lag_idx] == c[:, None]), v[lag_idx], np.nan)
+
+    median = np.full(len(v), np.nan)
+    enough = (~np.isnan(lagged)).sum(axis=1) >= min_periods
+    if enough.any():
+        median[enough] = np.nanmedian(lagged[enough], axis=1)
+
+    out = np.empty(len(v))
+    out[order] = median
+    return pd.Series(out, index=values.index)
+
+
+def seasonal_robust_scores(frame, keys, metric="usage", years=SEASONAL_YEARS,
+                           window=SEASONAL_WINDOW, min_periods=6):
+    """
+    Monthly robust anomaly scores for every series at once.
+
+    - baseline: median of the same calendar month in up to `years` prior
+      years, falling back to the median of the previous `window` months
+    - scale:    median of the previous `window` absolute residuals
+    - score:    residual / (1.4826 * scale), a MAD-style robust z-score
+
+    `frame` must come from prepare_alert_frame. Returns keys + month_start +
+    value + baseline + score.
+    """
+    monthly = (
+        frame.groupby(keys + ["month_start"], dropna=False, sort=False)[metric]
+        .sum(min_count=1)
+        .rename("value")
+        .reset_index()
+    )
+
+    series_id = monthly.groupby(keys, dropna=False, sort=False).ngroup() if keys else pd.Series(0, index=monthly.index)
+    value = monthly["value"]
+
+    seasonal = _trailing_median(value, [series_id, monthly["month_start"].dt.month], years)
+    recent = _trailing_median(value, series_id, window, min_periods)
+
+    monthly["baseline"] = seasonal.fillna(recent)
+    residual = value - monthly["baseline"]
+
+    scale = _trailing_median(residual.abs(), series_id, window, min_periods)
+    monthly["score"] = residual / (1.4826 * scale.where(scale > 0))
+
+    return monthly
+
+
+def _seasonal_alerts(frame, keys, metric, z_threshold=3.5, min_change_pct=10, scores=None):
+    """
+    Months far from their seasonal baseline on a robust scale. The
+    minimum % change keeps very stable series from flagging tiny moves.
+    """
+    monthly = scores if scores is not None else seasonal_robust_scores(frame, keys, metric)
+
+    change_pct = (monthly["value"] - monthly["baseline"]) / monthly["baseline"].abs().where(lambda b: b > 0) * 100
+    mask = (monthly["score"].abs() >= z_threshold) & (change_pct.abs() >= min_change_pct)
+
+    monthly = monthly.rename(columns={"month_start": "date"})
+    return _tidy_alerts(
+        monthly, mask, keys, f"seasonal_{metric}", metric,
+        monthly["value"], monthly["baseline"], monthly["score"],
+    )
+
+
+def _explained_by_season(spikes, scores, keys, z_threshold):
+    """
+    Mask of spike alerts whose month sits within the series' normal
+    seasonal range (e.g. the first cold month on a gas meter).
+    """
+    month = spikes["date"].dt.to_period("M").dt.to_timestamp()
+    lookup = scores.set_index(keys + ["month_start"])["score"]
+    score = lookup.reindex(pd.MultiIndex.from_arrays(
+        [spikes[k] for k in keys] + [month], names=keys + ["month_start"]
+    )).to_numpy()
+
+    return pd.Series(np.abs(score) < z_threshold, index=spikes.index)
+
+
+def detect_seasonal_anomalies(df: pd.DataFrame, metric="usage", z_threshold=3.5,
+                              min_change_pct=10, presorted=False):
+    """
+    Robust seasonal anomalies (same month in prior years + rolling
+    median/MAD) for every series in the frame.
+    """
+    if df.empty or metric not in df.columns or "date" not in df.columns:
+        return pd.DataFrame()
+
+    if presorted and "month_start" in df.columns:
+        frame, keys = df, [k for k in ALERT_KEYS if k in df.columns]
+    else:
+        frame, keys = prepare_alert_frame(df)
+    alerts = _seasonal_alerts(frame, keys, metric, z_threshold, min_change_pct)
+
+    return alerts.rename(columns={"reference": "baseline", "score": "robust_z"}).drop(
+        columns=["alert_type", "metric"]
+    ).reset_index(drop=True)
+
+
+def _integrity_alerts(frame, keys, max_gap_days=1):
+    """
+    Duplicate bills (one alert per duplicate group) and overlapping or
+    gapped billing periods per meter.
+    """
+    parts = []
+
+    duplicates = find_duplicate_bills(frame, keys)
+    if not duplicates.empty:
+        first = duplicates.drop_duplicates("dup_group").reset_index(drop=True)
+        mask = pd.Series(True, index=first.index)
+        parts.append(_tidy_alerts(
+            first, mask, keys, "duplicate_bill", "cost",
+            first["cost"], first["copies"], first["copies"],
+        ))
+
+    periods = find_period_issues(frame, keys, max_gap_days=max_gap_days)
+    for issue, days_col, bound in [("overlap", "overlap_days", 0), ("gap", "gap_days", max_gap_days)]:
+        rows = periods[periods["issue"] == issue].reset_index(drop=True)
+        if rows.empty:
+            continue
+        mask = pd.Series(True, index=rows.index)
+        parts.append(_tidy_alerts(
+            rows, mask, keys, f"billing_{issue}", "days", rows[days_col],
+            np.full(len(rows), bound), rows[days_col],
+        ))
+
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=ALERT_COLUMNS)
+
+
+def _reading_alerts(frame, keys):
+    """
+    Reading deltas that don't match billed usage, and bills whose
+    previous_reading doesn't continue the last bill. Score is $ impact.
+    """
+    findings = reconcile_readings(frame, keys=keys)
+    if findings.empty:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    mismatch = findings["issue"].str.contains("usage_mismatch")
+    broken = findings["issue"].str.contains("continuity_break")
+
+    return pd.concat([
+        _tidy_alerts(
+            findings, mismatch, keys, "reading_mismatch", "usage",
+            findings["usage_diff"], findings["expected_usage"], findings["dollar_impact"],
+        ),
+        _tidy_alerts(
+            findings, broken, keys, "reading_continuity", "previous_reading",
+            findings["previous_reading"], findings["last_current_reading"], findings["dollar_impact"],
+        ),
+    ], ignore_index=True)
+
+
+def build_portfolio_alerts(df: pd.DataFrame, keys=None, spike_threshold_pct=40,
+                           occupancy_threshold_pct=20, min_days=25, max_days=35,
+                           z_threshold=2.5, seasonal_z_threshold=3.5,
+                           seasonal_min_change_pct=10):
+    """
+    Evaluate every alert rule for every (property, utility, meter) series
+    after a single sort. Returns one tidy table:
+    property, utility, meter_number, date, alert_type, metric, value,
+    reference (previous value / bound / peer mean / seasonal baseline) and score.
+
+    Month-over-month spikes that the seasonal baseline explains are dropped;
+    pass seasonal_z_threshold=None to keep every spike and skip seasonal rules.
+    """
+    if df.empty or "date" not in df.columns:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    frame, keys = prepare_alert_frame(df, keys)
+    parts = []
+
+    for metric in ["usage", "cost"]:
+        if metric not in frame.columns:
+            continue
+
+        spikes = _change_alerts(frame, keys, metric, f"spike_{metric}", spike_threshold_pct)
+
+        if seasonal_z_threshold is not None:
+            scores = seasonal_robust_scores(frame, keys, metric)
+            spikes = spikes[~_explained_by_season(spikes, scores, keys, seasonal_z_threshold)]
+            parts.append(_seasonal_alerts(
+                frame, keys, metric, seasonal_z_threshold,
+                seasonal_min_change_pct, scores=scores,
+            ))
+
+        parts.append(spikes)
+
+    if "occupancy" in frame.columns:
+        parts.append(_change_alerts(
+            frame, keys, "occupancy", "occupancy_change",
+            occupancy_threshold_pct, absolute=True,
+        ))
+
+    if "days_billed" in frame.columns:
+        days = frame["days_billed"]
+        mask = (days < min_days) | (days > max_days)
+        bound = np.where(days < min_days, min_days, max_days)
+        parts.append(_tidy_alerts(
+            frame, mask, keys, "irregular_billing", "days_billed", days, bound, days - bound
+        ))
+
+    reading_cols = {"current_reading", "previous_reading", "reading_delta"}
+    if reading_cols.issubset(frame.columns):
+        mask = (
+            (frame["current_reading"] <= 0)
+            | (frame["previous_reading"] < 0)
+            | (frame["reading_delta"] < 0)
+        )
+        parts.append(_tidy_alerts(
+            frame, mask, keys, "bad_reading", "reading_delta",
+            frame["reading_delta"], frame["previous_reading"], frame["current_reading"],
+        ))
+
+    parts.append(_missing_month_alerts(frame, keys))
+
+    if {"start_date", "end_date", "cost"}.issubset(frame.columns) and frame["start_date"].notna().any():
+        parts.append(_integrity_alerts(frame, keys))
+
+    if reading_cols.issubset(frame.columns):
+        parts.append(_reading_alerts(frame, keys))
+
+    if "usage" in frame.columns:
+        parts.append(_meter_zscore_alerts(frame, keys, z_threshold))
+
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    return (
+        pd.concat(parts, ignore_index=True)
+        .sort_values(["property", "utility", "meter_number", "date", "alert_type"])
+        .reset_index(drop=True)
+    )
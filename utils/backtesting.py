@@ -0,0 +1,226 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from .forecasting import (
+    SERIES_KEYS,
+    FORECAST_ENGINES,
+    prepare_monthly_forecast_batch,
+    iter_series,
+)
+
+
+BACKTEST_RESULTS_PATH = "backtest_results.csv"
+
+
+# ---------------------------------------------------------
+# ROLLING-ORIGIN FOLDS
+# ---------------------------------------------------------
+
+def rolling_origin_folds(n_obs: int, initial=12, horizon=3, step=1):
+    """
+    Return (train_end, test_end) positions for rolling-origin evaluation.
+    Each fold trains on rows [0, train_end) and tests on [train_end, test_end).
+    """
+    folds = []
+    train_end = initial
+
+    while train_end + horizon <= n_obs:
+        folds.append((train_end, train_end + horizon))
+        train_end += step
+
+    return folds
+
+
+# ---------------------------------------------------------
+# ACCURACY METRICS
+# ---------------------------------------------------------
+
+def forecast_metrics(actual, yhat, lower, upper, train_y, season=12):
+    """
+    MAPE (%), MASE and interval coverage (%) for one forecast window.
+    MASE is scaled by the in-sample seasonal naive error (lag 1 when the
+    training window is shorter than a season).
+    """
+    actual = np.asarray(actual, dtype=float)
+    yhat = np.asarray(yhat, dtype=float)
+    train_y = np.asarray(train_y, dtype=float)
+
+    errors = np.abs(actual - yhat)
+
+    nonzero = actual != 0
+    mape = np.mean(errors[nonzero] / np.abs(actual[nonzero])) * 100 if nonzero.any() else np.nan
+
+    lag = season if len(train_y) > season else 1
+    scale = np.mean(np.abs(train_y[lag:] - train_y[:-lag])) if len(train_y) > lag else np.nan
+    mase = np.mean(errors) / scale if scale and scale > 0 else np.nan
+
+    inside = (actual >= np.asarray(lower)) & (actual <= np.asarray(upper))
+    coverage = inside.mean() * 100
+
+    return {"mape": mape, "mase": mase, "coverage": coverage}
+
+
+# ---------------------------------------------------------
+# SINGLE FOLD (runs inside a worker)
+# ---------------------------------------------------------
+
+def _run_fold(task):
+    key, engine, monthly_df, train_end, test_end = task
+
+    train = monthly_df.iloc[:train_end]
+    test = monthly_df.iloc[train_end:test_end]
+
+    start = time.perf_counter()
+    forecast = FORECAST_ENGINES[engine](train, periods=test_end - train_end)
+    fit_seconds = time.perf_counter() - start
+
+    predicted = forecast.tail(len(test))
+
+    row = dict(zip(SERIES_KEYS, key))
+    row.update({
+        "engine": engine,
+        "cutoff": train["ds"].iloc[-1],
+        "horizon": len(test),
+        "fit_seconds": fit_seconds,
+    })
+    row.update(forecast_metrics(
+        test["y"], predicted["yhat"], predicted["yhat_lower"],
+        predicted["yhat_upper"], train["y"],
+    ))
+
+    return row
+
+
+# ---------------------------------------------------------
+# BACKTEST RUNNER (parallel across series, folds and engines)
+# ---------------------------------------------------------
+
+def run_backtest(df: pd.DataFrame, engines=None, initial=12, horizon=3, step=1,
+                 max_workers=None, use_processes=True):
+    """
+    Rolling-origin cross-validation for every property + utility series and
+    every forecasting engine. Folds are fanned out to a process pool since
+    model fits are CPU-bound. Returns one row per (series, engine, fold).
+    """
+    engines = list(engines or FORECAST_ENGINES)
+    unknown = set(engines) - set(FORECAST_ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown forecasting engine(s): {sorted(unknown)}")
+
+    monthly = prepare_monthly_forecast_batch(df)
+
+    tasks = [
+        (key, engine, series, train_end, test_end)
+        for key, series in iter_series(monthly)
+        for train_end, test_end in rolling_origin_folds(len(series), initial, horizon, step)
+        for engine in engines
+    ]
+
+    if not tasks:
+        return pd.DataFrame()
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (max_workers * 4))
+
+    with executor_cls(max_workers=max_workers) as executor:
+        rows = list(executor.map(_run_fold, tasks, chunksize=chunksize))
+
+    return pd.DataFrame(rows)
+
+
+# ---------------------------------------------------------
+# SUMMARY + ENGINE SELECTION
+# ---------------------------------------------------------
+
+def summarize_backtest(results: pd.DataFrame, by=("utility", "engine")):
+    """
+    Average accuracy and fit time per group (default: utility + engine).
+    """
+    if results.empty:
+        return pd.DataFrame()
+
+    return (
+        results.groupby(list(by))
+        .agg(
+            mape=("mape", "mean"),
+            mase=("mase", "mean"),
+            coverage=("coverage", "mean"),
+            fit_seconds=("fit_seconds", "mean"),
+            folds=("cutoff", "count"),
+        )
+        .reset_index()
+    )
+
+
+def select_engines(summary: pd.DataFrame, max_mape=15.0, max_mase=None):
+    """
+    Pick the fastest engine per utility whose accuracy meets the bar.
+    Utilities where no engine qualifies fall back to the most accurate one.
+    """
+    if summary.empty:
+        return pd.DataFrame()
+
+    passing = summary["mape"] <= max_mape
+    if max_mase is not None:
+        passing &= summary["mase"] <= max_mase
+
+    # Passing engines compete on speed, failing ones on accuracy
+    ranked = summary.assign(
+        meets_bar=passing,
+        _rank=np.where(passing, summary["fit_seconds"], summary["mape"]),
+    ).sort_values(["utility", "meets_bar", "_rank"], ascending=[True, False, True])
+
+    return ranked.groupby("utility").head(1).drop(columns="_rank").reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# STORAGE
+# ---------------------------------------------------------
+
+def save_backtest_results(results: pd.DataFrame, path=BACKTEST_RESULTS_PATH):
+    """
+    Append a backtest run to the results CSV, stamped with its run time.
+    """
+    if results.empty:
+        return
+
+    results = results.assign(run_at=pd.Timestamp.now().floor("s"))
+    results.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+
+def load_backtest_results(path=BACKTEST_RESULTS_PATH, latest_only=True):
+    """
+    Load stored backtest results (optionally only the most recent run).
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame()
+
+    results = pd.read_csv(path, parse_dates=["cutoff", "run_at"])
+
+    if latest_only and not results.empty:
+        results = results[results["run_at"] == results["run_at"].max()]
+
+    return results.reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# ENGINE SELECTION (feeds the portfolio forecast batch)
+# ---------------------------------------------------------
+
+def engine_selection(results=None, max_mape=15.0, path=BACKTEST_RESULTS_PATH):
+    """
+    utility -> engine chosen by select_engines from a backtest (default:
+    the latest stored run). Empty when no backtest has been run.
+    """
+    results = load_backtest_results(path) if results is None else results
+
+    selected = select_engines(summarize_backtest(results), max_mape=max_mape)
+    if selected.empty:
+        return {}
+
+    return dict(zip(selected["utility"], selected["engine"]))
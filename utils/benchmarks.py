@@ -1,9 +1,53 @@
+import os
+
 import pandas as pd
 import numpy as np
 
 
 # ---------------------------------------------------------
-# UTILITY BENCHMARKS (industry-style assumptions)
+# BENCHMARK FILES (versioned, with effective date ranges)
+# ---------------------------------------------------------
+
+# One row per (key, state, effective range). A blank state applies to all
+# states; a blank effective_to is open-ended. Add rows for rate changes.
+UTILITY_BENCHMARK_FILE = "data/utility_benchmarks.csv"
+PROVIDER_BENCHMARK_FILE = "data/provider_benchmarks.csv"
+
+# Monthly multipliers (mean 1 over the year) per utility + climate region
+BENCHMARK_PROFILE_FILE = "data/benchmark_profiles.csv"
+
+
+# ---------------------------------------------------------
+# CLIMATE REGIONS (Building America, dominant region per state)
+# ---------------------------------------------------------
+
+STATE_CLIMATE_REGIONS = {
+    "AL": "hot_humid", "FL": "hot_humid", "LA": "hot_humid", "MS": "hot_humid",
+    "TX": "hot_humid", "HI": "hot_humid",
+    "AZ": "hot_dry", "NV": "hot_dry",
+    "AR": "mixed_humid", "DC": "mixed_humid", "DE": "mixed_humid", "GA": "mixed_humid",
+    "KS": "mixed_humid", "KY": "mixed_humid", "MD": "mixed_humid", "MO": "mixed_humid",
+    "NC": "mixed_humid", "NJ": "mixed_humid", "OK": "mixed_humid", "SC": "mixed_humid",
+    "TN": "mixed_humid", "VA": "mixed_humid", "WV": "mixed_humid",
+    "NM": "mixed_dry",
+    "CO": "cold", "CT": "cold", "IA": "cold", "ID": "cold", "IL": "cold", "IN": "cold",
+    "MA": "cold", "MI": "cold", "NE": "cold", "NH": "cold", "NY": "cold", "OH": "cold",
+    "PA": "cold", "RI": "cold", "SD": "cold", "UT": "cold", "WI": "cold", "WY": "cold",
+    "AK": "very_cold", "ME": "very_cold", "MN": "very_cold", "MT": "very_cold",
+    "ND": "very_cold", "VT": "very_cold",
+    "CA": "marine", "OR": "marine", "WA": "marine",
+}
+
+
+def climate_region(states: pd.Series) -> pd.Series:
+    """
+    Climate region for each state code (NaN when unknown).
+    """
+    return states.astype(str).str.strip().str.upper().map(STATE_CLIMATE_REGIONS)
+
+
+# ---------------------------------------------------------
+# UTILITY BENCHMARKS (defaults when the file is missing)
 # ---------------------------------------------------------
 
 UTILITY_BENCHMARKS = {
@@ -23,7 +67,7 @@ UTILITY_BENCHMARKS = {
 
 
 # ---------------------------------------------------------
-# PROVIDER BENCHMARKS (example defaults)
+# PROVIDER BENCHMARKS (defaults when the file is missing)
 # ---------------------------------------------------------
 
 PROVIDER_BENCHMARKS = {
@@ -35,36 +79,269 @@ PROVIDER_BENCHMARKS = {
 }
 
 
+# ---------------------------------------------------------
+# TABLE LOADING
+# ---------------------------------------------------------
+
+_TABLE_CACHE = {}
+
+
+def _read_benchmark_file(path, defaults: pd.DataFrame):
+    """
+    Read a benchmark table (CSV or Parquet), reloading when the file
+    changes. Falls back to the built-in defaults if the file is missing.
+    """
+    if not os.path.exists(path):
+        return defaults
+
+    stamp = os.path.getmtime(path)
+    cached = _TABLE_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    table = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+    if "effective_from" in table.columns:
+        table["effective_from"] = pd.to_datetime(table["effective_from"])
+        table["effective_to"] = pd.to_datetime(table["effective_to"])
+        table["state"] = table["state"].replace("", np.nan)
+        table = table.sort_values("effective_from", kind="mergesort").reset_index(drop=True)
+
+    _TABLE_CACHE[path] = (stamp, table)
+    return table
+
+
+def _defaults_table(records):
+    table = pd.DataFrame(records)
+    table.insert(0, "version", "builtin")
+    table["state"] = np.nan
+    table["effective_from"] = pd.Timestamp("2000-01-01")
+    table["effective_to"] = pd.NaT
+    return table
+
+
+def load_utility_benchmarks(path=UTILITY_BENCHMARK_FILE):
+    defaults = _defaults_table(
+        [{"utility": u, **v} for u, v in UTILITY_BENCHMARKS.items()]
+    )
+    return _read_benchmark_file(path, defaults)
+
+
+def load_provider_benchmarks(path=PROVIDER_BENCHMARK_FILE):
+    defaults = _defaults_table(
+        [{"provider_code": p, "benchmark_rate": r} for p, r in PROVIDER_BENCHMARKS.items()]
+    )
+    return _read_benchmark_file(path, defaults)
+
+
+def seasonal_factors(df: pd.DataFrame, date_col="date") -> pd.Series:
+    """
+    Seasonal benchmark multiplier for each row (utility, climate region of
+    its state, calendar month) from one merge. 1.0 where no profile exists.
+    """
+    if df.empty:
+        return pd.Series(dtype=float, index=df.index)
+
+    keys = pd.DataFrame({
+        "utility": df["utility"].to_numpy() if "utility" in df.columns else np.nan,
+        "climate_region": climate_region(df["state"]).to_numpy() if "state" in df.columns else np.nan,
+        "month": pd.to_datetime(df[date_col]).dt.month.to_numpy(),
+    })
+
+    profiles = load_benchmark_profiles()
+    factors = keys.merge(profiles, on=["utility", "climate_region", "month"], how="left")["factor"]
+
+    return pd.Series(factors.fillna(1.0).to_numpy(), index=df.index)
+
+
+def monthly_benchmarks(df: pd.DataFrame, date_col="date"):
+    """
+    Month-varying benchmark usage and cost for each row:
+    units x per-unit benchmark valid on the date x seasonal factor.
+    Needs utility and units (state optional). NaN where no benchmark exists.
+    """
+    out = pd.DataFrame(np.nan, index=df.index, columns=["benchmark_usage", "benchmark_cost"])
+
+    if df.empty or "units" not in df.columns or "utility" not in df.columns:
+        return out
+
+    per_unit = point_in_time_lookup(
+        df, load_utility_benchmarks(), "utility",
+        ["usage_per_unit", "cost_per_unit"], date_col,
+    )
+    units = pd.to_numeric(df["units"], errors="coerce").where(lambda u: u > 0)
+    factor = seasonal_factors(df, date_col)
+
+    out["benchmark_usage"] = units * per_unit["usage_per_unit"] * factor
+    out["benchmark_cost"] = units * per_unit["cost_per_unit"] * factor
+
+    return out
+
+
+def seasonal_efficiency(df: pd.DataFrame, keys=("property", "utility")):
+    """
+    Actual vs seasonal benchmark for every series in one groupby. Only
+    bills that have a benchmark are counted on both sides, so months are
+    compared like with like.
+    """
+    keys = [k for k in keys if k in df.columns]
+    if df.empty or not keys:
+        return pd.DataFrame()
+
+    bench = monthly_benchmarks(df)
+    covered = bench["benchmark_usage"].notna()
+
+    bills = df[keys].assign(
+        actual_usage=df["usage"].where(covered),
+        benchmark_usage=bench["benchmark_usage"],
+        actual_cost=df["cost"].where(covered),
+        benchmark_cost=bench["benchmark_cost"],
+    )
+
+    out = bills.groupby(keys).sum(min_count=1).reset_index()
+    out["usage_deviation_pct"] = benchmark_deviations(out["actual_usage"], out["benchmark_usage"])
+    out["cost_deviation_pct"] = benchmark_deviations(out["actual_cost"], out["benchmark_cost"])
+    out["efficiency_score"] = efficiency_scores(out["actual_usage"], out["benchmark_usage"])
+
+    return out
+
+
+def _current_row(table, key_col, key, as_of=None):
+    """
+    All-state row for one key valid on as_of (scalar lookups).
+    """
+    as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now()
+    rows = table[
+        (table[key_col] == key)
+        & table["state"].isna()
+        & (table["effective_from"] <= as_of)
+        & (table["effective_to"].isna() | (table["effective_to"] >= as_of))
+    ]
+    return None if rows.empty else rows.iloc[-1]
+
+
+def load_benchmark_profiles(path=BENCHMARK_PROFILE_FILE):
+    """
+    Monthly benchmark profiles; flat (no rows, factor 1) if the file is missing.
+    """
+    return _read_benchmark_file(
+        path, pd.DataFrame(columns=["utility", "climate_region", "month", "factor"])
+    )
+
+
+# ---------------------------------------------------------
+# POINT-IN-TIME LOOKUP (every bill in one as-of merge)
+# ---------------------------------------------------------
+
+def _asof_merge(left, table, by, value_cols, date_col):
+    """
+    For each left row, take the latest table row with the same `by` keys
+    and effective_from <= date; drop matches past their effective_to.
+    """
+    right = table[by + ["effective_from", "effective_to"] + value_cols].copy()
+    for col in by:
+        right[col] = right[col].astype(str)
+
+    merged = pd.merge_asof(
+        left, right, left_on=date_col, right_on="effective_from",
+        by=by, direction="backward",
+    )
+
+    expired = merged["effective_to"].notna() & (merged[date_col] > merged["effective_to"])
+    merged.loc[expired, value_cols] = np.nan
+
+    return merged.set_index("_row")[value_cols]
+
+
+def point_in_time_lookup(df: pd.DataFrame, table: pd.DataFrame, key_col, value_cols,
+                         date_col="date"):
+    """
+    Benchmark values valid on each row's date, aligned to df's index.
+    key_col is one column or a list of columns that must all match.
+    State-specific rows win over all-state rows for the same key.
+    """
+    key_cols = [key_col] if isinstance(key_col, str) else list(key_col)
+    value_cols = list(value_cols)
+    out = pd.DataFrame(np.nan, index=df.index, columns=value_cols)
+
+    if df.empty or not set(key_cols).issubset(df.columns) or date_col not in df.columns:
+        return out
+
+    left = pd.DataFrame({
+        "_row": np.arange(len(df)),
+        date_col: pd.to_datetime(df[date_col]).to_numpy(),
+        **{k: df[k].astype(str).to_numpy() for k in key_cols},
+        "state": (df["state"] if "state" in df.columns else pd.Series(np.nan, index=df.index)).astype(str).to_numpy(),
+    }).dropna(subset=[date_col]).sort_values(date_col, kind="mergesort")
+
+    found = pd.DataFrame(np.nan, index=np.arange(len(df)), columns=value_cols)
+
+    by_state = table[table["state"].notna()]
+    if not by_state.empty:
+        found = found.combine_first(
+            _asof_merge(left, by_state, key_cols + ["state"], value_cols, date_col)
+        )
+
+    all_states = table[table["state"].isna()]
+    if not all_states.empty:
+        found = found.fillna(
+            _asof_merge(left.drop(columns="state"), all_states, key_cols, value_cols, date_col)
+        )
+
+    out[value_cols] = found.sort_index()[value_cols].to_numpy()
+    return out
+
+
+def bill_benchmarks(df: pd.DataFrame, date_col="date"):
+    """
+    Utility intensity and provider rate benchmarks valid on each bill's
+    date: usage_per_unit, cost_per_unit, benchmark_rate (NaN = no benchmark).
+    """
+    utility = point_in_time_lookup(
+        df, load_utility_benchmarks(), "utility",
+        ["usage_per_unit", "cost_per_unit"], date_col,
+    )
+    provider = point_in_time_lookup(
+        df, load_provider_benchmarks(), "provider_code", ["benchmark_rate"], date_col,
+    )
+    return pd.concat([utility, provider], axis=1)
+
+
 # ---------------------------------------------------------
 # UTILITY BENCHMARK LOOKUP
 # ---------------------------------------------------------
 
-def get_utility_benchmark(utility: str, units: float):
+def get_utility_benchmark(utility: str, units: float, as_of=None):
     """
-    Returns benchmark usage and cost for a given utility and unit count.
+    Returns benchmark usage and cost for a given utility and unit count
+    (all-state benchmark valid on `as_of`, default today).
     """
-    if utility not in UTILITY_BENCHMARKS or units is None or units <= 0:
+    if units is None or units <= 0:
         return None, None
 
-    usage_bench = units * UTILITY_BENCHMARKS[utility]["usage_per_unit"]
-    cost_bench = units * UTILITY_BENCHMARKS[utility]["cost_per_unit"]
+    row = _current_row(load_utility_benchmarks(), "utility", utility, as_of)
+    if row is None:
+        return None, None
 
-    return usage_bench, cost_bench
+    return units * row["usage_per_unit"], units * row["cost_per_unit"]
 
 
 # ---------------------------------------------------------
 # PROVIDER BENCHMARK LOOKUP
 # ---------------------------------------------------------
 
-def get_provider_benchmark(provider_code: str, usage: float):
+def get_provider_benchmark(provider_code: str, usage: float, as_of=None):
     """
     Returns benchmark cost based on provider rate * usage.
     """
-    if provider_code not in PROVIDER_BENCHMARKS or usage is None:
+    if usage is None:
         return None
 
-    rate = PROVIDER_BENCHMARKS[provider_code]
-    return usage * rate
+    row = _current_row(load_provider_benchmarks(), "provider_code", provider_code, as_of)
+    if row is None:
+        return None
+
+    return usage * row["benchmark_rate"]
 
 
 # ---------------------------------------------------------
@@ -106,19 +383,135 @@ def benchmark_deviation(actual: float, benchmark: float):
     return round((actual - benchmark) / benchmark * 100, 1)
 
 
+# ---------------------------------------------------------
+# ARRAY VERSIONS (whole Series at once)
+# ---------------------------------------------------------
+
+def efficiency_scores(actual: pd.Series, benchmark: pd.Series) -> pd.Series:
+    """
+    Vectorized efficiency_score: NaN where the benchmark is missing or <= 0.
+    """
+    benchmark = benchmark.where(benchmark > 0)
+    ratio = actual / benchmark
+    return (100 - (ratio - 1) * 100).clip(0, 100).round(1)
+
+
+def benchmark_deviations(actual: pd.Series, benchmark: pd.Series) -> pd.Series:
+    """
+    Vectorized benchmark_deviation (% above/below benchmark).
+    """
+    benchmark = benchmark.where(benchmark > 0)
+    return ((actual - benchmark) / benchmark * 100).round(1)
+
+
+def portfolio_provider_benchmarks(df: pd.DataFrame, by=("property", "utility", "provider_code")):
+    """
+    Provider benchmark table for every property / utility / provider
+    combination in the portfolio. Each bill is priced at the benchmark rate
+    valid on its date (one as-of merge), then everything is summed in one
+    groupby.
+    """
+    by = [c for c in by if c in df.columns]
+    if df.empty or "provider_code" not in by:
+        return pd.DataFrame()
+
+    rates = point_in_time_lookup(
+        df, load_provider_benchmarks(), "provider_code", ["benchmark_rate"]
+    )["benchmark_rate"]
+
+    bills = df[by].assign(
+        actual_usage=df["usage"],
+        actual_cost=df["cost"],
+        benchmark_cost=df["usage"] * rates,
+        _has_rate=rates.notna(),
+    )
+
+    out = (
+        bills.groupby(by)
+        .agg(
+            actual_usage=("actual_usage", "sum"),
+            actual_cost=("actual_cost", "sum"),
+            benchmark_cost=("benchmark_cost", "sum"),
+            _priced=("_has_rate", "any"),
+        )
+        .reset_index()
+    )
+    out["benchmark_cost"] = out["benchmark_cost"].where(out.pop("_priced"))
+    out["benchmark_rate"] = out["benchmark_cost"] / out["actual_usage"].where(out["actual_usage"] > 0)
+    out["cost_deviation_pct"] = benchmark_deviations(out["actual_cost"], out["benchmark_cost"])
+    out["efficiency_score"] = efficiency_scores(out["actual_cost"], out["benchmark_cost"])
+
+    return out
+
+
+BILL_BENCHMARK_KEYS = ["property", "utility", "provider_code", "meter_number"]
+
+
+def bill_benchmark_table(df: pd.DataFrame, date_col="date"):
+    """
+    Every bill next to the benchmarks valid on its own date: provider
+    benchmark rate and cost, and units x utility intensity (seasonally
+    weighted) for usage. NaN where a bill has no benchmark.
+    """
+    if df.empty or not {"usage", "cost"}.issubset(df.columns):
+        return pd.DataFrame()
+
+    keys = [k for k in BILL_BENCHMARK_KEYS if k in df.columns]
+    bench = bill_benchmarks(df, date_col)
+
+    units = pd.to_numeric(df["units"], errors="coerce").where(lambda u: u > 0) if "units" in df.columns else np.nan
+    factor = seasonal_factors(df, date_col)
+
+    out = df[keys + [date_col, "usage", "cost"]].rename(columns={"usage": "actual_usage", "cost": "actual_cost"})
+    out["benchmark_usage"] = (units * bench["usage_per_unit"] * factor).round(1)
+    out["usage_deviation_pct"] = benchmark_deviations(out["actual_usage"], out["benchmark_usage"])
+    out["actual_rate"] = (out["actual_cost"] / out["actual_usage"].where(out["actual_usage"] > 0)).round(4)
+    out["benchmark_rate"] = bench["benchmark_rate"]
+    out["benchmark_cost"] = (out["actual_usage"] * bench["benchmark_rate"]).round(2)
+    out["cost_deviation_pct"] = benchmark_deviations(out["actual_cost"], out["benchmark_cost"])
+
+    return out
+
+
+def bills_above_benchmark(df: pd.DataFrame, threshold_pct=25.0, date_col="date"):
+    """
+    Bills whose usage or cost exceeds its point-in-time benchmark by more
+    than threshold_pct, largest deviation first.
+    """
+    table = bill_benchmark_table(df, date_col)
+    if table.empty:
+        return table
+
+    worst = table[["usage_deviation_pct", "cost_deviation_pct"]].max(axis=1)
+    return (
+        table[worst > threshold_pct]
+        .assign(max_deviation_pct=worst)
+        .sort_values("max_deviation_pct", ascending=False)
+        .reset_index(drop=True)
+    )
+
+
 # ---------------------------------------------------------
 # BENCHMARK DATAFRAME FOR FORECAST OVERLAY
 # ---------------------------------------------------------
 
-def build_benchmark_df(forecast_df: pd.DataFrame, benchmark_value: float):
+def build_benchmark_df(forecast_df: pd.DataFrame, benchmark_value: float,
+                       utility=None, state=None):
     """
-    Build a dataframe with a constant benchmark line for forecast charts.
+    Build a dataframe with a benchmark line for forecast charts. With a
+    utility (and state), the line follows that climate region's monthly
+    profile around benchmark_value; otherwise it is constant.
     """
     if forecast_df.empty or benchmark_value is None:
         return None
 
     bench_df = forecast_df[["ds"]].copy()
     bench_df["benchmark"] = benchmark_value
+
+    if utility is not None:
+        profile_keys = bench_df.assign(utility=utility, state=state)
+        bench_df["benchmark"] = benchmark_value * seasonal_factors(profile_keys, date_col="ds")
+
     return bench_df
 
 
@@ -128,27 +521,16 @@ def build_benchmark_df(forecast_df: pd.DataFrame, benchmark_value: float):
 
 def property_benchmark_summary(df: pd.DataFrame):
     """
-    Returns a summary table comparing actual vs benchmark usage and cost.
+    Returns a summary table comparing actual vs benchmark usage and cost,
+    with the benchmark summed over the same (seasonally weighted) months.
     """
     if df.empty:
         return pd.DataFrame()
 
-    utility = df["utility"].iloc[0]
-    units = df["units"].iloc[0]
-
-    usage_bench, cost_bench = get_utility_benchmark(utility, units)
-
-    actual_usage = df["usage"].sum()
-    actual_cost = df["cost"].sum()
-
-    return pd.DataFrame([{
-        "utility": utility,
-        "units": units,
-        "actual_usage": actual_usage,
-        "benchmark_usage": usage_bench,
-        "usage_deviation_pct": benchmark_deviation(actual_usage, usage_bench),
-        "actual_cost": actual_cost,
-        "benchmark_cost": cost_bench,
-        "cost_deviation_pct": benchmark_deviation(actual_cost, cost_bench),
-        "efficiency_score": efficiency_score(actual_usage, usage_bench),
-    }])
+    summary = seasonal_efficiency(df, keys=("utility",)).head(1)
+    summary.insert(1, "units", df["units"].iloc[0])
+
+    return summary[[
+        "utility", "units", "actual_usage", "benchmark_usage", "usage_deviation_pct",
+        "actual_cost", "benchmark_cost", "cost_deviation_pct", "efficiency_score",
+    ]]
@@ -0,0 +1,97 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# ---------------------------------------------------------
+# DATASET VERSION
+# ---------------------------------------------------------
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """
+    Short content hash of a dataframe. Identical data gives the same
+    version, so results keyed by it are reused across reruns and pages.
+    """
+    if df is None or df.empty:
+        return "empty"
+
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+
+    return digest.hexdigest()[:16]
+
+
+# ---------------------------------------------------------
+# THREAD-SAFE LRU CACHE
+# ---------------------------------------------------------
+
+class VersionedCache:
+    """
+    Small thread-safe LRU cache shared by the Streamlit script thread and
+    background workers. Keys should include a dataset_version().
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Finished forecasts, handed from background jobs to the pages
+FORECAST_CACHE = VersionedCache(max_entries=64)
+
+
+# ---------------------------------------------------------
+# PER-VERSION MEMOIZATION
+# ---------------------------------------------------------
+
+def cached_per_version(max_entries=16):
+    """
+    Decorator for functions whose first argument is a dataframe: results
+    are reused while the data (dataset_version) and other arguments are
+    unchanged. Pass version= (e.g. st.session_state.df_version, computed
+    once at load) to skip hashing the frame on every call. Cached frames
+    are shared, so callers must not modify them.
+    """
+    def decorator(fn):
+        cache = VersionedCache(max_entries=max_entries)
+
+        @functools.wraps(fn)
+        def wrapper(df, *args, version=None, **kwargs):
+            key = (version or dataset_version(df), args, tuple(sorted(kwargs.items())))
+            result = cache.get(key)
+            if result is None:
+                result = fn(df, *args, **kwargs)
+                cache.set(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
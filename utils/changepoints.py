@@ -0,0 +1,201 @@
+import pandas as pd
+import numpy as np
+
+from .alerts import prepare_alert_frame
+
+
+CHANGE_POINT_COLUMNS = [
+    "metric", "date", "level_before", "level_after", "change_pct",
+    "months_before", "months_after",
+]
+
+
+# ---------------------------------------------------------
+# PELT ON ONE SERIES (mean shifts, cumulative-sum cost)
+# ---------------------------------------------------------
+
+def _segment_cost(csum, csum2, start, end):
+    """
+    Squared-error cost of segment(s) [start, end) from cumulative sums,
+    so every candidate segment costs O(1).
+    """
+    n = end - start
+    total = csum[end] - csum[start]
+    return (csum2[end] - csum2[start]) - total * total / n
+
+
+def pelt(y, penalty, min_size=3):
+    """
+    Optimal mean-shift segmentation with PELT pruning.
+    Returns the change-point positions (start index of each new segment).
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    if n < 2 * min_size:
+        return []
+
+    csum = np.concatenate([[0.0], np.cumsum(y)])
+    csum2 = np.concatenate([[0.0], np.cumsum(y * y)])
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+
+    for t in range(min_size, n + 1):
+        # A new split point becomes usable once its segment can reach min_size
+        new = t - min_size
+        if new >= min_size:
+            candidates = np.append(candidates, new)
+
+        costs = best[candidates] + _segment_cost(csum, csum2, candidates, t)
+        pick = np.argmin(costs)
+        best[t] = costs[pick] + penalty
+        last[t] = candidates[pick]
+
+        # Prune splits that can never be optimal again
+        candidates = candidates[costs <= best[t]]
+
+    change_points = []
+    t = n
+    while t > 0:
+        t = last[t]
+        if t > 0:
+            change_points.append(t)
+
+    return sorted(change_points)
+
+
+def _noise_sd(y):
+    """
+    Robust noise level from first differences (insensitive to level shifts).
+    """
+    diffs = np.diff(y)
+    mad = np.median(np.abs(diffs - np.median(diffs))) if len(diffs) else 0.0
+    return mad / (0.6745 * np.sqrt(2))
+
+
+# ---------------------------------------------------------
+# MONTHLY SERIES (usage and effective rate)
+# ---------------------------------------------------------
+
+def _monthly_series(df: pd.DataFrame):
+    """
+    Monthly usage, cost and effective rate per (property, utility, meter).
+    """
+    frame, keys = prepare_alert_frame(df)
+
+    monthly = (
+        frame.groupby(keys + ["month_start"], dropna=False, sort=False)
+        .agg(usage=("usage", "sum"), cost=("cost", "sum"))
+        .reset_index()
+    )
+    monthly["rate"] = monthly["cost"] / monthly["usage"].where(monthly["usage"] > 0)
+
+    return monthly, keys
+
+
+def _deseasonalize(values: np.ndarray, months: np.ndarray):
+    """
+    Divide out a multiplicative calendar-month profile so summer/winter
+    swings don't read as level shifts. Needs two full years.
+    """
+    if len(values) < 24:
+        return values
+
+    level = np.median(values)
+    if level <= 0:
+        return values
+
+    ratio = values / level
+    factors = np.ones(len(values))
+    for month in np.unique(months):
+        in_month = months == month
+        factors[in_month] = np.median(ratio[in_month])
+
+    return np.where(factors > 0, values / np.where(factors > 0, factors, 1), values)
+
+
+# ---------------------------------------------------------
+# BATCH CHANGE-POINT DETECTION
+# ---------------------------------------------------------
+
+def detect_change_points(df: pd.DataFrame, metrics=("usage", "rate"), penalty_scale=3.0,
+                         min_size=3, min_change_pct=10):
+    """
+    Permanent level shifts (retrofits, new tariffs, stuck meters) in every
+    series' monthly usage and effective rate.
+
+    Each series is segmented with PELT on a squared-error cost built from
+    cumulative sums; the penalty is penalty_scale * sigma^2 * log(n), with
+    sigma from first differences. Usage is deseasonalized first. Shifts
+    smaller than min_change_pct are dropped.
+
+    Returns one row per change point: keys + metric, date (first month of
+    the new level), level_before/after, change_pct and segment lengths.
+    """
+    if df.empty or "date" not in df.columns or "usage" not in df.columns:
+        return pd.DataFrame(columns=CHANGE_POINT_COLUMNS)
+
+    if "cost" not in df.columns:
+        metrics = [m for m in metrics if m != "rate"]
+
+    monthly, keys = _monthly_series(df)
+    rows = []
+
+    # Series are contiguous after the sort, so slice numpy arrays per series
+    codes = monthly.groupby(keys, dropna=False, sort=False).ngroup().to_numpy() if keys else np.zeros(len(monthly), dtype=int)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+
+    month_starts = monthly["month_start"].to_numpy()
+    calendar_months = monthly["month_start"].dt.month.to_numpy()
+    key_values = monthly[keys].to_numpy(dtype=object)
+
+    for metric in metrics:
+        values = monthly[metric].to_numpy(dtype=float)
+
+        for lo, hi in zip(starts, ends):
+            valid = lo + np.flatnonzero(~np.isnan(values[lo:hi]))
+            if len(valid) < 2 * min_size:
+                continue
+
+            y = values[valid]
+            adjusted = _deseasonalize(y, calendar_months[valid]) if metric == "usage" else y
+
+            sigma = _noise_sd(adjusted)
+            if sigma <= 0:
+                sigma = np.std(adjusted) or 1.0
+
+            penalty = penalty_scale * sigma ** 2 * np.log(len(y))
+            bounds = [0] + pelt(adjusted, penalty, min_size) + [len(y)]
+
+            for prev_start, start, end in zip(bounds[:-2], bounds[1:-1], bounds[2:]):
+                before = adjusted[prev_start:start].mean()
+                after = adjusted[start:end].mean()
+                change_pct = (after - before) / abs(before) * 100 if before else np.nan
+
+                if np.isnan(change_pct) or abs(change_pct) < min_change_pct:
+                    continue
+
+                row = dict(zip(keys, key_values[lo]))
+                row.update({
+                    "metric": metric,
+                    "date": month_starts[valid[start]],
+                    "level_before": before,
+                    "level_after": after,
+                    "change_pct": change_pct,
+                    "months_before": start - prev_start,
+                    "months_after": end - start,
+                })
+                rows.append(row)
+
+    if not rows:
+        return pd.DataFrame(columns=keys + CHANGE_POINT_COLUMNS)
+
+    return (
+        pd.DataFrame(rows, columns=keys + CHANGE_POINT_COLUMNS)
+        .sort_values("change_pct", key=np.abs, ascending=False)
+        .reset_index(drop=True)
+    )
@@ -70,29 +70,29 @@ def occupancy_trend(df_monthly: pd.DataFrame):
 
 
 # ---------------------------------------------------------
-# USAGE PER OCCUPIED UNIT TREND
+# USAGE PER OCCUPIED ROOM-NIGHT TREND
 # ---------------------------------------------------------
 
-def usage_per_occupied_unit_trend(df_monthly: pd.DataFrame):
+def usage_per_room_night_trend(df_monthly: pd.DataFrame):
     return line_chart(
         df_monthly,
         x="month_start",
-        y="usage_per_occupied_unit",
-        title="Usage per Occupied Unit",
+        y="usage_per_room_night",
+        title="Usage per Occupied Room-Night",
         color="#00897B",
     )
 
 
 # ---------------------------------------------------------
-# COST PER OCCUPIED UNIT TREND
+# COST PER OCCUPIED ROOM-NIGHT TREND
 # ---------------------------------------------------------
 
-def cost_per_occupied_unit_trend(df_monthly: pd.DataFrame):
+def cost_per_room_night_trend(df_monthly: pd.DataFrame):
     return line_chart(
         df_monthly,
         x="month_start",
-        y="cost_per_occupied_unit",
-        title="Cost per Occupied Unit",
+        y="cost_per_room_night",
+        title="Cost per Occupied Room-Night",
         color="#C62828",
     )
 
@@ -145,24 +145,56 @@ def provider_comparison(df_provider: pd.DataFrame):
     )
 
 
+# ---------------------------------------------------------
+# EFFECTIVE RATE HISTORY
+# ---------------------------------------------------------
+
+def rate_history_chart(df_rates: pd.DataFrame):
+    """
+    Monthly effective rate per provider, with detected rate events marked.
+    """
+    if df_rates.empty:
+        return alt.Chart(pd.DataFrame({"month_start": [], "rate": []})).mark_line()
+
+    base = alt.Chart(df_rates).encode(
+        x=alt.X("month_start:T", title=""),
+        y=alt.Y("rate:Q", title="Cost per Unit"),
+    )
+
+    lines = base.mark_line(point=True).encode(
+        color=alt.Color("provider_code:N", title="Provider"),
+        tooltip=["provider_code:N", "month_start:T", alt.Tooltip("rate:Q", format=",.4f")],
+    )
+
+    events = base.transform_filter("datum.event != null").mark_point(
+        size=120, filled=True, color=GRIDFORGE_COLORS["accent"]
+    ).encode(
+        shape=alt.Shape("event:N", title="Event"),
+        tooltip=["provider_code:N", "month_start:T", "event:N", "change_pct:Q"],
+    )
+
+    return (lines + events).properties(title="Effective Rate History")
+
+
 # ---------------------------------------------------------
 # UTILITY MIX PIE CHART
 # ---------------------------------------------------------
 
-def utility_mix(df_util: pd.DataFrame):
+def utility_mix(df_util: pd.DataFrame, metric="total_mmbtu"):
     """
-    Pie chart showing usage share by utility type.
+    Pie chart showing each utility's share of energy (MMBtu), emissions
+    (total_kg_co2e) or cost. Raw usage is not comparable across utilities.
     """
-    if df_util.empty:
-        return alt.Chart(pd.DataFrame({"utility": [], "total_usage": []})).mark_arc()
+    if df_util.empty or metric not in df_util.columns:
+        return alt.Chart(pd.DataFrame({"utility": [], metric: []})).mark_arc()
 
     return (
         alt.Chart(df_util)
         .mark_arc()
         .encode(
-            theta="total_usage:Q",
+            theta=f"{metric}:Q",
             color="utility:N",
-            tooltip=["utility:N", "total_usage:Q"],
+            tooltip=["utility:N", alt.Tooltip(f"{metric}:Q", format=",.0f")],
         )
         .properties(title="Utility Mix")
     )
@@ -220,7 +252,7 @@ def yoy_cost_chart(df_yoy: pd.DataFrame):
 # FORECAST CHART (Actual + Forecast + Confidence Band)
 # ---------------------------------------------------------
 
-def forecast_chart(actual_df, forecast_df, benchmark_df=None):
+def forecast_chart(actual_df, forecast_df, benchmark_df=None, title="Forecasted Usage"):
     """
     Build a combined forecast chart:
     - Actual usage
@@ -271,4 +303,4 @@ def forecast_chart(actual_df, forecast_df, benchmark_df=None):
         )
         chart = chart + benchmark_line
 
-    return chart.properties(title="Forecasted Usage")
+    return chart.properties(title=title)
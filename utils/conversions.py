@@ -0,0 +1,108 @@
+import pandas as pd
+import numpy as np
+
+from .benchmarks import _read_benchmark_file
+
+
+# ---------------------------------------------------------
+# CONVERSION FACTOR TABLE
+# ---------------------------------------------------------
+
+# One row per (utility, grid region, year): site MMBtu and kg CO2e per
+# billed unit (kWh, therm, gallon). A blank grid_region applies to every
+# region. Bill years outside the table use its nearest year.
+CONVERSION_FACTOR_FILE = "data/conversion_factors.csv"
+
+FACTOR_COLUMNS = ["mmbtu_per_unit", "kg_co2e_per_unit"]
+
+# Dominant eGRID subregion per state (electricity emission factors)
+STATE_GRID_REGIONS = {
+    "AK": "AKGD", "AL": "SRSO", "AR": "SRMV", "AZ": "AZNM", "CA": "CAMX",
+    "CO": "RMPA", "CT": "NEWE", "DC": "RFCE", "DE": "RFCE", "FL": "FRCC",
+    "GA": "SRSO", "HI": "HIOA", "IA": "MROW", "ID": "NWPP", "IL": "SRMW",
+    "IN": "RFCW", "KS": "SPNO", "KY": "SRTV", "LA": "SRMV", "MA": "NEWE",
+    "MD": "RFCE", "ME": "NEWE", "MI": "RFCM", "MN": "MROW", "MO": "SRMW",
+    "MS": "SRMV", "MT": "NWPP", "NC": "SRVC", "ND": "MROW", "NE": "MROW",
+    "NH": "NEWE", "NJ": "RFCE", "NM": "AZNM", "NV": "NWPP", "NY": "NYUP",
+    "OH": "RFCW", "OK": "SPSO", "OR": "NWPP", "PA": "RFCE", "RI": "NEWE",
+    "SC": "SRVC", "SD": "MROW", "TN": "SRTV", "TX": "ERCT", "UT": "NWPP",
+    "VA": "SRVC", "VT": "NEWE", "WA": "NWPP", "WI": "MROE", "WV": "RFCW",
+    "WY": "RMPA",
+}
+
+
+def load_conversion_factors(path=CONVERSION_FACTOR_FILE):
+    """
+    Conversion factors (empty table, so no conversions, if the file is missing).
+    """
+    table = _read_benchmark_file(path, pd.DataFrame(
+        columns=["utility", "grid_region", "year"] + FACTOR_COLUMNS
+    ))
+    return table.assign(grid_region=table["grid_region"].fillna(""))
+
+
+# ---------------------------------------------------------
+# VECTORIZED JOIN
+# ---------------------------------------------------------
+
+def conversion_factors(df: pd.DataFrame, date_col="date"):
+    """
+    MMBtu and kg CO2e per billed unit for every row, aligned to df's index.
+    Region-specific factors win over all-region ones; unknown utilities
+    get NaN.
+    """
+    out = pd.DataFrame(np.nan, index=df.index, columns=FACTOR_COLUMNS)
+    table = load_conversion_factors()
+
+    if df.empty or table.empty or "utility" not in df.columns:
+        return out
+
+    states = df["state"] if "state" in df.columns else pd.Series("", index=df.index)
+
+    keys = pd.DataFrame({
+        "utility": df["utility"].to_numpy(),
+        "grid_region": states.astype(str).str.strip().str.upper().map(STATE_GRID_REGIONS).fillna("").to_numpy(),
+        "year": pd.to_datetime(df[date_col]).dt.year.to_numpy(),
+    })
+
+    # Clamp each bill year into the table's year range for its utility
+    years = table.groupby("utility")["year"].agg(["min", "max"])
+    keys["year"] = keys["year"].clip(
+        keys["utility"].map(years["min"]), keys["utility"].map(years["max"])
+    )
+
+    table = table[["utility", "grid_region", "year"] + FACTOR_COLUMNS]
+
+    specific = keys.merge(table, on=["utility", "grid_region", "year"], how="left")
+    fallback = keys.drop(columns="grid_region").merge(
+        table[table["grid_region"] == ""].drop(columns="grid_region"),
+        on=["utility", "year"], how="left",
+    )
+
+    out[FACTOR_COLUMNS] = specific[FACTOR_COLUMNS].fillna(fallback[FACTOR_COLUMNS]).to_numpy()
+    return out
+
+
+def converted_usage(df: pd.DataFrame, date_col="date"):
+    """
+    Usage converted to site energy (mmbtu) and emissions (kg_co2e).
+    """
+    factors = conversion_factors(df, date_col)
+    usage = pd.to_numeric(df["usage"], errors="coerce")
+
+    return pd.DataFrame({
+        "mmbtu": usage * factors["mmbtu_per_unit"],
+        "kg_co2e": usage * factors["kg_co2e_per_unit"],
+    }, index=df.index)
+
+
+def add_conversions(df: pd.DataFrame, date_col="date") -> pd.DataFrame:
+    """
+    Add mmbtu and kg_co2e columns in place (one join for all bills).
+    """
+    converted = converted_usage(df, date_col)
+
+    df["mmbtu"] = converted["mmbtu"]
+    df["kg_co2e"] = converted["kg_co2e"]
+
+    return df
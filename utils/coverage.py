@@ -0,0 +1,174 @@
+import pandas as pd
+import numpy as np
+
+
+# Bills are tracked per meter; property/utility give the meter context
+COVERAGE_KEYS = ["property", "utility", "meter_number"]
+
+
+# ---------------------------------------------------------
+# PRESENCE BITMAP (meter x month)
+# ---------------------------------------------------------
+
+def _month_counter(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
+
+def presence_bitmap(df: pd.DataFrame, keys=None):
+    """
+    Boolean (meter x month) matrix of which months have a bill, built for
+    the whole portfolio in one scatter. Returns (meters, months, bitmap).
+    """
+    keys = [k for k in (keys or COVERAGE_KEYS) if k in df.columns]
+    bills = df.dropna(subset=["date"])
+
+    if bills.empty:
+        return pd.DataFrame(columns=keys), pd.DatetimeIndex([]), np.zeros((0, 0), dtype=bool)
+
+    month = _month_counter(bills["date"])
+    first = month.min()
+    months = pd.date_range(bills["date"].min().to_period("M").to_timestamp(),
+                           periods=month.max() - first + 1, freq="MS")
+
+    if keys:
+        codes = bills.groupby(keys, dropna=False, sort=True).ngroup().to_numpy()
+        meters = (
+            bills[keys].drop_duplicates()
+            .sort_values(keys, na_position="last")
+            .reset_index(drop=True)
+        )
+    else:
+        codes = np.zeros(len(bills), dtype=int)
+        meters = pd.DataFrame(index=[0])
+
+    bitmap = np.zeros((codes.max() + 1, len(months)), dtype=bool)
+    bitmap[codes, month - first] = True
+
+    return meters, months, bitmap
+
+
+# ---------------------------------------------------------
+# PER-METER COVERAGE
+# ---------------------------------------------------------
+
+def meter_coverage(df: pd.DataFrame, as_of=None, grace_months=1, keys=None):
+    """
+    Coverage per meter from its first bill to `as_of` (default: the
+    portfolio's latest bill month):
+
+    - billed / expected months and coverage %
+    - missing months inside the active span and the longest gap
+    - months since the last bill; `late` when that exceeds grace_months
+    """
+    if df.empty or "date" not in df.columns:
+        return pd.DataFrame()
+
+    meters, months, bitmap = presence_bitmap(df, keys)
+    if bitmap.size == 0:
+        return pd.DataFrame()
+
+    n_months = len(months)
+    end = n_months - 1
+    if as_of is not None:
+        end = min(end, max(months.searchsorted(pd.Timestamp(as_of).to_period("M").to_timestamp(), side="right") - 1, 0))
+        bitmap = bitmap[:, :end + 1]
+
+    cols = np.arange(bitmap.shape[1])
+    has_bill = bitmap.any(axis=1)
+    first = np.where(has_bill, bitmap.argmax(axis=1), 0)
+    last = np.where(has_bill, bitmap.shape[1] - 1 - bitmap[:, ::-1].argmax(axis=1), -1)
+
+    expected = np.where(has_bill, end - first + 1, 0)
+    billed = bitmap.sum(axis=1)
+
+    # Missing months between first and last bill (trailing silence is "late")
+    inside = (cols >= first[:, None]) & (cols <= last[:, None])
+    holes = inside & ~bitmap
+
+    # Longest run of consecutive holes per meter, from run boundaries
+    padded = np.pad(holes.astype(np.int8), ((0, 0), (1, 1)))
+    edges = np.diff(padded, axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+    longest = np.zeros(len(bitmap), dtype=int)
+    np.maximum.at(longest, run_rows, run_ends - run_starts)
+
+    coverage = meters.copy()
+
+    if "provider_code" in df.columns and len(meters.columns):
+        provider = df.groupby(list(meters.columns), dropna=False)["provider_code"].first()
+        coverage["provider_code"] = provider.reindex(
+            pd.MultiIndex.from_frame(meters) if len(meters.columns) > 1 else meters.iloc[:, 0]
+        ).to_numpy()
+
+    coverage["first_bill"] = months[first]
+    coverage["last_bill"] = months[np.clip(last, 0, None)]
+    coverage["expected_months"] = expected
+    coverage["billed_months"] = billed
+    coverage["missing_months"] = holes.sum(axis=1)
+    coverage["longest_gap"] = longest
+    coverage["months_since_last_bill"] = end - last
+    coverage["late"] = coverage["months_since_last_bill"] > grace_months
+    coverage["coverage_pct"] = np.where(expected > 0, billed / np.maximum(expected, 1) * 100, np.nan)
+
+    return coverage[has_bill].reset_index(drop=True)
+
+
+def missing_meter_months(df: pd.DataFrame, keys=None, include_late=True):
+    """
+    One row per meter and month without a bill: gaps between bills, plus
+    (optionally) the months after a meter's last bill up to the latest
+    portfolio month.
+    """
+    if df.empty or "date" not in df.columns:
+        return pd.DataFrame()
+
+    meters, months, bitmap = presence_bitmap(df, keys)
+    if bitmap.size == 0:
+        return pd.DataFrame()
+
+    cols = np.arange(bitmap.shape[1])
+    first = bitmap.argmax(axis=1)
+    last = bitmap.shape[1] - 1 - bitmap[:, ::-1].argmax(axis=1)
+    upper = np.full(len(bitmap), bitmap.shape[1] - 1) if include_late else last
+
+    missing = (cols >= first[:, None]) & (cols <= upper[:, None]) & ~bitmap
+    rows, month_idx = np.nonzero(missing)
+
+    out = meters.iloc[rows].reset_index(drop=True)
+    out["missing_month"] = months[month_idx]
+    out["status"] = np.where(month_idx > last[rows], "late", "gap")
+
+    return out
+
+
+# ---------------------------------------------------------
+# PROVIDER ROLL-UP
+# ---------------------------------------------------------
+
+def provider_coverage(coverage: pd.DataFrame, by="provider_code"):
+    """
+    Roll meter coverage up to providers (or any other column).
+    """
+    if coverage.empty:
+        return pd.DataFrame()
+
+    if by not in coverage.columns or coverage[by].isna().all():
+        by = "utility"
+
+    summary = (
+        coverage.groupby(by, dropna=False)
+        .agg(
+            meters=("billed_months", "size"),
+            late_meters=("late", "sum"),
+            billed_months=("billed_months", "sum"),
+            expected_months=("expected_months", "sum"),
+            missing_months=("missing_months", "sum"),
+        )
+        .reset_index()
+    )
+    summary["coverage_pct"] = summary["billed_months"] / summary["expected_months"].where(
+        summary["expected_months"] > 0
+    ) * 100
+
+    return summary.sort_values("coverage_pct").reset_index(drop=True)
@@ -1,16 +1,33 @@
 import pandas as pd
 import os
 
+from .preprocess import add_intensity_metrics
+from .conversions import add_conversions
 
-def load_data():
+
+# Workbook headers -> the column names used throughout the app
+COLUMN_ALIASES = {
+    "Prop Name": "property",
+    "State": "state",
+    "City": "city",
+    "# units": "units",
+    "Date": "date",
+    "Utility": "utility",
+    "Usage": "usage",
+    "$ Amt": "cost",
+}
+
+
+DATA_FILE = "Database with pivot tables.xlsx"
+
+
+def load_data(filename=DATA_FILE):
     """
     Loads the Excel file safely, without assuming any sheet name.
     Automatically loads the FIRST sheet in the workbook.
     Ensures required columns exist so the rest of the app never breaks.
     """
 
-    filename = "Database with pivot tables.xlsx"
-
     # If file missing, fail clearly
     if not os.path.exists(filename):
         raise FileNotFoundError(
@@ -23,6 +40,7 @@ def load_data():
 
     # Load the first sheet
     df = pd.read_excel(filename, sheet_name=first_sheet)
+    df = df.rename(columns=COLUMN_ALIASES)
 
     # Ensure required columns exist
     required_cols = [
@@ -44,9 +62,15 @@ def load_data():
     # Convert dates safely
     df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce")
     df["end_date"] = pd.to_datetime(df["end_date"], errors="coerce")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
 
     # Add year/month
     df["year"] = df["start_date"].dt.year
     df["month"] = df["start_date"].dt.month
 
+    # Occupied room-night intensities and MMBtu / CO2e, once per load
+    add_intensity_metrics(df)
+    add_conversions(df)
+
     return df
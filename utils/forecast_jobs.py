@@ -0,0 +1,363 @@
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .backtesting import run_backtest, save_backtest_results, summarize_backtest
+from .cache import FORECAST_CACHE, dataset_version
+from .forecasting import (
+    SERIES_KEYS,
+    prepare_monthly_forecast_df,
+    run_forecast,
+    run_cost_forecast,
+    run_portfolio_forecast,
+)
+from .regressors import (
+    build_regressor_matrix,
+    build_future_regressors,
+    REGRESSOR_COLUMNS,
+    run_regressor_forecast_batch,
+)
+
+
+# ---------------------------------------------------------
+# JOB RECORD
+# ---------------------------------------------------------
+
+@dataclass
+class ForecastJob:
+    key: str
+    status: str = "queued"          # queued | running | done | failed
+    progress: float = 0.0
+    message: str = "Queued"
+    error: str = None
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float = None
+
+    def update(self, progress: float, message: str):
+        self.progress = progress
+        self.message = message
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+
+# ---------------------------------------------------------
+# JOB MANAGER
+# ---------------------------------------------------------
+
+class ForecastJobManager:
+    """
+    Runs forecast fits in worker threads so the Streamlit script thread
+    never blocks. Prophet fits run inside the cmdstan subprocess, so
+    threads are enough to keep fits off the page.
+
+    Identical requests (same key) share one in-flight job. Results are
+    written to FORECAST_CACHE; pages read them from there. A failed job is
+    kept (so pages can show its error) until a caller retries it or it
+    is older than keep_failed_for seconds.
+    """
+
+    def __init__(self, max_workers=2, keep_failed_for=3600):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="forecast"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.keep_failed_for = keep_failed_for
+
+    def submit(self, key: str, fn, *args, retry=False, **kwargs) -> ForecastJob:
+        """
+        Queue fn(*args, progress=..., **kwargs) unless its result is already
+        cached or an identical job is in flight. A failed job is returned
+        as is unless retry=True.
+        """
+        with self._lock:
+            self._prune()
+
+            if key in FORECAST_CACHE:
+                return ForecastJob(key, status="done", progress=1.0, message="Cached")
+
+            job = self._jobs.get(key)
+            if job is not None and (job.active or (job.status == "failed" and not retry)):
+                return job
+
+            job = ForecastJob(key)
+            self._jobs[key] = job
+            self._executor.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def _prune(self):
+        """
+        Drop failed jobs older than keep_failed_for (call with the lock held).
+        """
+        cutoff = time.time() - self.keep_failed_for
+        for key, job in list(self._jobs.items()):
+            if not job.active and job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[key]
+
+    def status(self, key: str) -> ForecastJob:
+        """
+        Current job state for a key (None if it was never submitted).
+        """
+        if key in FORECAST_CACHE:
+            return ForecastJob(key, status="done", progress=1.0, message="Cached")
+
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _run(self, job: ForecastJob, fn, args, kwargs):
+        job.status = "running"
+        job.update(0.0, "Starting")
+
+        try:
+            result = fn(*args, progress=job.update, **kwargs)
+            FORECAST_CACHE.set(job.key, result)
+            job.status = "done"
+            job.update(1.0, "Done")
+        except Exception as exc:
+            # Error first: readers treat a non-active job as final
+            job.error = f"{exc}\n{traceback.format_exc()}"
+            job.message = f"Failed: {exc}"
+            job.finished_at = time.time()
+            job.status = "failed"
+        finally:
+            job.finished_at = job.finished_at or time.time()
+
+        # Finished results live in the cache; only failures stay listed
+        if job.status == "done":
+            with self._lock:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+
+
+# Module-level so jobs survive Streamlit reruns and page switches
+FORECAST_JOBS = ForecastJobManager()
+
+
+# ---------------------------------------------------------
+# FORECAST PIPELINE (what the Forecasting page needs)
+# ---------------------------------------------------------
+
+FORECAST_INPUT_COLUMNS = ["date", "usage", "cost", "occupancy"]
+
+
+def forecast_job_key(df: pd.DataFrame, **params) -> str:
+    """
+    Cache/dedup key: version of the columns the forecast reads plus
+    forecast parameters, so unrelated columns don't trigger a refit.
+    """
+    used = df[[c for c in FORECAST_INPUT_COLUMNS if c in df.columns]]
+    param_str = ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"forecast:{dataset_version(used)}:{param_str}"
+
+
+def forecast_pipeline(df: pd.DataFrame, periods=12, engine="prophet",
+                      use_regressors=False, occupancy_change_pct=0.0,
+                      progress=None):
+    """
+    Prepare, fit usage and cost forecasts for one filtered frame.
+    With use_regressors, the usage model also uses occupancy, with the
+    given scenario for the forecast months.
+    Returns a dict with monthly, forecast and cost_forecast frames
+    (None when there is not enough data).
+    """
+    progress = progress or (lambda *_: None)
+
+    progress(0.1, "Preparing monthly series")
+    monthly_df, _ = prepare_monthly_forecast_df(df, include_cost=True)
+
+    if monthly_df.empty:
+        return None
+
+    regressors, future_regressors = None, None
+
+    if use_regressors:
+        design = build_regressor_matrix(df)
+        future_regressors = build_future_regressors(
+            design, periods=periods,
+            occupancy_change_pct=occupancy_change_pct,
+        )
+        regressors = REGRESSOR_COLUMNS
+        monthly_df = monthly_df.merge(
+            design.groupby("ds")[regressors].mean().reset_index(),
+            on="ds", how="left",
+        )
+        future_regressors = future_regressors.groupby("ds")[regressors].mean().reset_index()
+
+    progress(0.3, "Fitting usage model")
+    forecast_df, _ = run_forecast(
+        monthly_df, periods=periods, engine=engine,
+        regressors=regressors, future_regressors=future_regressors,
+    )
+
+    if forecast_df is None:
+        return None
+
+    progress(0.7, "Fitting rate model for cost forecast")
+    cost_forecast_df = run_cost_forecast(
+        monthly_df, periods=periods, engine=engine, usage_forecast=forecast_df
+    )
+
+    return {
+        "monthly": monthly_df,
+        "forecast": forecast_df,
+        "cost_forecast": cost_forecast_df,
+    }
+
+
+def submit_forecast_job(df: pd.DataFrame, periods=12, engine="prophet", retry=False,
+                        **scenario):
+    """
+    Queue (or reuse) a forecast for this frame. Returns (key, job).
+    `scenario` takes the regressor options of forecast_pipeline; retry
+    re-runs a failed job.
+    """
+    key = forecast_job_key(df, periods=periods, engine=engine, **scenario)
+    job = FORECAST_JOBS.submit(
+        key, forecast_pipeline, df, periods=periods, engine=engine, retry=retry, **scenario
+    )
+    return key, job
+
+
+# ---------------------------------------------------------
+# PORTFOLIO FORECASTS (every series, stored for reuse)
+# ---------------------------------------------------------
+
+PORTFOLIO_FORECAST_PATH = "portfolio_forecasts.csv"
+
+
+def portfolio_data_version(df: pd.DataFrame) -> str:
+    """
+    Version of the columns the portfolio forecast reads.
+    """
+    return dataset_version(df[[c for c in SERIES_KEYS + FORECAST_INPUT_COLUMNS if c in df.columns]])
+
+
+def portfolio_forecast_key(df: pd.DataFrame, engine_by_utility=None, **params) -> str:
+    if engine_by_utility:
+        params["engines"] = "|".join(f"{u}:{e}" for u, e in sorted(engine_by_utility.items()))
+    param_str = ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"portfolio_forecast:{portfolio_data_version(df)}:{param_str}"
+
+
+def portfolio_forecast_pipeline(df: pd.DataFrame, periods=12, engine="prophet",
+                                engine_by_utility=None, use_regressors=False,
+                                path=PORTFOLIO_FORECAST_PATH, progress=None):
+    """
+    Forecast every property + utility series in one batch and store the
+    long result on disk so alerts and later sessions can reuse it.
+    `engine_by_utility` (from a backtest) overrides `engine` per utility;
+    use_regressors adds occupancy as a driver.
+    """
+    progress = progress or (lambda *_: None)
+
+    progress(0.1, f"Fitting {engine} for every series" if not engine_by_utility
+             else "Fitting the backtest-selected engine for every series")
+
+    if use_regressors:
+        forecasts = run_regressor_forecast_batch(
+            df, periods=periods, engine=engine, use_processes=False,
+            engine_by_utility=engine_by_utility,
+        )
+    else:
+        forecasts = run_portfolio_forecast(
+            df, periods=periods, engine=engine, use_processes=False,
+            engine_by_utility=engine_by_utility,
+        )
+
+    progress(0.9, "Storing portfolio forecasts")
+    key = portfolio_forecast_key(
+        df, engine_by_utility=engine_by_utility, periods=periods, engine=engine,
+        use_regressors=use_regressors,
+    )
+    save_portfolio_forecasts(forecasts, path, forecast_key=key)
+
+    return forecasts
+
+
+def submit_portfolio_forecast_job(df: pd.DataFrame, periods=12, engine="prophet",
+                                  engine_by_utility=None, use_regressors=False,
+                                  retry=False):
+    """
+    Queue (or reuse) the portfolio-wide forecast. Returns (key, job).
+    """
+    key = portfolio_forecast_key(
+        df, engine_by_utility=engine_by_utility, periods=periods, engine=engine,
+        use_regressors=use_regressors,
+    )
+    job = FORECAST_JOBS.submit(
+        key, portfolio_forecast_pipeline, df, periods=periods, engine=engine,
+        engine_by_utility=engine_by_utility, use_regressors=use_regressors,
+        retry=retry,
+    )
+    return key, job
+
+
+def save_portfolio_forecasts(forecasts: pd.DataFrame, path=PORTFOLIO_FORECAST_PATH,
+                             forecast_key=None):
+    """
+    Write the long portfolio forecast table, stamped with its run time and
+    its portfolio_forecast_key (data version, engines, regressor settings).
+    """
+    if forecasts.empty:
+        return
+
+    forecasts.assign(
+        run_at=pd.Timestamp.now().floor("s"), forecast_key=forecast_key
+    ).to_csv(path, index=False)
+
+
+def load_portfolio_forecasts(path=PORTFOLIO_FORECAST_PATH) -> pd.DataFrame:
+    """
+    Load the most recently stored portfolio forecast table (empty if none).
+    Compare its forecast_key column with portfolio_forecast_key() before
+    using it for the current data and settings.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["ds", "run_at", "forecast_key"])
+
+    return pd.read_csv(path, parse_dates=["ds", "run_at"], dtype={"forecast_key": str})
+
+
+# ---------------------------------------------------------
+# ENGINE BACKTEST (rolling-origin, stored for engine selection)
+# ---------------------------------------------------------
+
+def backtest_pipeline(df: pd.DataFrame, engines=None, initial=12, horizon=3,
+                      progress=None):
+    """
+    Rolling-origin backtest of every series and engine; results are
+    appended to the backtest store, the per-utility summary is returned.
+    """
+    progress = progress or (lambda *_: None)
+
+    progress(0.1, "Backtesting engines on every series")
+    results = run_backtest(
+        df, engines=engines, initial=initial, horizon=horizon, use_processes=False
+    )
+
+    progress(0.9, "Storing backtest results")
+    save_backtest_results(results)
+
+    return summarize_backtest(results)
+
+
+def submit_backtest_job(df: pd.DataFrame, engines=None, initial=12, horizon=3, retry=False):
+    """
+    Queue (or reuse) a backtest for this frame and engine list. Returns (key, job).
+    """
+    used = df[[c for c in SERIES_KEYS + FORECAST_INPUT_COLUMNS if c in df.columns]]
+    engines = sorted(engines) if engines else None
+    key = f"backtest:{dataset_version(used)}:{engines}:{initial}:{horizon}"
+
+    job = FORECAST_JOBS.submit(
+        key, backtest_pipeline, df, engines=engines, initial=initial, horizon=horizon,
+        retry=retry,
+    )
+    return key, job
@@ -1,5 +1,8 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from statistics import NormalDist
 from prophet import Prophet
 from .benchmarks import (
     get_utility_benchmark,
@@ -11,10 +14,12 @@ from .benchmarks import (
 # MONTHLY AGGREGATION FOR FORECASTING
 # ---------------------------------------------------------
 
-def prepare_monthly_forecast_df(df: pd.DataFrame):
+def prepare_monthly_forecast_df(df: pd.DataFrame, include_cost=False):
     """
     Convert daily/billing-level data into a clean monthly time series
     suitable for Prophet forecasting.
+    With include_cost=True a monthly cost column is carried along so cost
+    forecasting can share this pass.
     """
     if df.empty:
         return pd.DataFrame(), None
@@ -22,8 +27,10 @@ def prepare_monthly_forecast_df(df: pd.DataFrame):
     df = df.copy()
     df["month_start"] = df["date"].dt.to_period("M").dt.to_timestamp()
 
+    value_cols = ["usage", "cost"] if include_cost else ["usage"]
+
     monthly = (
-        df.groupby("month_start")["usage"]
+        df.groupby("month_start")[value_cols]
         .sum()
         .reset_index()
         .rename(columns={"month_start": "ds", "usage": "y"})
@@ -47,13 +54,89 @@ def prepare_monthly_forecast_df(df: pd.DataFrame):
     return monthly, df
 
 
+# ---------------------------------------------------------
+# BATCH MONTHLY AGGREGATION (ALL SERIES AT ONCE)
+# ---------------------------------------------------------
+
+SERIES_KEYS = ["property", "utility"]
+
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+def _month_index(dates: pd.Series) -> pd.Series:
+    """
+    Convert month-start timestamps to an integer month counter.
+    """
+    return dates.dt.year * 12 + dates.dt.month - 1
+
+
+def _month_from_index(idx) -> pd.Series:
+    """
+    Convert an integer month counter back to month-start timestamps.
+    """
+    idx = np.asarray(idx)
+    return pd.to_datetime(
+        pd.DataFrame({"year": idx // 12, "month": idx % 12 + 1, "day": 1})
+    )
+
+
+def prepare_monthly_forecast_batch(df: pd.DataFrame, keys=None, value_col="usage"):
+    """
+    Build one long monthly frame (keys + ds + y) for every series at once.
+    Missing months inside each series' span are filled with 0, matching
+    prepare_monthly_forecast_df.
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    if df.empty or value_col not in df.columns:
+        return pd.DataFrame(columns=keys + ["ds", "y"])
+
+    work = df[keys + ["date", value_col]].copy()
+    work["ds"] = work["date"].dt.to_period("M").dt.to_timestamp()
+
+    monthly = (
+        work.groupby(keys + ["ds"], dropna=False)[value_col]
+        .sum()
+        .reset_index()
+        .rename(columns={value_col: "y"})
+    )
+
+    # Full month span per series, built with one repeat instead of a loop
+    monthly["_m"] = _month_index(monthly["ds"])
+    spans = monthly.groupby(keys, dropna=False)["_m"].agg(["min", "max"]).reset_index()
+    lengths = (spans["max"] - spans["min"] + 1).to_numpy()
+
+    full = spans.loc[spans.index.repeat(lengths), keys].reset_index(drop=True)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    full["_m"] = np.repeat(spans["min"].to_numpy(), lengths) + offsets
+
+    monthly = full.merge(monthly.drop(columns="ds"), on=keys + ["_m"], how="left")
+    monthly["ds"] = _month_from_index(monthly["_m"])
+    monthly["y"] = monthly["y"].fillna(0)
+
+    return monthly[keys + ["ds", "y"]]
+
+
+def iter_series(monthly_batch: pd.DataFrame, keys=None):
+    """
+    Yield (key_tuple, monthly_df) pairs from a batch frame, each monthly_df
+    shaped like the output of prepare_monthly_forecast_df.
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    for key, group in monthly_batch.groupby(keys, sort=True, dropna=False):
+        key = key if isinstance(key, tuple) else (key,)
+        yield key, group.drop(columns=keys).reset_index(drop=True)
+
+
 # ---------------------------------------------------------
 # BUILD PROPHET MODEL
 # ---------------------------------------------------------
 
-def build_prophet_model():
+def build_prophet_model(regressors=None):
     """
-    Create a Prophet model with GridForge-friendly defaults.
+    Create a Prophet model with GridForge-friendly defaults, optionally
+    with extra regressors (e.g. occupancy).
     """
     model = Prophet(
         yearly_seasonality=True,
@@ -61,6 +144,8 @@ def build_prophet_model():
         daily_seasonality=False,
         seasonality_mode="additive",
     )
+    for name in regressors or []:
+        model.add_regressor(name)
     return model
 
 
@@ -68,22 +153,338 @@ def build_prophet_model():
 # RUN FORECAST
 # ---------------------------------------------------------
 
-def run_forecast(monthly_df: pd.DataFrame, periods=12):
+def run_forecast(monthly_df: pd.DataFrame, periods=12, engine="prophet",
+                 regressors=None, future_regressors=None):
     """
-    Fit Prophet and generate a forecast N months ahead.
+    Fit a forecasting engine and generate a forecast N months ahead.
+    Prophet returns its fitted model; the lightweight engines return None.
+
+    `regressors` names extra columns of monthly_df to use as exogenous
+    inputs; `future_regressors` supplies their values (ds + columns) for
+    the forecast months.
     """
     if monthly_df.empty:
         return None, None
 
-    model = build_prophet_model()
-    model.fit(monthly_df)
+    if regressors and future_regressors is None:
+        raise ValueError(
+            "future_regressors is required with regressors; build it with "
+            "utils.regressors.build_future_regressors."
+        )
+
+    if engine != "prophet":
+        if engine not in FORECAST_ENGINES:
+            raise ValueError(f"Unknown forecasting engine '{engine}'.")
+        forecast = FORECAST_ENGINES[engine](
+            monthly_df, periods=periods,
+            regressors=regressors, future_regressors=future_regressors,
+        )
+        return forecast, None
+
+    # Constant regressors carry no information and break standardization
+    regressors = [r for r in regressors or [] if monthly_df[r].nunique() > 1]
+
+    model = build_prophet_model(regressors)
+    model.fit(monthly_df[["ds", "y"] + regressors])
 
     future = model.make_future_dataframe(periods=periods, freq="MS")
+    if regressors:
+        known = pd.concat(
+            [monthly_df[["ds"] + regressors], future_regressors[["ds"] + regressors]],
+            ignore_index=True,
+        ).drop_duplicates("ds", keep="first")
+        future = future.merge(known, on="ds", how="left")
+        future[regressors] = future[regressors].ffill()
+
     forecast = model.predict(future)
 
     return forecast, model
 
 
+# ---------------------------------------------------------
+# LIGHTWEIGHT ENGINES (cheap baselines for Prophet)
+# ---------------------------------------------------------
+
+def _interval_z(interval_width=0.8):
+    """
+    Normal quantile for a central interval (Prophet defaults to 80%).
+    """
+    return NormalDist().inv_cdf(0.5 + interval_width / 2)
+
+
+def _future_months(monthly_df: pd.DataFrame, periods: int) -> pd.Series:
+    """
+    History months followed by N future month starts.
+    """
+    future = pd.date_range(
+        start=monthly_df["ds"].max(), periods=periods + 1, freq="MS"
+    )[1:]
+    return pd.concat([monthly_df["ds"], pd.Series(future)], ignore_index=True)
+
+
+def seasonal_naive_forecast(monthly_df: pd.DataFrame, periods=12,
+                            interval_width=0.8, season=12,
+                            regressors=None, future_regressors=None):
+    """
+    Repeat the value from the same month last year (or the last value when
+    there is less than a year of history). Regressors are ignored.
+    """
+    y = monthly_df["y"].to_numpy(dtype=float)
+    n = len(y)
+    lag = season if n > season else 1
+
+    fitted = np.full(n, np.nan)
+    fitted[lag:] = y[:-lag]
+
+    resid = y[lag:] - fitted[lag:]
+    sigma = np.sqrt(np.mean(resid ** 2)) if len(resid) else 0.0
+
+    h = np.arange(1, periods + 1)
+    future = y[n - lag + (h - 1) % lag]
+    widen = np.sqrt((h - 1) // lag + 1)
+
+    yhat = np.concatenate([fitted, future])
+    width = _interval_z(interval_width) * sigma * np.concatenate([np.ones(n), widen])
+
+    return pd.DataFrame({
+        "ds": _future_months(monthly_df, periods),
+        "yhat": yhat,
+        "yhat_lower": yhat - width,
+        "yhat_upper": yhat + width,
+    })
+
+
+def trend_seasonal_forecast(monthly_df: pd.DataFrame, periods=12,
+                            interval_width=0.8, season=12,
+                            regressors=None, future_regressors=None):
+    """
+    Ordinary least squares on a linear trend plus month-of-year dummies,
+    plus any exogenous regressor columns.
+    Month dummies are only used once two full seasons are available.
+    """
+    y = monthly_df["y"].to_numpy(dtype=float)
+    n = len(y)
+    ds = _future_months(monthly_df, periods)
+
+    t = np.arange(n + periods, dtype=float)
+    columns = [np.ones_like(t), t]
+    if n >= 2 * season:
+        month = ds.dt.month.to_numpy()
+        columns += [(month == m).astype(float) for m in range(2, season + 1)]
+    X = np.column_stack(columns)
+
+    if regressors:
+        if future_regressors is None:
+            raise ValueError("future_regressors is required with regressors.")
+        exog = pd.concat(
+            [monthly_df[regressors], future_regressors[regressors].head(periods)],
+            ignore_index=True,
+        ).ffill().to_numpy(dtype=float)
+        X = np.column_stack([X, exog])
+
+    beta, *_ = np.linalg.lstsq(X[:n], y, rcond=None)
+    yhat = X @ beta
+
+    dof = max(n - X.shape[1], 1)
+    sigma = np.sqrt(np.sum((y - yhat[:n]) ** 2) / dof)
+    width = _interval_z(interval_width) * sigma
+
+    return pd.DataFrame({
+        "ds": ds,
+        "yhat": yhat,
+        "yhat_lower": yhat - width,
+        "yhat_upper": yhat + width,
+    })
+
+
+def _prophet_engine(monthly_df: pd.DataFrame, periods=12,
+                    regressors=None, future_regressors=None):
+    forecast, _ = run_forecast(
+        monthly_df, periods=periods,
+        regressors=regressors, future_regressors=future_regressors,
+    )
+    return forecast[FORECAST_COLUMNS]
+
+
+FORECAST_ENGINES = {
+    "prophet": _prophet_engine,
+    "seasonal_naive": seasonal_naive_forecast,
+    "trend_seasonal": trend_seasonal_forecast,
+}
+
+
+# ---------------------------------------------------------
+# BATCH FORECASTING (many series, one pool)
+# ---------------------------------------------------------
+
+def _run_engine_task(task):
+    key, engine, monthly_df, periods, regressors, future_regressors = task
+    forecast = FORECAST_ENGINES[engine](
+        monthly_df, periods=periods,
+        regressors=regressors, future_regressors=future_regressors,
+    )
+    return key, forecast
+
+
+def run_forecast_batch(series: dict, periods=12, engine="prophet",
+                       max_workers=None, use_processes=True,
+                       regressors=None, future_regressors=None, engines=None):
+    """
+    Fit one engine on many monthly series in parallel.
+    `series` maps a key to a monthly_df; returns key -> forecast dataframe.
+    `engines` optionally maps keys to their own engine (e.g. the one a
+    backtest selected); other keys use `engine`.
+    With regressors, `future_regressors` maps the same keys to their
+    future regressor frames.
+    """
+    engines = engines or {}
+
+    unknown = ({engine} | set(engines.values())) - set(FORECAST_ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown forecasting engine(s): {sorted(unknown)}")
+
+    future_regressors = future_regressors or {}
+
+    if regressors:
+        missing = [key for key in series if key not in future_regressors]
+        if missing:
+            raise ValueError(f"No future regressor values for series: {missing[:5]}")
+
+    tasks = [
+        (key, engines.get(key, engine), monthly_df, periods, regressors, future_regressors.get(key))
+        for key, monthly_df in series.items()
+        if not monthly_df.empty
+    ]
+
+    if not tasks:
+        return {}
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    with executor_cls(max_workers=max_workers) as executor:
+        return dict(executor.map(_run_engine_task, tasks))
+
+
+def stack_forecasts(forecasts: dict, keys=None) -> pd.DataFrame:
+    """
+    Combine key -> forecast results into one long frame (keys + forecast).
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    frames = []
+    for key, forecast in forecasts.items():
+        frame = forecast[FORECAST_COLUMNS].copy()
+        for name, value in zip(keys, key):
+            frame[name] = value
+        frames.append(frame[keys + FORECAST_COLUMNS])
+
+    if not frames:
+        return pd.DataFrame(columns=keys + FORECAST_COLUMNS)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def engines_for_series(series: dict, keys, engine_by_utility=None):
+    """
+    Series key -> engine for the series whose utility has a selected engine.
+    """
+    if not engine_by_utility or "utility" not in keys:
+        return None
+
+    position = list(keys).index("utility")
+    return {
+        key: engine_by_utility[key[position]]
+        for key in series
+        if key[position] in engine_by_utility
+    }
+
+
+def run_portfolio_forecast(df: pd.DataFrame, periods=12, engine="prophet",
+                           keys=None, max_workers=None, use_processes=True,
+                           engine_by_utility=None):
+    """
+    Forecast every series in the portfolio in one batch. Returns a long
+    frame with in-sample and future rows for each series.
+    `engine_by_utility` (utility -> engine, see backtesting.engine_selection)
+    overrides `engine` for those utilities.
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    monthly = prepare_monthly_forecast_batch(df, keys=keys)
+    series = dict(iter_series(monthly, keys))
+
+    forecasts = run_forecast_batch(
+        series, periods=periods, engine=engine,
+        max_workers=max_workers, use_processes=use_processes,
+        engines=engines_for_series(series, keys, engine_by_utility),
+    )
+
+    return stack_forecasts(forecasts, keys)
+
+
+# ---------------------------------------------------------
+# COST FORECAST (usage x effective rate)
+# ---------------------------------------------------------
+
+def _interval_sd(forecast: pd.DataFrame, z: float) -> np.ndarray:
+    return ((forecast["yhat_upper"] - forecast["yhat_lower"]) / (2 * z)).to_numpy()
+
+
+def run_cost_forecast(monthly_df: pd.DataFrame, periods=12, engine="prophet",
+                      usage_forecast=None, interval_width=0.8,
+                      rate_engine="trend_seasonal"):
+    """
+    Forecast monthly cost as usage x effective rate (cost / usage).
+
+    `monthly_df` comes from prepare_monthly_forecast_df(..., include_cost=True).
+    Pass an existing `usage_forecast` to reuse it; otherwise the usage and
+    rate models are fitted together in one batch. `engine` fits usage and
+    `rate_engine` the rate series, which is short and step-like, so a
+    lightweight engine is the default. Intervals are combined
+    assuming independent usage and rate errors:
+        var(cost) = r^2 var(u) + u^2 var(r) + var(u) var(r)
+    """
+    if monthly_df.empty or "cost" not in monthly_df.columns:
+        return None
+
+    rate = monthly_df["cost"] / monthly_df["y"].where(monthly_df["y"] > 0)
+    rate_df = pd.DataFrame({
+        "ds": monthly_df["ds"],
+        "y": rate.ffill().bfill(),
+    })
+
+    if rate_df["y"].isna().all():
+        return None
+
+    series = {"rate": rate_df}
+    if usage_forecast is None:
+        series["usage"] = monthly_df[["ds", "y"]]
+
+    fitted = run_forecast_batch(
+        series, periods=periods, engine=engine, use_processes=False,
+        engines={"rate": rate_engine},
+    )
+    usage_fc = fitted.get("usage", usage_forecast)[FORECAST_COLUMNS].reset_index(drop=True)
+    rate_fc = fitted["rate"][FORECAST_COLUMNS].reset_index(drop=True)
+
+    z = _interval_z(interval_width)
+    u, r = usage_fc["yhat"].to_numpy(), rate_fc["yhat"].to_numpy()
+    var_u, var_r = _interval_sd(usage_fc, z) ** 2, _interval_sd(rate_fc, z) ** 2
+
+    cost = u * r
+    cost_sd = np.sqrt(r ** 2 * var_u + u ** 2 * var_r + var_u * var_r)
+
+    return pd.DataFrame({
+        "ds": usage_fc["ds"],
+        "yhat": cost,
+        "yhat_lower": cost - z * cost_sd,
+        "yhat_upper": cost + z * cost_sd,
+        "usage_yhat": u,
+        "rate_yhat": r,
+    })
+
+
 # ---------------------------------------------------------
 # BUILD FORECAST + ACTUAL MERGED DF
 # ---------------------------------------------------------
@@ -110,26 +511,28 @@ def build_benchmark_for_forecast(df_filtered, forecast_df):
     Build a benchmark line for forecast charts based on:
     - Utility type
     - Unit count
+    - Monthly profile of the property's climate region (from State)
     """
     if df_filtered.empty:
         return None
 
     utility = df_filtered["utility"].iloc[0]
     units = df_filtered["units"].iloc[0]
+    state = df_filtered["state"].iloc[0] if "state" in df_filtered.columns else None
 
     usage_bench, _ = get_utility_benchmark(utility, units)
 
     if usage_bench is None:
         return None
 
-    return build_benchmark_df(forecast_df, usage_bench)
+    return build_benchmark_df(forecast_df, usage_bench, utility=utility, state=state)
 
 
 # ---------------------------------------------------------
 # FORECAST SUMMARY (NARRATIVE)
 # ---------------------------------------------------------
 
-def forecast_summary(actual_df, forecast_df, benchmark_value=None):
+def forecast_summary(actual_df, forecast_df, benchmark_value=None, benchmark_df=None):
     """
     Generate a narrative summary of the forecast:
     - Last actual usage
@@ -149,6 +552,12 @@ def forecast_summary(actual_df, forecast_df, benchmark_value=None):
     next_3 = future_only.head(3)
     avg_forecast = float(next_3["yhat"].mean())
 
+    # Month-varying benchmark: average it over the same forecast months
+    if benchmark_df is not None:
+        same_months = benchmark_df[benchmark_df["ds"].isin(next_3["ds"])]
+        if not same_months.empty:
+            benchmark_value = float(same_months["benchmark"].mean())
+
     summary = (
         f"Last actual month usage: **{last_val:,.0f}**\n\n"
         f"Average forecasted usage (next 3 months): **{avg_forecast:,.0f}**\n\n"
@@ -0,0 +1,247 @@
+import pandas as pd
+import numpy as np
+
+from .forecasting import (
+    _interval_z,
+    prepare_monthly_forecast_batch,
+    run_forecast_batch,
+)
+
+
+# ---------------------------------------------------------
+# HIERARCHY DEFINITION
+# ---------------------------------------------------------
+
+# Top-down order of the aggregation levels below the portfolio root.
+HIERARCHY_LEVELS = ["utility", "property", "meter_number"]
+
+RECONCILIATION_METHODS = ["bottom_up", "ols", "mint_shrink"]
+
+
+def build_hierarchy(df: pd.DataFrame, levels=None, include_portfolio=True):
+    """
+    Build the node table and summing matrix S for a meter-to-portfolio tree.
+
+    Returns (nodes, bottom, S):
+    - nodes:  one row per node with its level name and key columns
+    - bottom: the bottom-level keys in column order of S
+    - S:      (n_nodes x n_bottom) 0/1 matrix so that node totals = S @ bottom
+    """
+    levels = list(levels or HIERARCHY_LEVELS)
+
+    bottom = (
+        df[levels].dropna().drop_duplicates()
+        .sort_values(levels).reset_index(drop=True)
+    )
+    n_bottom = len(bottom)
+
+    node_frames = []
+    blocks = []
+
+    if include_portfolio:
+        node_frames.append(pd.DataFrame({"level": ["portfolio"]}))
+        blocks.append(np.ones((1, n_bottom)))
+
+    # One block of S per level: factorize the key prefix and one-hot it
+    for depth in range(1, len(levels) + 1):
+        prefix = levels[:depth]
+        codes = bottom.groupby(prefix, sort=False).ngroup().to_numpy()
+        level_nodes = bottom[prefix].drop_duplicates().reset_index(drop=True)
+
+        block = np.zeros((len(level_nodes), n_bottom))
+        block[codes, np.arange(n_bottom)] = 1
+        blocks.append(block)
+
+        level_nodes.insert(0, "level", levels[depth - 1])
+        node_frames.append(level_nodes)
+
+    nodes = pd.concat(node_frames, ignore_index=True)
+    S = np.vstack(blocks)
+
+    return nodes, bottom, S
+
+
+# ---------------------------------------------------------
+# NODE HISTORIES (all levels from one matrix product)
+# ---------------------------------------------------------
+
+def hierarchy_history(df: pd.DataFrame, bottom: pd.DataFrame, S: np.ndarray,
+                      value_col="usage"):
+    """
+    Monthly history for every node as an (n_nodes x n_months) matrix.
+    Bottom series are aligned on one common month grid and aggregated
+    to every level at once with S.
+    """
+    levels = list(bottom.columns)
+
+    monthly = prepare_monthly_forecast_batch(df, keys=levels, value_col=value_col)
+
+    wide = (
+        monthly.pivot_table(index=levels, columns="ds", values="y", aggfunc="sum")
+        .reindex(pd.MultiIndex.from_frame(bottom))
+    )
+    months = pd.date_range(wide.columns.min(), wide.columns.max(), freq="MS")
+    wide = wide.reindex(columns=months).fillna(0)
+
+    return S @ wide.to_numpy(), months
+
+
+# ---------------------------------------------------------
+# RECONCILIATION MATRICES
+# ---------------------------------------------------------
+
+def _shrinkage_covariance(residuals: np.ndarray):
+    """
+    Schafer-Strimmer shrinkage of the residual covariance towards its
+    diagonal, as used by MinT(shrink). `residuals` is (n_obs x n_nodes).
+    """
+    n_obs = residuals.shape[0]
+
+    covm = residuals.T @ residuals / n_obs
+    tar = np.diag(np.diag(covm))
+
+    sd = np.sqrt(np.diag(covm))
+    sd[sd == 0] = 1.0
+    xs = residuals / sd
+
+    corm = xs.T @ xs / n_obs
+    v = (xs ** 2).T @ (xs ** 2) - (xs.T @ xs) ** 2 / n_obs
+    v /= n_obs * (n_obs - 1)
+    np.fill_diagonal(v, 0)
+
+    d = (corm - np.eye(len(corm))) ** 2
+    np.fill_diagonal(d, 0)
+
+    lam = np.clip(v.sum() / d.sum(), 0, 1) if d.sum() > 0 else 1.0
+
+    return lam * tar + (1 - lam) * covm
+
+
+def reconciliation_matrix(S: np.ndarray, method="mint_shrink", residuals=None):
+    """
+    Return (G, W) so that reconciled forecasts are S @ G @ base_forecasts.
+    W is the base forecast error covariance (identity when there are too
+    few residuals to estimate it) and is also used to propagate intervals.
+    """
+    n_nodes, n_bottom = S.shape
+
+    if residuals is not None and residuals.shape[0] >= 3:
+        W = _shrinkage_covariance(residuals)
+    elif method == "mint_shrink":
+        raise ValueError("mint_shrink needs at least 3 rows of in-sample residuals.")
+    else:
+        W = np.eye(n_nodes)
+
+    if method == "bottom_up":
+        G = np.hstack([np.zeros((n_bottom, n_nodes - n_bottom)), np.eye(n_bottom)])
+        return G, W
+
+    if method == "ols":
+        weights = np.eye(n_nodes)
+    elif method == "mint_shrink":
+        weights = W
+    else:
+        raise ValueError(f"Unknown reconciliation method '{method}'.")
+
+    # Small ridge keeps the weights invertible when a node has zero variance
+    ridge = max(np.trace(weights) / n_nodes, 1.0) * 1e-8
+    Winv_S = np.linalg.solve(weights + np.eye(n_nodes) * ridge, S)
+    G = np.linalg.solve(S.T @ Winv_S, Winv_S.T)
+
+    return G, W
+
+
+# ---------------------------------------------------------
+# HIERARCHICAL FORECAST
+# ---------------------------------------------------------
+
+def hierarchical_forecast(df: pd.DataFrame, metric="usage", periods=12,
+                          engine="trend_seasonal", method="mint_shrink",
+                          levels=None, include_portfolio=None,
+                          interval_width=0.8, max_workers=None,
+                          use_processes=True):
+    """
+    Fit base forecasts for every node (meter, property, utility, portfolio)
+    in one batch and reconcile them so all levels add up.
+
+    Usage is not additive across utilities, so for metric="usage" pass a
+    frame with a single utility (the utility node is then the portfolio total).
+    A separate portfolio root is only added when several utilities are present.
+
+    Returns (history, forecast) long frames keyed by level + key columns.
+    """
+    levels = list(levels or HIERARCHY_LEVELS)
+
+    if df.empty or metric not in df.columns:
+        return pd.DataFrame(), pd.DataFrame()
+
+    df = df.dropna(subset=levels)
+    if df.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    if metric == "usage" and df["utility"].nunique() > 1:
+        raise ValueError("Usage cannot be summed across utilities; filter to one utility.")
+
+    if include_portfolio is None:
+        include_portfolio = df["utility"].nunique() > 1
+
+    nodes, bottom, S = build_hierarchy(df, levels, include_portfolio)
+    history, months = hierarchy_history(df, bottom, S, value_col=metric)
+
+    series = {
+        i: pd.DataFrame({"ds": months, "y": history[i]})
+        for i in range(len(nodes))
+    }
+    base = run_forecast_batch(
+        series, periods=periods, engine=engine,
+        max_workers=max_workers, use_processes=use_processes,
+    )
+
+    def stack(col):
+        return np.vstack([base[i][col].to_numpy() for i in range(len(nodes))])
+
+    yhat = stack("yhat")
+    n_hist = len(months)
+
+    # In-sample residuals (rows with any missing fitted value are dropped)
+    residuals = (history - yhat[:, :n_hist]).T
+    residuals = residuals[~np.isnan(residuals).any(axis=1)]
+
+    if method == "mint_shrink" and residuals.shape[0] < 3:
+        method = "ols"
+
+    G, W = reconciliation_matrix(S, method, residuals)
+    SG = S @ G
+
+    future = slice(n_hist, None)
+    reconciled = SG @ yhat[:, future]
+
+    # Propagate base interval widths through the reconciliation: keep the
+    # residual correlation structure, rescale by each horizon's base sd
+    z = _interval_z(interval_width)
+    base_sd = (stack("yhat_upper")[:, future] - stack("yhat_lower")[:, future]) / (2 * z)
+
+    w_sd = np.sqrt(np.diag(W))
+    w_sd[w_sd == 0] = 1.0
+    R = W / np.outer(w_sd, w_sd)
+
+    A = SG[None, :, :] * base_sd.T[:, None, :]
+    rec_var = np.sum((A @ R) * A, axis=2).T
+    rec_sd = np.sqrt(np.clip(rec_var, 0, None))
+
+    future_months = base[0]["ds"].iloc[n_hist:].reset_index(drop=True)
+    n_future = len(future_months)
+
+    forecast = nodes.loc[nodes.index.repeat(n_future)].reset_index(drop=True)
+    forecast["ds"] = np.tile(future_months.to_numpy(), len(nodes))
+    forecast["base_yhat"] = yhat[:, future].ravel()
+    forecast["yhat"] = reconciled.ravel()
+    forecast["yhat_lower"] = (reconciled - z * rec_sd).ravel()
+    forecast["yhat_upper"] = (reconciled + z * rec_sd).ravel()
+    forecast["method"] = method
+
+    hist = nodes.loc[nodes.index.repeat(n_hist)].reset_index(drop=True)
+    hist["ds"] = np.tile(months.to_numpy(), len(nodes))
+    hist["y"] = history.ravel()
+
+    return hist, forecast
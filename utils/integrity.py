@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+
+
+# A bill is identified by its meter (within property + utility)
+BILL_KEYS = ["property", "utility", "meter_number"]
+
+BILL_CONTENT_COLUMNS = ["start_date", "end_date", "date", "usage", "cost"]
+
+
+# ---------------------------------------------------------
+# NORMALIZATION + HASHING
+# ---------------------------------------------------------
+
+def _normalized_keys(df: pd.DataFrame, keys):
+    """
+    Key columns as trimmed, lower-case strings so 'Prop A ' == 'prop a'.
+    """
+    return pd.DataFrame({
+        k: df[k].astype(str).str.strip().str.lower() for k in keys
+    }, index=df.index)
+
+
+def bill_hashes(df: pd.DataFrame, keys=None, near=False):
+    """
+    64-bit hash of each bill's normalized content.
+
+    - exact: keys + billing dates + usage/cost rounded to cents
+    - near:  keys only (the meter); usage, cost and dates are compared
+             between neighbouring bills, within a tolerance
+    """
+    keys = [k for k in (keys or BILL_KEYS) if k in df.columns]
+    content = _normalized_keys(df, keys)
+
+    if not near:
+        for col in BILL_CONTENT_COLUMNS:
+            if col not in df.columns:
+                continue
+            if col in ("usage", "cost"):
+                content[col] = pd.to_numeric(df[col], errors="coerce").round(2)
+            else:
+                content[col] = pd.to_datetime(df[col], errors="coerce").dt.normalize()
+
+    return pd.util.hash_pandas_object(content, index=False)
+
+
+# ---------------------------------------------------------
+# DUPLICATE BILLS
+# ---------------------------------------------------------
+
+# Near-duplicate candidates: each bill is compared with this many earlier
+# bills of the same meter (in date order)
+NEAR_NEIGHBORS = 3
+
+
+def _near_pairs(bills: pd.DataFrame, date_col, near_days, tolerance_pct):
+    """
+    (later, earlier) positions of bills on the same meter, dated within
+    near_days, whose usage and cost agree within tolerance_pct.
+    `bills` must be sorted by meter + date.
+    """
+    meter = bills["_near"].to_numpy()
+    dates = bills[date_col].to_numpy()
+    values = {
+        col: pd.to_numeric(bills[col], errors="coerce").to_numpy(dtype=float)
+        for col in ["usage", "cost"] if col in bills.columns
+    }
+
+    pairs = []
+    for lag in range(1, NEAR_NEIGHBORS + 1):
+        later = np.arange(lag, len(bills))
+        earlier = later - lag
+
+        match = (meter[later] == meter[earlier]) & (
+            (dates[later] - dates[earlier]) <= np.timedelta64(near_days, "D")
+        )
+        for v in values.values():
+            match &= np.isclose(v[later], v[earlier], rtol=tolerance_pct / 100, atol=0.01)
+
+        pairs += zip(later[match], earlier[match])
+
+    return pairs
+
+
+def find_duplicate_bills(df: pd.DataFrame, keys=None, near_days=5, tolerance_pct=0.5):
+    """
+    Bills entered more than once.
+
+    - exact: identical normalized content
+    - near:  same meter, usage and cost within tolerance_pct of each
+             other, and a bill date within near_days (e.g. re-keyed bills)
+
+    Returns the involved bills with dup_group (shared by copies), match
+    type and the number of bills in the group.
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    keys = [k for k in (keys or BILL_KEYS) if k in df.columns]
+    has_start = "start_date" in df.columns and df["start_date"].notna().any()
+    date_col = "start_date" if has_start else "date"
+
+    bills = df.assign(_exact=bill_hashes(df, keys), _near=bill_hashes(df, keys, near=True))
+
+    exact = bills["_exact"].duplicated(keep=False)
+
+    # Near duplicates: sorted neighbours on the same meter, linked into groups
+    bills = bills.sort_values(["_near", date_col], kind="mergesort")
+    group = np.arange(len(bills))
+
+    def root(i):
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
+
+    for later, earlier in _near_pairs(bills, date_col, near_days, tolerance_pct):
+        group[root(later)] = root(earlier)
+
+    group = pd.Series([root(i) for i in range(len(group))], index=bills.index)
+    near = (group.map(group.value_counts()) > 1).reindex(df.index) & ~exact
+
+    bills = bills.loc[df.index]
+    bills["dup_group"] = np.where(exact, bills["_exact"].astype(str), "near-" + group.reindex(df.index).astype(str))
+    bills["match"] = np.where(exact, "exact", "near")
+
+    duplicates = bills[exact | near].copy()
+    duplicates["copies"] = duplicates.groupby("dup_group")["dup_group"].transform("size")
+
+    columns = keys + [c for c in BILL_CONTENT_COLUMNS if c in df.columns] + ["dup_group", "match", "copies"]
+    return duplicates.sort_values(["dup_group", date_col])[columns].reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# BILLING PERIOD SWEEP (overlaps + gaps)
+# ---------------------------------------------------------
+
+def find_period_issues(df: pd.DataFrame, keys=None, max_gap_days=1):
+    """
+    Sort each meter's bills by start_date and sweep once: a bill overlaps
+    when it starts before the latest end_date seen so far on that meter,
+    and leaves a gap when it starts more than max_gap_days after it.
+    O(n log n) for the sort, O(n) for the sweep.
+    """
+    if df.empty or not {"start_date", "end_date"}.issubset(df.columns):
+        return pd.DataFrame()
+
+    keys = [k for k in (keys or BILL_KEYS) if k in df.columns]
+    bills = df.dropna(subset=["start_date", "end_date"])
+    bills = bills.sort_values(keys + ["start_date", "end_date"], kind="mergesort")
+
+    grouped = bills.groupby(keys, dropna=False, sort=False) if keys else None
+    if grouped is not None:
+        covered_to = grouped["end_date"].cummax()
+        prev_end = covered_to.groupby([bills[k] for k in keys], dropna=False, sort=False).shift(1)
+    else:
+        prev_end = bills["end_date"].cummax().shift(1)
+
+    days = (bills["start_date"] - prev_end).dt.days
+
+    issues = bills.assign(prev_end=prev_end, days_from_prev_end=days)
+    issues["issue"] = np.select(
+        [days < 0, days > max_gap_days], ["overlap", "gap"], default=""
+    )
+    issues["overlap_days"] = (-days).clip(lower=0)
+    issues["gap_days"] = (days - max_gap_days).clip(lower=0)
+
+    columns = keys + ["start_date", "end_date", "prev_end", "issue", "overlap_days", "gap_days"]
+    for col in ["date", "usage", "cost"]:
+        if col in issues.columns:
+            columns.append(col)
+
+    return issues[issues["issue"] != ""][columns].reset_index(drop=True)
@@ -0,0 +1,138 @@
+import os
+import smtplib
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+
+import pandas as pd
+
+
+# ---------------------------------------------------------
+# DIGEST
+# ---------------------------------------------------------
+
+def build_digest(alerts: pd.DataFrame, max_rows=50):
+    """
+    Turn a batch of alerts into one (subject, body) digest:
+    counts per property and alert type, then the highest-scoring alerts.
+    """
+    subject = f"GridForge alerts: {len(alerts):,} new"
+
+    if alerts.empty:
+        return subject, "No new alerts."
+
+    counts = (
+        alerts.groupby(["property", "alert_type"])
+        .size()
+        .unstack(fill_value=0)
+    )
+
+    top = (
+        alerts.assign(_abs=alerts["score"].abs())
+        .sort_values("_abs", ascending=False)
+        .head(max_rows)
+    )
+    top = top[["property", "utility", "meter_number", "date", "alert_type",
+               "metric", "value", "reference", "score"]].copy()
+    top["date"] = pd.to_datetime(top["date"]).dt.strftime("%Y-%m")
+
+    lines = [
+        f"{len(alerts):,} new alerts across {alerts['property'].nunique()} properties.",
+        "",
+        "Alerts by property and type:",
+        counts.to_string(),
+        "",
+        f"Top {len(top)} by score:",
+        top.to_string(index=False, float_format=lambda v: f"{v:,.2f}"),
+    ]
+
+    return subject, "\n".join(lines)
+
+
+# ---------------------------------------------------------
+# NOTIFIERS (one send per digest)
+# ---------------------------------------------------------
+
+class Notifier(ABC):
+    """
+    Base notifier: subclasses deliver one digest per call to send() and
+    build themselves from command-line options with from_options().
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_options(cls, options):
+        """Build from an argparse namespace (see utils.alert_runner)."""
+
+    @abstractmethod
+    def send(self, subject: str, body: str):
+        """Deliver one digest."""
+
+
+class FileNotifier(Notifier):
+    """
+    Append digests to a local text file (handy for testing and cron logs).
+    """
+
+    def __init__(self, path="alert_digest.txt"):
+        self.path = path
+
+    @classmethod
+    def from_options(cls, options):
+        return cls(options.digest_path)
+
+    def send(self, subject, body):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        stamp = pd.Timestamp.now().floor("s").isoformat()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(f"=== {stamp} | {subject} ===\n{body}\n\n")
+
+
+class SmtpNotifier(Notifier):
+    """
+    Email digests over SMTP. Defaults point at a local debugging server
+    (e.g. `python -m aiosmtpd -n -l localhost:1025`).
+    """
+
+    def __init__(self, recipients, sender="gridforge@localhost", host="localhost",
+                 port=1025, username=None, password=None, use_tls=False):
+        self.recipients = [recipients] if isinstance(recipients, str) else list(recipients)
+        self.sender = sender
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    @classmethod
+    def from_options(cls, options):
+        if not options.to:
+            raise SystemExit("--to is required with --notifier smtp")
+        return cls(
+            options.to, sender=options.sender, host=options.smtp_host,
+            port=options.smtp_port, username=options.smtp_user,
+            password=options.smtp_password, use_tls=options.smtp_tls,
+        )
+
+    def send(self, subject, body):
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.recipients)
+        msg.set_content(body)
+
+        with smtplib.SMTP(self.host, self.port, timeout=30) as server:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+            server.send_message(msg)
+
+
+# --notifier choice -> notifier class
+NOTIFIERS = {
+    "file": FileNotifier,
+    "smtp": SmtpNotifier,
+}
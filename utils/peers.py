@@ -0,0 +1,284 @@
+import pandas as pd
+import numpy as np
+
+from .cache import cached_per_version
+from .preprocess import billed_days, occupancy_rate, occupied_room_nights
+
+
+# ---------------------------------------------------------
+# PEER GROUP SETTINGS
+# ---------------------------------------------------------
+
+# Property size bands (number of units) used to form peer groups
+UNIT_BANDS = [0, 50, 100, 200, 400, np.inf]
+UNIT_BAND_LABELS = ["<50", "50-99", "100-199", "200-399", "400+"]
+
+PEER_GROUPINGS = {
+    "unit_band": ["utility", "unit_band"],
+    "state": ["utility", "state"],
+}
+
+PEER_METRICS = {
+    "usage_per_day": "days",
+    "usage_per_unit_day": "unit_days",
+    "usage_per_occupied_unit_day": "occupied_unit_days",
+}
+
+METER_KEYS = ["property", "utility", "meter_number"]
+
+
+# ---------------------------------------------------------
+# METER INTENSITIES
+# ---------------------------------------------------------
+
+def meter_intensities(df: pd.DataFrame):
+    """
+    Usage per day, per unit-day and per occupied unit-day for every meter,
+    from summed usage over summed exposure (so long bills weigh more).
+    """
+    keys = [k for k in METER_KEYS if k in df.columns]
+
+    work = df[keys].copy()
+    work["usage"] = pd.to_numeric(df["usage"], errors="coerce")
+    work["days"] = billed_days(df)
+
+    units = pd.to_numeric(df["units"], errors="coerce") if "units" in df.columns else np.nan
+
+    work["unit_days"] = work["days"] * units
+    work["occupied_unit_days"] = work["unit_days"] * occupancy_rate(df)
+    work["state"] = df["state"] if "state" in df.columns else np.nan
+    work["units"] = units
+
+    meters = (
+        work.groupby(keys, dropna=False)
+        .agg(
+            usage=("usage", "sum"),
+            days=("days", "sum"),
+            unit_days=("unit_days", "sum"),
+            occupied_unit_days=("occupied_unit_days", "sum"),
+            units=("units", "mean"),
+            state=("state", "first"),
+        )
+        .reset_index()
+    )
+
+    for metric, exposure in PEER_METRICS.items():
+        meters[metric] = meters["usage"] / meters[exposure].where(meters[exposure] > 0)
+
+    meters["unit_band"] = pd.cut(
+        meters["units"], UNIT_BANDS, labels=UNIT_BAND_LABELS, right=False
+    ).astype(str)
+
+    return meters
+
+
+# ---------------------------------------------------------
+# PEER SCORES (grouped quantiles over the whole portfolio)
+# ---------------------------------------------------------
+
+@cached_per_version()
+def score_meter_peers(df: pd.DataFrame, peer_by="unit_band", min_peers=5,
+                      z_threshold=2.5):
+    """
+    Score every meter's normalized usage against all meters of the same
+    utility in similar-size properties (peer_by="unit_band") or the same
+    state (peer_by="state").
+
+    Long result, one row per meter and metric: value, peer median / IQR,
+    percentile within the peer group, robust z ((value - median) / (IQR / 1.349))
+    and an outlier flag (only when the group has at least min_peers meters).
+    Cached per dataset version.
+    """
+    if df.empty or "usage" not in df.columns:
+        return pd.DataFrame()
+
+    group_cols = PEER_GROUPINGS[peer_by]
+    meters = meter_intensities(df)
+    id_cols = [c for c in METER_KEYS if c in meters.columns]
+    id_cols += [c for c in group_cols if c not in id_cols]
+
+    long = meters.melt(
+        id_vars=id_cols, value_vars=list(PEER_METRICS),
+        var_name="metric", value_name="value",
+    ).dropna(subset=["value"])
+
+    if long.empty:
+        return pd.DataFrame()
+
+    groups = group_cols + ["metric"]
+
+    quantiles = (
+        long.groupby(groups, dropna=False)["value"]
+        .quantile([0.25, 0.5, 0.75])
+        .unstack()
+        .rename(columns={0.25: "peer_q25", 0.5: "peer_median", 0.75: "peer_q75"})
+        .reset_index()
+    )
+    long = long.merge(quantiles, on=groups, how="left")
+
+    grouped = long.groupby(groups, dropna=False)["value"]
+    long["peer_count"] = grouped.transform("size")
+    long["percentile"] = (grouped.rank(pct=True) * 100).round(1)
+
+    iqr = (long["peer_q75"] - long["peer_q25"]) / 1.349
+    long["robust_z"] = (long["value"] - long["peer_median"]) / iqr.where(iqr > 0)
+    long["outlier"] = (long["peer_count"] >= min_peers) & (long["robust_z"].abs() >= z_threshold)
+
+    long.insert(len(id_cols), "peer_group", long[group_cols].astype(str).agg(" / ".join, axis=1))
+
+    return long.sort_values("robust_z", key=np.abs, ascending=False).reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# PROPERTY-MONTH PEER BENCHMARKS
+# ---------------------------------------------------------
+
+# Narrowest peer group first; a property-month falls back to the next
+# level when its group has fewer than min_peers properties.
+PROPERTY_PEER_LEVELS = [
+    ["utility", "unit_band", "state"],
+    ["utility", "unit_band"],
+    ["utility"],
+]
+
+PROPERTY_PEER_METRICS = {
+    "usage_per_unit": ("usage", "units"),
+    "cost_per_unit": ("cost", "units"),
+    "usage_per_room_night": ("usage", "room_nights"),
+    "cost_per_room_night": ("cost", "room_nights"),
+}
+
+PROPERTY_KEYS = ["property", "utility"]
+
+
+def property_month_intensities(df: pd.DataFrame):
+    """
+    Usage and cost per unit and per occupied room-night for every
+    property + utility + month. Room-nights are units x occupancy rate x
+    billed days, summed over the month's bills.
+    """
+    keys = [k for k in PROPERTY_KEYS if k in df.columns]
+
+    work = df[keys].copy()
+    work["ds"] = df["date"].dt.to_period("M").dt.to_timestamp()
+    work["usage"] = pd.to_numeric(df["usage"], errors="coerce")
+    work["cost"] = pd.to_numeric(df["cost"], errors="coerce") if "cost" in df.columns else np.nan
+
+    work["units"] = pd.to_numeric(df["units"], errors="coerce") if "units" in df.columns else np.nan
+    work["room_nights"] = (
+        df["occupied_room_nights"] if "occupied_room_nights" in df.columns
+        else occupied_room_nights(df)
+    )
+    work["state"] = df["state"] if "state" in df.columns else np.nan
+
+    months = (
+        work.groupby(keys + ["ds"], dropna=False)
+        .agg(
+            usage=("usage", "sum"),
+            cost=("cost", "sum"),
+            units=("units", "max"),
+            room_nights=("room_nights", "sum"),
+            state=("state", "first"),
+        )
+        .reset_index()
+    )
+
+    for metric, (value, exposure) in PROPERTY_PEER_METRICS.items():
+        months[metric] = months[value] / months[exposure].where(months[exposure] > 0)
+
+    months["unit_band"] = pd.cut(
+        months["units"], UNIT_BANDS, labels=UNIT_BAND_LABELS, right=False
+    ).astype(str)
+
+    return months
+
+
+@cached_per_version()
+def property_peer_scores(df: pd.DataFrame, min_peers=5):
+    """
+    Percentile of every property-month intensity among peers in the same
+    month (same utility, unit band and state, widened per
+    PROPERTY_PEER_LEVELS when the group is too small).
+
+    Long result, one row per property, utility, month and metric with the
+    peer median, percentile (0 = lowest, 100 = highest intensity) and a
+    1-100 peer_score like efficiency_score (100 = lowest intensity among
+    peers, 1 = highest), on the same scale whatever the group size. Both
+    are NaN for a property without peers (peer_count < 2).
+    Cached per dataset version.
+    """
+    if df.empty or "usage" not in df.columns or "date" not in df.columns:
+        return pd.DataFrame()
+
+    months = property_month_intensities(df)
+    id_cols = PROPERTY_KEYS + ["ds", "state", "unit_band"]
+
+    long = months.melt(
+        id_vars=id_cols, value_vars=list(PROPERTY_PEER_METRICS),
+        var_name="metric", value_name="value",
+    ).dropna(subset=["value"]).reset_index(drop=True)
+
+    if long.empty:
+        return pd.DataFrame()
+
+    long["peer_group"] = None
+    for col in ["peer_count", "peer_median", "percentile", "peer_score"]:
+        long[col] = np.nan
+
+    # Widest level last: every row ends up in some peer group
+    for depth, level in enumerate(PROPERTY_PEER_LEVELS):
+        groups = level + ["ds", "metric"]
+        grouped = long.groupby(groups, dropna=False)["value"]
+
+        count = grouped.transform("size")
+        take = long["peer_group"].isna()
+        if depth < len(PROPERTY_PEER_LEVELS) - 1:
+            take &= count >= min_peers
+
+        if not take.any():
+            continue
+
+        median = grouped.transform("median")
+
+        # Position among n peers, 0 (lowest) to 1 (highest); undefined
+        # without at least one other peer
+        position = (grouped.rank() - 1) / (count - 1).where(count >= 2)
+        percentile = position * 100
+        score = 1 + 99 * (1 - position)
+
+        labels = long.loc[take, level].astype(str)
+        long.loc[take, "peer_group"] = labels[level[0]].str.cat(
+            [labels[c] for c in level[1:]], sep=" / "
+        )
+        long.loc[take, "peer_count"] = count[take]
+        long.loc[take, "peer_median"] = median[take]
+        long.loc[take, "percentile"] = percentile[take].round(1)
+        long.loc[take, "peer_score"] = score[take].round()
+
+    long["peer_count"] = long["peer_count"].astype(int)
+
+    return long.sort_values(PROPERTY_KEYS + ["ds", "metric"]).reset_index(drop=True)
+
+
+def property_peer_summary(scores: pd.DataFrame, months=12):
+    """
+    Mean peer score per property + utility and metric over the last
+    `months` months, one column per metric.
+    """
+    if scores.empty:
+        return pd.DataFrame()
+
+    cutoff = scores["ds"].max() - pd.DateOffset(months=months - 1)
+    recent = scores[scores["ds"] >= cutoff]
+
+    summary = (
+        recent.pivot_table(
+            index=PROPERTY_KEYS, columns="metric", values="peer_score", aggfunc="mean"
+        )
+        .reindex(columns=list(PROPERTY_PEER_METRICS))
+        .round(1)
+    )
+    summary["peer_score"] = summary.mean(axis=1).round(1)
+    summary.columns.name = None
+
+    return summary.reset_index().sort_values("peer_score", ascending=False, ignore_index=True)
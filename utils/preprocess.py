@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from .conversions import converted_usage
+
 
 # ---------------------------------------------------------
 # MONTHLY AGGREGATION
@@ -10,15 +12,21 @@ def monthly_aggregate(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate usage and cost by month for a given property + utility.
     Requires df to already be filtered by property and utility.
+    Per-room-night intensities are monthly sums over monthly room-nights.
     """
     if df.empty:
         return pd.DataFrame()
 
-    df = df.copy()
-    df["month_start"] = df["date"].dt.to_period("M").dt.to_timestamp()
+    month_start = df["date"].dt.to_period("M").dt.to_timestamp().rename("month_start")
+
+    room_nights = (
+        df["occupied_room_nights"] if "occupied_room_nights" in df.columns
+        else occupied_room_nights(df)
+    )
 
     monthly = (
-        df.groupby("month_start")
+        _with_energy(df).assign(occupied_room_nights=room_nights)
+        .groupby(month_start)
         .agg(
             usage=("usage", "sum"),
             cost=("cost", "sum"),
@@ -26,13 +34,85 @@ def monthly_aggregate(df: pd.DataFrame) -> pd.DataFrame:
             units=("units", "mean"),
             usage_per_day=("usage_per_day", "mean"),
             cost_per_day=("cost_per_day", "mean"),
+            occupied_room_nights=("occupied_room_nights", lambda s: s.sum(min_count=1)),
+            mmbtu=("mmbtu", "sum"),
+            kg_co2e=("kg_co2e", "sum"),
         )
         .reset_index()
     )
 
+    nights = monthly["occupied_room_nights"].where(monthly["occupied_room_nights"] > 0)
+    monthly["usage_per_room_night"] = monthly["usage"] / nights
+    monthly["cost_per_room_night"] = monthly["cost"] / nights
+
     return monthly
 
 
+# ---------------------------------------------------------
+# INTENSITY METRICS (computed once at load)
+# ---------------------------------------------------------
+
+def billed_days(df: pd.DataFrame) -> pd.Series:
+    """
+    Days per bill: days_billed, else the billing period, else 30.
+    """
+    days = pd.to_numeric(df["days_billed"], errors="coerce") if "days_billed" in df.columns else pd.Series(np.nan, index=df.index)
+
+    if {"start_date", "end_date"}.issubset(df.columns):
+        period = (df["end_date"] - df["start_date"]).dt.days + 1
+        days = days.fillna(period.where(period > 0))
+
+    return days.fillna(30)
+
+
+def occupancy_rate(df: pd.DataFrame) -> pd.Series:
+    """
+    Occupancy as a 0-1 rate (the workbook may store it as a percentage).
+    """
+    if "occupancy" not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+
+    occupancy = pd.to_numeric(df["occupancy"], errors="coerce")
+    return occupancy / (100 if occupancy.max() > 1 else 1)
+
+
+def occupied_room_nights(df: pd.DataFrame) -> pd.Series:
+    """
+    Occupied room-nights per bill: units x occupancy rate x days billed.
+    """
+    units = pd.to_numeric(df["units"], errors="coerce") if "units" in df.columns else pd.Series(np.nan, index=df.index)
+    return units * occupancy_rate(df) * billed_days(df)
+
+
+def add_intensity_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add per-bill occupied_room_nights, usage_per_room_night and
+    cost_per_room_night in place (NaN where units or occupancy are missing).
+    """
+    nights = occupied_room_nights(df)
+    valid = nights.where(nights > 0)
+
+    df["occupied_room_nights"] = nights
+    df["usage_per_room_night"] = pd.to_numeric(df["usage"], errors="coerce") / valid
+    df["cost_per_room_night"] = pd.to_numeric(df["cost"], errors="coerce") / valid
+
+    return df
+
+
+def _with_energy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with mmbtu / kg_co2e columns: the ones added at load, or converted
+    here for frames that did not come through load_data.
+    """
+    if {"mmbtu", "kg_co2e"}.issubset(df.columns):
+        return df
+
+    converted = converted_usage(df) if "date" in df.columns else pd.DataFrame(
+        np.nan, index=df.index, columns=["mmbtu", "kg_co2e"]
+    )
+    return df.assign(mmbtu=converted["mmbtu"], kg_co2e=converted["kg_co2e"])
+
+
 # ---------------------------------------------------------
 # OCCUPANCY NORMALIZATION
 # ---------------------------------------------------------
@@ -98,7 +178,8 @@ def meter_group(df: pd.DataFrame) -> pd.DataFrame:
 
 def provider_group(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Group usage and cost by provider_code.
+    Group usage and cost by provider_code, with the effective rate
+    (total cost / total usage). See utils.rates for rate history.
     """
     if "provider_code" not in df.columns:
         return pd.DataFrame()
@@ -114,6 +195,9 @@ def provider_group(df: pd.DataFrame) -> pd.DataFrame:
         .reset_index()
     )
 
+    usage = provider_df["total_usage"].where(provider_df["total_usage"] > 0)
+    provider_df["effective_rate"] = provider_df["total_cost"] / usage
+
     return provider_df
 
 
@@ -124,17 +208,21 @@ def provider_group(df: pd.DataFrame) -> pd.DataFrame:
 def utility_group(df: pd.DataFrame) -> pd.DataFrame:
     """
     Group usage and cost by utility type (Electricity, Gas, Water, etc.)
+    total_usage is in each utility's own unit; total_mmbtu and
+    total_kg_co2e are comparable across utilities.
     """
     if "utility" not in df.columns:
         return pd.DataFrame()
 
     util_df = (
-        df.groupby("utility")
+        _with_energy(df).groupby("utility")
         .agg(
             total_usage=("usage", "sum"),
             total_cost=("cost", "sum"),
             avg_usage_per_day=("usage_per_day", "mean"),
             avg_cost_per_day=("cost_per_day", "mean"),
+            total_mmbtu=("mmbtu", "sum"),
+            total_kg_co2e=("kg_co2e", "sum"),
         )
         .reset_index()
     )
@@ -179,13 +267,17 @@ def yoy_comparison(df: pd.DataFrame) -> pd.DataFrame:
 
 def portfolio_summary(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Portfolio-level KPIs across all properties.
+    Portfolio-level KPIs across all properties. Usage is only summed
+    across utilities as energy (MMBtu) and emissions (tonnes CO2e).
     """
     if df.empty:
         return pd.DataFrame()
 
+    energy = _with_energy(df)
+
     summary = {
-        "total_usage": df["usage"].sum(),
+        "total_mmbtu": energy["mmbtu"].sum(),
+        "total_co2e_tonnes": energy["kg_co2e"].sum() / 1000,
         "total_cost": df["cost"].sum(),
         "avg_usage_per_day": df["usage_per_day"].mean(),
         "avg_cost_per_day": df["cost_per_day"].mean(),
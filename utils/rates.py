@@ -0,0 +1,135 @@
+import pandas as pd
+import numpy as np
+
+from .alerts import _trailing_median
+from .cache import cached_per_version
+
+
+# ---------------------------------------------------------
+# RATE SETTINGS
+# ---------------------------------------------------------
+
+RATE_KEYS = ["property", "utility", "provider_code"]
+
+RATE_EVENTS = {
+    "rate_step": "Rate moved to a new level and stayed there",
+    "rate_spike": "One-month rate jump that reverted (possible billing error)",
+    "unconfirmed": "Rate jump in the latest months, not enough data to confirm",
+}
+
+
+# ---------------------------------------------------------
+# EFFECTIVE RATES (per bill and per month)
+# ---------------------------------------------------------
+
+def bill_rates(df: pd.DataFrame) -> pd.Series:
+    """
+    Effective rate (cost / usage) of every bill; NaN when usage <= 0.
+    """
+    usage = pd.to_numeric(df["usage"], errors="coerce")
+    cost = pd.to_numeric(df["cost"], errors="coerce")
+    return cost / usage.where(usage > 0)
+
+
+def monthly_rates(df: pd.DataFrame, keys=None):
+    """
+    Monthly usage, cost, bill count and effective rate (total cost over
+    total usage) per property + utility + provider, in time order.
+    """
+    keys = [k for k in (keys or RATE_KEYS) if k in df.columns]
+
+    work = df[keys].assign(
+        month_start=df["date"].dt.to_period("M").dt.to_timestamp(),
+        usage=pd.to_numeric(df["usage"], errors="coerce"),
+        cost=pd.to_numeric(df["cost"], errors="coerce"),
+    )
+
+    monthly = (
+        work.groupby(keys + ["month_start"])
+        .agg(usage=("usage", "sum"), cost=("cost", "sum"), bills=("usage", "size"))
+        .reset_index()
+    )
+    monthly["rate"] = monthly["cost"] / monthly["usage"].where(monthly["usage"] > 0)
+
+    return monthly, keys
+
+
+# ---------------------------------------------------------
+# RATE HISTORY + STEP DETECTION (whole portfolio, one pass)
+# ---------------------------------------------------------
+
+@cached_per_version()
+def rate_history(df: pd.DataFrame, threshold_pct=5.0, window=3):
+    """
+    Monthly effective rate of every property + utility + provider series,
+    compared with the median rate of the `window` months before
+    (rate_before) and after (rate_after) each month.
+
+    A month is flagged when its rate differs from rate_before by at least
+    threshold_pct:
+    - rate_step:   rate_after confirms the new level (first month only)
+    - rate_spike:  rate_after is back near rate_before
+    - unconfirmed: too few later months to tell
+    Cached per dataset version.
+    """
+    if df.empty or not {"usage", "cost", "date"}.issubset(df.columns):
+        return pd.DataFrame()
+
+    monthly, keys = monthly_rates(df)
+    if monthly.empty:
+        return pd.DataFrame()
+
+    groups = [monthly[k] for k in keys]
+    min_periods = max(1, window // 2 + 1)
+
+    monthly["rate_before"] = _trailing_median(monthly["rate"], groups, window, min_periods)
+
+    # Leading median = trailing median over the reversed series
+    reversed_rows = monthly.iloc[::-1]
+    monthly["rate_after"] = _trailing_median(
+        reversed_rows["rate"], [reversed_rows[k] for k in keys], window, min_periods
+    ).iloc[::-1].to_numpy()
+
+    before = monthly["rate_before"].where(monthly["rate_before"] > 0)
+    monthly["change_pct"] = ((monthly["rate"] - before) / before * 100).round(1)
+    after_pct = (monthly["rate_after"] - before) / before * 100
+
+    jump = monthly["change_pct"].abs() >= threshold_pct
+    confirmed = (after_pct.abs() >= threshold_pct) & (np.sign(after_pct) == np.sign(monthly["change_pct"]))
+
+    step = jump & confirmed
+
+    # Later months of the same step still differ from their (older)
+    # before-level, possibly with gaps: flagged months of one series within
+    # `window` months of the previous one, in the same direction, form one
+    # run (cumulative run id); only its first month is the step
+    steps = monthly.loc[step, keys + ["month_start", "change_pct"]]
+    month_index = steps["month_start"].dt.year * 12 + steps["month_start"].dt.month
+    by_series = [steps[k] for k in keys]
+    new_run = (
+        (month_index - month_index.groupby(by_series).shift(1) > window)
+        | (np.sign(steps["change_pct"]) != np.sign(steps["change_pct"]).groupby(by_series).shift(1))
+    )
+    run_id = new_run.cumsum()
+    step.loc[steps.index] = ~run_id.duplicated()
+
+    monthly["event"] = np.select(
+        [step, jump & monthly["rate_after"].isna(), jump & ~confirmed],
+        ["rate_step", "unconfirmed", "rate_spike"],
+        default=None,
+    )
+
+    return monthly.round({"rate": 4, "rate_before": 4, "rate_after": 4})
+
+
+def detect_rate_changes(df: pd.DataFrame, threshold_pct=5.0, window=3, version=None):
+    """
+    Only the flagged months of rate_history, most recent first.
+    """
+    history = rate_history(df, threshold_pct=threshold_pct, window=window, version=version)
+
+    if history.empty:
+        return history
+
+    events = history[history["event"].notna()]
+    return events.sort_values("month_start", ascending=False).reset_index(drop=True)
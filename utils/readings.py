@@ -0,0 +1,177 @@
+import pandas as pd
+import numpy as np
+
+
+READING_KEYS = ["property", "utility", "meter_number"]
+
+# Common meter/CT multipliers; an inferred ratio snaps to one of these
+STANDARD_MULTIPLIERS = np.array([
+    1, 2, 2.5, 4, 5, 6, 8, 10, 12, 15, 16, 20, 24, 25, 30, 40, 50, 60, 80,
+    100, 120, 160, 200, 240, 300, 400, 500, 600, 800, 1000,
+])
+
+MULTIPLIER_COLUMNS = ["multiplier", "meter_multiplier"]
+
+
+# ---------------------------------------------------------
+# REGISTER SIZE + MULTIPLIER
+# ---------------------------------------------------------
+
+def _register_size(readings: pd.Series, meter) -> pd.Series:
+    """
+    Register capacity per meter (10 ** digits of its largest reading);
+    the dial rolls over to zero after this value.
+    """
+    largest = readings.groupby(meter, sort=False).transform("max").clip(lower=1)
+    return 10.0 ** np.ceil(np.log10(largest + 1))
+
+
+def _infer_multiplier(usage, delta, meter, tolerance=0.02):
+    """
+    Median billed-usage / reading-delta ratio per meter, snapped to a
+    standard multiplier. Returns (multiplier, known): when the ratio isn't
+    close to any standard value the multiplier is unknown (reported as 1).
+    """
+    ratio = (usage / delta.where(delta > 0)).groupby(meter, sort=False).transform("median")
+
+    nearest = STANDARD_MULTIPLIERS[
+        np.abs(STANDARD_MULTIPLIERS[None, :] - ratio.fillna(1).to_numpy()[:, None]).argmin(axis=1)
+    ]
+    close = np.abs(ratio - nearest) <= tolerance * nearest
+
+    return (
+        pd.Series(np.where(close, nearest, 1.0), index=usage.index),
+        pd.Series(close.to_numpy(), index=usage.index),
+    )
+
+
+# ---------------------------------------------------------
+# RECONCILIATION (one grouped shift-and-compare pass)
+# ---------------------------------------------------------
+
+def reconcile_readings(df: pd.DataFrame, tolerance_pct=2.0, tolerance_units=1.0,
+                       keys=None):
+    """
+    Check every bill's readings against its billed usage and against the
+    meter's previous bill.
+
+    - delta: current - previous reading, corrected for dial rollover when
+      the wrapped delta x multiplier matches the billed usage
+    - expected_usage: delta x multiplier (column if present, else inferred)
+    - usage_mismatch: billed usage differs from expected beyond tolerance
+    - multiplier_unknown: usage differs, but no multiplier is given and
+      none could be inferred, so it isn't counted as a mismatch
+    - continuity_break: previous_reading != last bill's current_reading
+
+    dollar_impact uses the bill's effective rate; positive means billed for
+    more than the meter recorded (or units billed twice), negative means
+    under-billed. Returns every bill with a finding (issue column).
+    """
+    needed = {"previous_reading", "current_reading", "usage"}
+    if df.empty or not needed.issubset(df.columns):
+        return pd.DataFrame()
+
+    keys = [k for k in (keys or READING_KEYS) if k in df.columns]
+    sort_cols = keys + [c for c in ["start_date", "date"] if c in df.columns]
+    bills = df.sort_values(sort_cols, kind="mergesort").reset_index(drop=True)
+
+    meter = bills.groupby(keys, dropna=False, sort=False).ngroup() if keys else pd.Series(0, index=bills.index)
+
+    previous = pd.to_numeric(bills["previous_reading"], errors="coerce")
+    current = pd.to_numeric(bills["current_reading"], errors="coerce")
+    usage = pd.to_numeric(bills["usage"], errors="coerce")
+    cost = pd.to_numeric(bills["cost"], errors="coerce") if "cost" in bills.columns else pd.Series(np.nan, index=bills.index)
+
+    raw_delta = current - previous
+
+    # Multiplier from the column where given, else inferred per meter
+    inferred, inferred_known = _infer_multiplier(usage, raw_delta, meter)
+    multiplier_col = next((c for c in MULTIPLIER_COLUMNS if c in bills.columns), None)
+    if multiplier_col:
+        given = pd.to_numeric(bills[multiplier_col], errors="coerce")
+        multiplier = given.fillna(inferred)
+        known = given.notna() | inferred_known
+    else:
+        multiplier, known = inferred, inferred_known
+
+    allowed_usage = np.maximum(usage.abs() * tolerance_pct / 100, tolerance_units)
+
+    # Dial rollover: a negative delta whose wrapped value (one register
+    # turn later) accounts for the billed usage
+    register = _register_size(pd.concat([previous, current], axis=1).max(axis=1), meter)
+    wrapped = raw_delta + register
+    rolled = (raw_delta < 0) & ((wrapped * multiplier - usage).abs() <= allowed_usage)
+    delta = raw_delta.where(~rolled, wrapped)
+
+    expected = delta * multiplier
+    usage_diff = usage - expected
+    allowed = np.maximum(expected.abs() * tolerance_pct / 100, tolerance_units)
+    differs = usage_diff.abs() > allowed
+
+    # Without a known multiplier a difference can't be called a mismatch
+    mismatch = differs & known
+    unknown = differs & ~known
+
+    # Continuity: this bill should start where the meter's last bill ended
+    last_current = current.groupby(meter, sort=False).shift(1)
+    continuity_gap = previous - last_current
+    broken = continuity_gap.abs() > tolerance_units
+
+    rate = cost / usage.where(usage > 0)
+
+    # Skipped reading units (gap > 0) went unbilled; a negative gap means
+    # the same units were billed twice
+    continuity_units = (-continuity_gap * multiplier).where(broken, 0)
+
+    out = bills[keys + [c for c in ["date", "start_date", "end_date"] if c in bills.columns]].copy()
+    out["previous_reading"] = previous
+    out["current_reading"] = current
+    out["last_current_reading"] = last_current
+    out["rollover"] = rolled
+    out["multiplier"] = multiplier
+    out["multiplier_known"] = known
+    out["expected_usage"] = expected
+    out["usage"] = usage
+    out["usage_diff"] = usage_diff.where(mismatch, 0)
+    out["continuity_gap"] = continuity_gap.where(broken, 0)
+    out["dollar_impact"] = ((out["usage_diff"] + continuity_units).fillna(0) * rate.fillna(0)).round(2)
+
+    out["issue"] = np.select(
+        [mismatch & broken, mismatch, unknown & broken, unknown, broken],
+        [
+            "usage_mismatch+continuity_break", "usage_mismatch",
+            "multiplier_unknown+continuity_break", "multiplier_unknown",
+            "continuity_break",
+        ],
+        default="",
+    )
+
+    return (
+        out[out["issue"] != ""]
+        .sort_values("dollar_impact", key=np.abs, ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+def reconciliation_summary(findings: pd.DataFrame, keys=None):
+    """
+    Findings and net dollar impact per meter.
+    """
+    if findings.empty:
+        return pd.DataFrame()
+
+    keys = [k for k in (keys or READING_KEYS) if k in findings.columns]
+
+    return (
+        findings.groupby(keys, dropna=False)
+        .agg(
+            findings=("issue", "size"),
+            usage_mismatches=("issue", lambda s: s.str.contains("usage_mismatch").sum()),
+            continuity_breaks=("issue", lambda s: s.str.contains("continuity_break").sum()),
+            multiplier_unknown=("issue", lambda s: s.str.contains("multiplier_unknown").sum()),
+            dollar_impact=("dollar_impact", "sum"),
+        )
+        .reset_index()
+        .sort_values("dollar_impact", key=np.abs, ascending=False)
+        .reset_index(drop=True)
+    )
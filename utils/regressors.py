@@ -0,0 +1,142 @@
+import pandas as pd
+import numpy as np
+
+from .forecasting import (
+    SERIES_KEYS,
+    FORECAST_COLUMNS,
+    _month_index,
+    _month_from_index,
+    prepare_monthly_forecast_batch,
+    iter_series,
+    run_forecast_batch,
+    stack_forecasts,
+    engines_for_series,
+)
+
+
+# ---------------------------------------------------------
+# REGRESSOR SETTINGS
+# ---------------------------------------------------------
+
+# Occupancy is the only driver with per-bill history. Weather would need
+# observed degree-days for the bill months; climate normals only restate
+# the yearly seasonality the models already fit.
+REGRESSOR_COLUMNS = ["occupancy"]
+
+
+# ---------------------------------------------------------
+# DESIGN MATRIX (history, all series at once)
+# ---------------------------------------------------------
+
+def build_regressor_matrix(df: pd.DataFrame, keys=None):
+    """
+    Long monthly design frame for every series: keys + ds + y + occupancy.
+    Occupancy is the monthly mean, gaps filled within each series.
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    design = prepare_monthly_forecast_batch(df, keys=keys)
+
+    if design.empty:
+        return pd.DataFrame(columns=keys + ["ds", "y"] + REGRESSOR_COLUMNS)
+
+    work = df[keys + ["date"]].copy()
+    work["ds"] = work["date"].dt.to_period("M").dt.to_timestamp()
+    work["occupancy"] = pd.to_numeric(df["occupancy"], errors="coerce") if "occupancy" in df.columns else np.nan
+
+    occupancy = work.groupby(keys + ["ds"], dropna=False)["occupancy"].mean().reset_index()
+
+    design = design.merge(occupancy, on=keys + ["ds"], how="left")
+    design["occupancy"] = design.groupby(keys, dropna=False)["occupancy"].ffill()
+    design["occupancy"] = (
+        design.groupby(keys, dropna=False)["occupancy"].bfill().fillna(0)
+    )
+
+    return design
+
+
+# ---------------------------------------------------------
+# FUTURE SCENARIO INPUTS
+# ---------------------------------------------------------
+
+def build_future_regressors(design: pd.DataFrame, periods=12, keys=None,
+                            occupancy_change_pct=0.0):
+    """
+    Occupancy for the next N months of every series: the same calendar
+    month's historical mean, scaled by occupancy_change_pct (capped at
+    full occupancy).
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    if design.empty:
+        return pd.DataFrame(columns=keys + ["ds"] + REGRESSOR_COLUMNS)
+
+    last = design.groupby(keys, dropna=False).agg(_m=("ds", "max")).reset_index()
+    last["_m"] = _month_index(last["_m"])
+
+    future = last.loc[last.index.repeat(periods)].reset_index(drop=True)
+    future["_m"] += np.tile(np.arange(1, periods + 1), len(last))
+    future["ds"] = _month_from_index(future["_m"])
+    future["month"] = future["ds"].dt.month
+
+    seasonal_occ = (
+        design.assign(month=design["ds"].dt.month)
+        .groupby(keys + ["month"], dropna=False)["occupancy"]
+        .mean()
+        .rename("occupancy")
+        .reset_index()
+    )
+    mean_occ = design.groupby(keys, dropna=False)["occupancy"].mean().rename("_mean_occ").reset_index()
+
+    future = (
+        future.merge(seasonal_occ, on=keys + ["month"], how="left")
+        .merge(mean_occ, on=keys, how="left")
+    )
+
+    # Occupancy may be stored as a fraction or a percentage
+    cap = 100.0 if design["occupancy"].max() > 1 else 1.0
+    future["occupancy"] = (
+        future["occupancy"].fillna(future["_mean_occ"]) * (1 + occupancy_change_pct / 100)
+    ).clip(upper=cap)
+
+    return future[keys + ["ds"] + REGRESSOR_COLUMNS]
+
+
+# ---------------------------------------------------------
+# BATCH REGRESSOR FORECAST (whole portfolio)
+# ---------------------------------------------------------
+
+def run_regressor_forecast_batch(df: pd.DataFrame, periods=12, engine="prophet",
+                                 keys=None, occupancy_change_pct=0.0,
+                                 max_workers=None, use_processes=True,
+                                 engine_by_utility=None):
+    """
+    Occupancy-aware forecasts for every series in one batch.
+    Design matrices are built once for the whole portfolio, then split by
+    series and fitted in parallel. Returns a long frame of keys + forecast.
+    """
+    keys = list(keys or SERIES_KEYS)
+
+    design = build_regressor_matrix(df, keys=keys)
+    future = build_future_regressors(
+        design, periods=periods, keys=keys,
+        occupancy_change_pct=occupancy_change_pct,
+    )
+
+    if design.empty:
+        return pd.DataFrame(columns=keys + FORECAST_COLUMNS)
+
+    regressors = REGRESSOR_COLUMNS
+
+    columns = keys + ["ds", "y"] + regressors
+    series = dict(iter_series(design[columns], keys))
+    future_series = dict(iter_series(future[keys + ["ds"] + regressors], keys))
+
+    forecasts = run_forecast_batch(
+        series, periods=periods, engine=engine,
+        max_workers=max_workers, use_processes=use_processes,
+        regressors=regressors, future_regressors=future_series,
+        engines=engines_for_series(series, keys, engine_by_utility),
+    )
+
+    return stack_forecasts(forecasts, keys)
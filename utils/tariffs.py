@@ -0,0 +1,223 @@
+import pandas as pd
+import numpy as np
+
+from .benchmarks import _read_benchmark_file, point_in_time_lookup
+from .preprocess import billed_days
+
+
+# ---------------------------------------------------------
+# TARIFF SETTINGS
+# ---------------------------------------------------------
+
+# One row per rate schedule version (provider, utility, optional state,
+# validity, fixed monthly charge, demand charge per kW, space-separated
+# summer months). A bill only matches a schedule for its own utility.
+TARIFF_SCHEDULE_FILE = "data/tariff_schedules.csv"
+
+# Tier breakpoints per schedule and season (summer | winter | all).
+# A tier's rate applies to monthly usage from tier_start up to the next tier.
+TARIFF_TIER_FILE = "data/tariff_tiers.csv"
+
+# Tier breakpoints and fixed charges are per month; bills are prorated
+DAYS_PER_MONTH = 365.25 / 12
+
+# Optional bill column with billed peak demand (kW)
+DEMAND_COLUMN = "demand_kw"
+
+TARIFF_SEASONS = ["winter", "summer"]
+
+
+# ---------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------
+
+def load_tariffs(schedule_path=TARIFF_SCHEDULE_FILE, tier_path=TARIFF_TIER_FILE):
+    """
+    Load rate schedules and their tiers (empty tables if the files are missing).
+    """
+    schedules = _read_benchmark_file(schedule_path, pd.DataFrame(columns=[
+        "schedule_id", "provider_code", "utility", "state", "effective_from", "effective_to",
+        "customer_charge", "demand_rate", "summer_months",
+    ]))
+    tiers = _read_benchmark_file(tier_path, pd.DataFrame(columns=[
+        "schedule_id", "season", "tier_start", "rate",
+    ]))
+    return schedules, tiers
+
+
+def _summer_matrix(schedules: pd.DataFrame) -> np.ndarray:
+    """
+    (n_schedules x 13) boolean mask: True where calendar month m of
+    schedule i is billed at summer rates (column 0 unused).
+    """
+    mask = np.zeros((len(schedules), 13), dtype=bool)
+
+    for i, months in enumerate(schedules["summer_months"].fillna("").astype(str)):
+        for month in months.split():
+            mask[i, int(float(month))] = True
+
+    return mask
+
+
+def _tier_tables(schedules: pd.DataFrame, tiers: pd.DataFrame):
+    """
+    Breakpoints, rates and cumulative cost at each breakpoint for every
+    (schedule, season), keyed by schedule_row * 2 + is_summer.
+    """
+    tables = {}
+
+    for row, schedule_id in enumerate(schedules["schedule_id"]):
+        own = tiers[tiers["schedule_id"] == schedule_id]
+
+        for is_summer, season in enumerate(TARIFF_SEASONS):
+            season_tiers = own[own["season"].isin([season, "all"])].sort_values("tier_start")
+            if season_tiers.empty:
+                continue
+
+            starts = season_tiers["tier_start"].to_numpy(dtype=float)
+            rates = season_tiers["rate"].to_numpy(dtype=float)
+            starts[0] = 0.0
+
+            cumulative = np.concatenate([[0.0], np.cumsum(np.diff(starts) * rates[:-1])])
+            tables[row * 2 + is_summer] = (starts, rates, cumulative)
+
+    return tables
+
+
+# ---------------------------------------------------------
+# EXPECTED COST (vectorized over every bill)
+# ---------------------------------------------------------
+
+def expected_bill_costs(df: pd.DataFrame, date_col="date"):
+    """
+    Expected cost of every bill under its provider's rate schedule for the
+    bill's utility, valid on the bill date: prorated customer charge +
+    tiered energy charge (summer or winter tiers by bill month) + demand
+    charge when a demand_kw column exists. Aligned to df's index; NaN = no
+    schedule for that provider + utility (bill skipped by the audit).
+    """
+    schedules, tiers = load_tariffs()
+
+    out = pd.DataFrame(index=df.index)
+    out["schedule_id"] = None
+    out["season"] = None
+    for col in ["expected_fixed", "expected_energy", "expected_demand", "expected_cost"]:
+        out[col] = np.nan
+
+    if df.empty or schedules.empty or not {"provider_code", "utility"}.issubset(df.columns):
+        return out
+
+    lookup = point_in_time_lookup(
+        df, schedules.assign(_schedule=np.arange(len(schedules), dtype=float)),
+        ["provider_code", "utility"], ["_schedule"], date_col,
+    )
+    found = lookup["_schedule"].notna().to_numpy()
+    schedule = np.where(found, lookup["_schedule"].fillna(0), 0).astype(int)
+
+    month = pd.to_datetime(df[date_col]).dt.month.fillna(0).astype(int).to_numpy()
+    is_summer = _summer_matrix(schedules)[schedule, month] & found
+
+    usage = pd.to_numeric(df["usage"], errors="coerce").to_numpy(dtype=float)
+    scale = billed_days(df).to_numpy(dtype=float) / DAYS_PER_MONTH
+
+    # Tiered energy charge: one searchsorted per (schedule, season) table
+    energy = np.full(len(df), np.nan)
+    codes = np.where(found, schedule * 2 + is_summer, -1)
+    tables = _tier_tables(schedules, tiers)
+
+    for code in np.unique(codes[codes >= 0]):
+        if code not in tables:
+            continue
+
+        starts, rates, cumulative = tables[code]
+        rows = np.flatnonzero(codes == code)
+        monthly_usage = usage[rows] / scale[rows]
+
+        tier = np.clip(np.searchsorted(starts, monthly_usage, side="right") - 1, 0, None)
+        energy[rows] = (
+            cumulative[tier] + (monthly_usage - starts[tier]) * rates[tier]
+        ) * scale[rows]
+
+    fixed = np.where(found, schedules["customer_charge"].to_numpy(dtype=float)[schedule] * scale, np.nan)
+
+    demand_rate = np.where(found, schedules["demand_rate"].fillna(0).to_numpy(dtype=float)[schedule], np.nan)
+    if DEMAND_COLUMN in df.columns:
+        demand = demand_rate * pd.to_numeric(df[DEMAND_COLUMN], errors="coerce").fillna(0).to_numpy()
+    else:
+        demand = demand_rate * 0
+
+    out["schedule_id"] = np.where(found, schedules["schedule_id"].to_numpy()[schedule], None)
+    out["season"] = np.where(found, np.where(is_summer, "summer", "winter"), None)
+    out["expected_fixed"] = fixed
+    out["expected_energy"] = energy
+    out["expected_demand"] = demand
+    out["expected_cost"] = fixed + energy + demand
+
+    return out.round({
+        "expected_fixed": 2, "expected_energy": 2,
+        "expected_demand": 2, "expected_cost": 2,
+    })
+
+
+# ---------------------------------------------------------
+# BILL AUDIT
+# ---------------------------------------------------------
+
+AUDIT_KEYS = ["property", "utility", "provider_code", "meter_number"]
+
+
+def tariff_audit(df: pd.DataFrame, tolerance_pct=5.0, date_col="date"):
+    """
+    Billed vs expected tariff cost for every bill with a rate schedule.
+    Flags bills whose variance exceeds tolerance_pct of the expected cost
+    as over_billed / under_billed. Largest absolute variance first.
+    """
+    if df.empty or "usage" not in df.columns or "cost" not in df.columns:
+        return pd.DataFrame()
+
+    keys = [k for k in AUDIT_KEYS if k in df.columns]
+    expected = expected_bill_costs(df, date_col)
+
+    audit = pd.concat([
+        df[keys + [date_col]],
+        df[["usage", "cost"]].rename(columns={"cost": "billed_cost"}),
+        expected,
+    ], axis=1)
+    audit = audit[audit["expected_cost"].notna()]
+
+    audit["variance"] = (audit["billed_cost"] - audit["expected_cost"]).round(2)
+    audit["variance_pct"] = (
+        audit["variance"] / audit["expected_cost"].where(audit["expected_cost"] > 0) * 100
+    ).round(1)
+
+    audit["status"] = np.select(
+        [audit["variance_pct"] > tolerance_pct, audit["variance_pct"] < -tolerance_pct],
+        ["over_billed", "under_billed"],
+        default="ok",
+    )
+
+    return audit.sort_values("variance", key=np.abs, ascending=False).reset_index(drop=True)
+
+
+def tariff_audit_summary(audit: pd.DataFrame, by=("provider_code", "utility")):
+    """
+    Billed vs expected totals and flagged bill counts per group.
+    """
+    if audit.empty:
+        return pd.DataFrame()
+
+    summary = (
+        audit.assign(flagged=audit["status"] != "ok")
+        .groupby(list(by))
+        .agg(
+            bills=("billed_cost", "size"),
+            billed_cost=("billed_cost", "sum"),
+            expected_cost=("expected_cost", "sum"),
+            variance=("variance", "sum"),
+            flagged_bills=("flagged", "sum"),
+        )
+        .reset_index()
+    )
+    summary["variance_pct"] = (summary["variance"] / summary["expected_cost"] * 100).round(1)
+
+    return summary.round({"billed_cost": 2, "expected_cost": 2, "variance": 2})